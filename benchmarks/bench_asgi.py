@@ -0,0 +1,188 @@
+"""Full ASGI round-trips through ``Oberoon.__call__``.
+
+    python benchmarks/bench_asgi.py [-n 20000] [-k routing] [--json out.json]
+
+Scenarios:
+- routing_{10,100,1000}   GET the last route of an N-route table (worst case
+                          for the linear scan in ``find_handler``)
+- routing_1000_first      GET the first route of the same table
+- not_found_10            a miss on a 10-route table (404, bot traffic)
+- dispatch_no_params      a handler taking only ``request`` (match -> call)
+- dispatch_path_str       one ``str`` path param, passed through unconverted
+- query_validation        three ``Query`` params coerced and constrained
+- header_validation       two ``Header`` params
+- body_validation         POST a JSON body decoded into a ``BaseModel``
+- list_response_1000      serialize a list of 1000 structs
+
+Compare two runs with ``python benchmarks/compare.py old.json new.json``.
+"""
+
+import argparse
+import logging
+from typing import Annotated
+
+import msgspec
+
+from harness import Scenario, measure, print_table, write_json
+from oberoon import BaseModel, Field, Header, Oberoon, Query, Request
+
+
+class Book(BaseModel):
+    id: int
+    title: Annotated[str, Field(min_length=1, max_length=200)]
+    author: str
+    year: Annotated[int, Field(ge=0, le=3000)]
+    tags: list[str] = []
+
+
+def routing_app(size: int) -> Oberoon:
+    app = Oberoon()
+    for i in range(size):
+
+        async def handler(request: Request, item_id: int) -> dict:
+            return {"id": item_id}
+
+        app.get(f"/resource{i}/{{item_id:int}}")(handler)
+    return app
+
+
+def validation_app() -> Oberoon:
+    app = Oberoon()
+
+    @app.get("/search")
+    async def search(
+        request: Request,
+        q: Annotated[str, Query(min_length=1)],
+        page: Annotated[int, Query(ge=1)] = 1,
+        limit: Annotated[int, Query(ge=1, le=100)] = 10,
+    ) -> dict:
+        return {"q": q, "page": page, "limit": limit}
+
+    @app.get("/me")
+    async def me(
+        request: Request,
+        authorization: Annotated[str, Header()],
+        x_request_id: Annotated[str, Header()] = "",
+    ) -> dict:
+        return {"auth": authorization, "id": x_request_id}
+
+    @app.post("/books")
+    async def create_book(request: Request, body: Book) -> Book:
+        return body
+
+    return app
+
+
+def dispatch_app() -> Oberoon:
+    app = Oberoon()
+
+    @app.get("/ping")
+    async def ping(request: Request) -> dict:
+        return {"ok": True}
+
+    @app.get("/users/{name}")
+    async def user(request: Request, name: str) -> dict:
+        return {"name": name}
+
+    return app
+
+
+BOOKS = [
+    Book(id=i, title=f"Book {i}", author="Author", year=2000, tags=["a", "b"])
+    for i in range(1000)
+]
+
+
+def list_app() -> Oberoon:
+    app = Oberoon()
+
+    @app.get("/books")
+    async def list_books(request: Request) -> list[Book]:
+        return BOOKS
+
+    return app
+
+
+def scenarios() -> list[Scenario]:
+    result = []
+    for size in (10, 100, 1000):
+        result.append(
+            Scenario(
+                f"routing_{size}", routing_app(size), "GET", f"/resource{size - 1}/7"
+            )
+        )
+    result.append(
+        Scenario("routing_1000_first", routing_app(1000), "GET", "/resource0/7")
+    )
+
+    result.append(
+        Scenario(
+            "not_found_10", routing_app(10), "GET", "/wp-login.php", expect_status=404
+        )
+    )
+
+    app = dispatch_app()
+    result.append(Scenario("dispatch_no_params", app, "GET", "/ping"))
+    result.append(Scenario("dispatch_path_str", app, "GET", "/users/alice"))
+
+    app = validation_app()
+    result.append(
+        Scenario(
+            "query_validation",
+            app,
+            "GET",
+            "/search",
+            query_string=b"q=python&page=3&limit=50",
+        )
+    )
+    result.append(
+        Scenario(
+            "header_validation",
+            app,
+            "GET",
+            "/me",
+            headers=[
+                (b"host", b"testserver"),
+                (b"authorization", b"Bearer abc"),
+                (b"x-request-id", b"42"),
+            ],
+        )
+    )
+    result.append(
+        Scenario(
+            "body_validation",
+            app,
+            "POST",
+            "/books",
+            headers=[(b"content-type", b"application/json")],
+            body=msgspec.json.encode(BOOKS[1]),
+        )
+    )
+    result.append(Scenario("list_response_1000", list_app(), "GET", "/books"))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=20_000, help="requests per scenario")
+    parser.add_argument("-k", default="", help="only run scenarios containing this")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    args = parser.parse_args()
+
+    # find_handler logs every lookup; keep logging out of the measurement
+    logging.getLogger("oberoon").setLevel(logging.ERROR)
+
+    results = []
+    for scenario in scenarios():
+        if args.k in scenario.name:
+            # Large responses are an order of magnitude slower; keep runs short
+            n = args.n // 20 if scenario.name.startswith("list_") else args.n
+            results.append(measure(scenario, n))
+
+    print_table(results)
+    if args.json:
+        write_json(args.json, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Overhead of per-route metrics instrumentation.
+
+    python benchmarks/bench_metrics.py
+
+Reports the cost of ``Metrics.observe`` on its own and the difference in a
+full ``Oberoon.__call__`` round-trip with metrics enabled vs disabled.
+"""
+
+import asyncio
+import logging
+import time
+
+from oberoon import Oberoon, Request
+from oberoon.metrics import Metrics
+
+N = 200_000
+
+
+def bench_observe() -> float:
+    metrics = Metrics()
+    observe = metrics.observe
+    start = time.perf_counter()
+    for i in range(N):
+        observe("/books/{book_id:int}", "GET", 200, (i % 1000) * 1e-5)
+    return (time.perf_counter() - start) / N * 1e6
+
+
+def build_app(metrics: bool) -> Oberoon:
+    app = Oberoon(metrics=metrics)
+
+    @app.get("/books/{book_id:int}")
+    async def get_book(request: Request, book_id: int) -> dict:
+        return {"id": book_id}
+
+    return app
+
+
+async def bench_call(app: Oberoon, n: int) -> float:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/books/1",
+        "query_string": b"",
+        "headers": [],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    logging.getLogger("oberoon").setLevel(logging.ERROR)
+
+    print(f"Metrics.observe        {bench_observe():6.3f} us/call")
+
+    n = N // 4
+    plain = asyncio.run(bench_call(build_app(metrics=False), n))
+    instrumented = asyncio.run(bench_call(build_app(metrics=True), n))
+    print(f"request, metrics off   {plain:6.3f} us/request")
+    print(f"request, metrics on    {instrumented:6.3f} us/request")
+    print(f"instrumentation cost   {instrumented - plain:6.3f} us/request")
+
+
+if __name__ == "__main__":
+    main()
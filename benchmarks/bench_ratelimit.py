@@ -0,0 +1,61 @@
+"""Per-check overhead of the in-process rate limiters.
+
+    python benchmarks/bench_ratelimit.py
+
+Scenarios:
+- hot key         one client hammering the limiter (best case, dict hit)
+- distinct keys   every check is a new client (insert + eviction path)
+- idle churn      1M clients on a simulated clock, each going idle soon
+                  after its check (eviction keeps the store bounded)
+"""
+
+import time
+
+from oberoon.ratelimit import SlidingWindow, TokenBucket
+
+N = 1_000_000
+
+
+def bench(label: str, store, keys) -> None:
+    hit = store.hit
+    start = time.perf_counter()
+    for key in keys:
+        hit(key)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {label:<16} {elapsed / len(keys) * 1e6:6.3f} us/check"
+        f"   ({len(store):,} keys held)"
+    )
+
+
+class SteppingClock:
+    """Advances by ``step`` seconds on every call."""
+
+    def __init__(self, step: float):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def main() -> None:
+    hot = ["client"] * N
+    distinct = [f"client-{i}" for i in range(N)]
+
+    for store_class in (TokenBucket, SlidingWindow):
+        print(store_class.__name__)
+        bench("hot key", store_class(100, 1.0), hot)
+        bench("distinct keys", store_class(100, 60.0), distinct)
+        # Simulated time advances 10us per check, so only the keys touched
+        # within one idle horizon (refill time / two windows) stay resident.
+        bench(
+            "idle churn",
+            store_class(100, 1.0, clock=SteppingClock(1e-5)),
+            distinct,
+        )
+
+
+if __name__ == "__main__":
+    main()
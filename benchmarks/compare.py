@@ -0,0 +1,51 @@
+"""Compare two ``bench_asgi.py --json`` runs.
+
+    python benchmarks/compare.py baseline.json candidate.json
+
+Prints the relative change per scenario; req/s up and latency or memory down
+are improvements.
+"""
+
+import json
+import sys
+
+
+def load(path: str) -> tuple[dict, dict[str, dict]]:
+    with open(path) as f:
+        payload = json.load(f)
+    return payload["environment"], {r["name"]: r for r in payload["results"]}
+
+
+def change(old: float, new: float) -> str:
+    if not old:
+        return "    n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def main() -> None:
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    old_env, old = load(sys.argv[1])
+    new_env, new = load(sys.argv[2])
+    print(f"baseline  {old_env['commit']}  ({old_env['python']})")
+    print(f"candidate {new_env['commit']}  ({new_env['python']})")
+    print(
+        f"{'scenario':<24} {'req/s':>10} {'change':>8} {'p50':>8} {'p99':>8}"
+        f" {'peak B':>8}"
+    )
+    for name, result in new.items():
+        base = old.get(name)
+        if base is None:
+            print(f"{name:<24} {result['req_per_s']:>10,.0f}      new")
+            continue
+        print(
+            f"{name:<24} {result['req_per_s']:>10,.0f}"
+            f" {change(base['req_per_s'], result['req_per_s']):>8}"
+            f" {change(base['p50_us'], result['p50_us']):>8}"
+            f" {change(base['p99_us'], result['p99_us']):>8}"
+            f" {change(base['peak_bytes_per_req'], result['peak_bytes_per_req']):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Shared driver for the ASGI benchmarks.
+
+Scenarios call ``Oberoon.__call__`` directly with a synthetic scope and
+in-memory ``receive``/``send`` — no server, no socket, no HTTP client — so
+the numbers measure the framework alone.
+
+Each scenario is measured in two passes:
+
+1. timing — per-request ``perf_counter_ns`` latencies (req/s, p50, p99)
+2. allocation — a shorter run under ``tracemalloc`` recording, per request,
+   the peak memory allocated above the starting point and the bytes still
+   held afterwards (tracemalloc slows everything down, so it never overlaps
+   the timing pass)
+"""
+
+import asyncio
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from array import array
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from oberoon import Oberoon
+
+
+@dataclass
+class Scenario:
+    name: str
+    app: Oberoon
+    method: str
+    path: str
+    query_string: bytes = b""
+    headers: list[tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+    expect_status: int = 200
+
+    def scope(self) -> dict:
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": self.method,
+            "scheme": "http",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": self.query_string,
+            "headers": self.headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+
+@dataclass
+class Result:
+    name: str
+    requests: int
+    req_per_s: float
+    p50_us: float
+    p99_us: float
+    mean_us: float
+    peak_bytes_per_req: float
+    retained_bytes_per_req: float
+
+
+class _Sink:
+    """ASGI ``send`` that only remembers the response status."""
+
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = 0
+
+    async def __call__(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+
+
+async def _drive(
+    scenario: Scenario,
+    n: int,
+    latencies: list[int] | None = None,
+    peaks: array | None = None,
+) -> int:
+    app = scenario.app
+    template = scenario.scope()
+    message = {"type": "http.request", "body": scenario.body, "more_body": False}
+    sink = _Sink()
+
+    async def receive() -> dict:
+        return message
+
+    clock = time.perf_counter_ns
+    for i in range(n):
+        scope = dict(template)
+        if peaks is not None:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            await app(scope, receive, sink)
+            peaks[i] = tracemalloc.get_traced_memory()[1] - base
+        elif latencies is None:
+            await app(scope, receive, sink)
+        else:
+            start = clock()
+            await app(scope, receive, sink)
+            latencies.append(clock() - start)
+    return sink.status
+
+
+def _percentile(sorted_values: list[int], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index] / 1000
+
+
+def measure(scenario: Scenario, n: int, alloc_n: int | None = None) -> Result:
+    alloc_n = alloc_n or max(100, n // 20)
+
+    status = asyncio.run(_drive(scenario, min(n, 1000), None))  # warm-up
+    if status != scenario.expect_status:
+        raise RuntimeError(
+            f"{scenario.name}: expected {scenario.expect_status}, got {status}"
+        )
+
+    latencies: list[int] = []
+    gc.collect()
+    started = time.perf_counter()
+    asyncio.run(_drive(scenario, n, latencies))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    # Preallocated so recording a peak allocates nothing itself
+    peaks = array("q", bytes(8 * alloc_n))
+    gc.collect()
+    tracemalloc.start()
+    try:
+
+        async def allocation_pass() -> int:
+            # Measured inside one event loop so loop setup is not counted
+            before = tracemalloc.get_traced_memory()[0]
+            await _drive(scenario, alloc_n, peaks=peaks)
+            gc.collect()
+            return tracemalloc.get_traced_memory()[0] - before
+
+        retained = asyncio.run(allocation_pass())
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name=scenario.name,
+        requests=n,
+        req_per_s=n / elapsed,
+        p50_us=_percentile(latencies, 0.50),
+        p99_us=_percentile(latencies, 0.99),
+        mean_us=sum(latencies) / n / 1000,
+        peak_bytes_per_req=sum(peaks) / alloc_n,
+        retained_bytes_per_req=max(0, retained) / alloc_n,
+    )
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_table(results: list[Result]) -> None:
+    print(
+        f"{'scenario':<24} {'req/s':>10} {'p50 us':>8} {'p99 us':>8}"
+        f" {'peak B/req':>11} {'kept B/req':>10}"
+    )
+    for r in results:
+        print(
+            f"{r.name:<24} {r.req_per_s:>10,.0f} {r.p50_us:>8.1f} {r.p99_us:>8.1f}"
+            f" {r.peak_bytes_per_req:>11,.0f} {r.retained_bytes_per_req:>10,.1f}"
+        )
+
+
+def write_json(path: str | Path, results: list[Result]) -> None:
+    payload = {
+        "environment": environment(),
+        "results": [asdict(r) for r in results],
+    }
+    Path(path).write_text(json.dumps(payload, indent=2) + "\n")
@@ -1,9 +1,13 @@
+from .admission import Priority
+from .background import BackgroundTasks
+from .caching import cache
 from .core import Oberoon
 from .exceptions import HTTPException, ValidationError
 from .serialization import BaseModel, Field
 from .requests import Request
 from .responses import HTMLResponse, JSONResponse, Response, TextResponse
 from .requests.params import Query, Header
+from .ratelimit import RateLimitMiddleware, rate_limit
 from .routing import Router
 
 __all__ = (
@@ -20,4 +24,9 @@ __all__ = (
     "Query",
     "Header",
     "Router",
+    "Priority",
+    "rate_limit",
+    "RateLimitMiddleware",
+    "BackgroundTasks",
+    "cache",
 )
@@ -0,0 +1,5 @@
+import sys
+
+from oberoon.cli import main
+
+sys.exit(main())
@@ -0,0 +1,129 @@
+"""Admission control: concurrency limits, bounded wait queues and load shedding.
+
+A ``ConcurrencyLimiter`` caps the number of requests running at once. Requests
+arriving while all slots are busy wait in a small priority-ordered queue; when
+the queue is full (or the wait exceeds ``queue_timeout``) they are shed
+immediately with ``503 Service Unavailable`` and a ``Retry-After`` header.
+
+The app owns one global limiter (``Oberoon(max_concurrency=...)``) and each
+route may declare its own (``@app.get(..., max_concurrency=...)``). Routes are
+assigned a ``Priority``; higher-priority arrivals are served first and may
+displace lower-priority requests from a full queue, so health checks and auth
+keep low latency while bulk listings are shed.
+"""
+
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+import anyio
+
+from oberoon.exceptions import ServiceUnavailableException
+
+
+class Priority(IntEnum):
+    """Admission priority classes. Lower value is served first."""
+
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    event: anyio.Event = field(compare=False)
+    granted: bool = field(default=False, compare=False)
+    shed: bool = field(default=False, compare=False)
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight work with a bounded, priority-ordered wait queue.
+
+    Slots are handed directly from a releasing request to the best waiter,
+    so a freed slot can never be stolen by a newer arrival.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int = 0,
+        queue_timeout: float | None = None,
+        retry_after: int = 1,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must be >= 0")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _shed(self) -> ServiceUnavailableException:
+        return ServiceUnavailableException(retry_after=self.retry_after)
+
+    async def acquire(self, priority: int = Priority.NORMAL) -> None:
+        """Take a slot, waiting in the queue if needed. Raises 503 when shed."""
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            # Queue full: only a more important request may take a queued
+            # spot, by displacing the least important waiter.
+            victim = max(self._waiters) if self._waiters else None
+            if victim is None or victim.priority <= priority:
+                raise self._shed()
+            self._waiters.remove(victim)
+            heapq.heapify(self._waiters)
+            victim.shed = True
+            victim.event.set()
+
+        waiter = _Waiter(priority, next(self._seq), anyio.Event())
+        heapq.heappush(self._waiters, waiter)
+        try:
+            with anyio.fail_after(self.queue_timeout):
+                await waiter.event.wait()
+        except BaseException as exc:
+            if waiter.granted:
+                # Slot was handed over just as we gave up: pass it on.
+                self.release()
+            elif not waiter.shed:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+            if isinstance(exc, TimeoutError):
+                raise self._shed() from None
+            raise
+
+        if waiter.shed:
+            raise self._shed()
+
+    def release(self) -> None:
+        """Free a slot, handing it to the highest-priority waiter if any."""
+        if self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            waiter.granted = True
+            waiter.event.set()
+            return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = Priority.NORMAL) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
@@ -0,0 +1,66 @@
+"""Background tasks executed after the response has been sent.
+
+Handlers get a ``BackgroundTasks`` instance by declaring a parameter of that
+type, or attach one to a ``Response`` via ``response.background``. The app
+runs the tasks once ``Response.send`` has finished, so the client never waits
+for them. Failures are logged and swallowed.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+import anyio
+import anyio.to_thread
+
+from oberoon.logging import get_logger
+
+logger = get_logger("background")
+
+
+class BackgroundTasks:
+    """An ordered list of callables to run after the response.
+
+    Usage::
+
+        @app.post("/orders")
+        async def create_order(
+            request: Request, body: CreateOrder, tasks: BackgroundTasks
+        ) -> Order:
+            order = save(body)
+            tasks.add_task(send_confirmation, order.email)
+            return order
+
+    Async callables are awaited; sync callables run in a worker thread.
+    """
+
+    def __init__(self):
+        self.tasks: list[tuple[Callable, tuple, dict]] = []
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def add_task(self, func: Callable, *args: Any, **kwargs: Any) -> None:
+        self.tasks.append((func, args, kwargs))
+
+    async def run(self, semaphore: anyio.Semaphore | None = None) -> None:
+        """Run every task in order, holding ``semaphore`` (if given) per task."""
+        for func, args, kwargs in self.tasks:
+            if semaphore is None:
+                await _run_task(func, args, kwargs)
+            else:
+                async with semaphore:
+                    await _run_task(func, args, kwargs)
+
+
+async def _run_task(func: Callable, args: tuple, kwargs: dict) -> None:
+    try:
+        if inspect.iscoroutinefunction(func):
+            await func(*args, **kwargs)
+        else:
+            await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs))
+    except Exception:
+        logger.exception(
+            "background task %s failed", getattr(func, "__name__", repr(func))
+        )
@@ -0,0 +1,228 @@
+"""Server-side response cache with TTL, a memory budget and stampede protection.
+
+Routes opt in with the ``@cache`` decorator. Cached entries hold the final
+encoded body bytes and headers, so a hit skips body decoding, the handler and
+serialization entirely. Entries live in an LRU bounded by total bytes, expire
+lazily after ``ttl`` seconds, and can be dropped by tag from any handler::
+
+    @api.get("/books")
+    @cache(ttl=30, tags=["books"])
+    async def list_books(request: Request, genre: Annotated[str, Query()] = "") -> list[Book]:
+        ...
+
+    @api.post("/books")
+    async def create_book(request: Request, body: CreateBook) -> Book:
+        ...
+        request.app.response_cache.invalidate("books")
+
+Concurrent misses for the same key collapse into a single computation; the
+other requests wait for it and receive a copy of its response, or its
+exception, whether or not the result could be stored.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+
+import msgspec
+
+from oberoon.coalescing import SingleFlight
+from oberoon.requests import Request
+from oberoon.responses import Response
+
+CACHEABLE_METHODS = frozenset({"GET", "HEAD"})
+
+# Rough per-entry bookkeeping cost added to the byte accounting
+_ENTRY_OVERHEAD = 256
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+    tags: tuple[str, ...]
+    size: int
+
+    def to_response(self) -> Response:
+        response = Response(self.status_code)
+        response.raw_headers.extend(self.headers)
+        response._body = self.body
+        return response
+
+
+class ResponseCache:
+    """Byte-bounded LRU of encoded responses, indexed by tag."""
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size = 0
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._tags: dict[str, set[Hashable]] = {}
+        self._flights = SingleFlight()
+        # Bumped on every invalidation so in-flight computations that started
+        # before it do not store stale results.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self.clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self, key: Hashable, response: Response, ttl: float, tags: Iterable[str] = ()
+    ) -> None:
+        headers = list(response.raw_headers)
+        body = response.body
+        size = len(body) + sum(len(k) + len(v) for k, v in headers) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        tags = tuple(tags)
+        self._entries[key] = CacheEntry(
+            response.status_code, headers, body, self.clock() + ttl, tags, size
+        )
+        self.size += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags``. Returns how many were dropped."""
+        self._generation += 1
+        removed = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if key in self._entries:
+                    self._remove(key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def fetch(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Response]],
+        ttl: float,
+        tags: Iterable[str] = (),
+    ) -> Response:
+        """Return the cached response for ``key``, computing it at most once.
+
+        Only ``200`` responses are stored. Requests that miss while the
+        computation runs share its response or exception, including when the
+        result is not stored (non-200, over budget, invalidated meanwhile).
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry.to_response()
+        return await self._flights.do(
+            key, lambda: self._compute(key, compute, ttl, tags)
+        )
+
+    async def _compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Response]],
+        ttl: float,
+        tags: Iterable[str],
+    ) -> Response:
+        generation = self._generation
+        response = await compute()
+        if response.status_code == 200 and generation == self._generation:
+            self.set(key, response, ttl, tags)
+        return response
+
+
+KeyFunc = Callable[[Request, dict], Hashable]
+TagsSpec = Iterable[str] | Callable[[dict], Iterable[str]]
+
+
+class CacheSpec:
+    """Per-route cache settings attached by ``@cache``."""
+
+    def __init__(
+        self,
+        ttl: float,
+        key: KeyFunc | None = None,
+        vary: Iterable[str] = (),
+        tags: TagsSpec = (),
+    ):
+        self.ttl = ttl
+        self.key = key
+        self.vary = tuple(name.lower() for name in vary)
+        self.tags = tags if callable(tags) else tuple(tags)
+
+    def key_for(self, request: Request, route_id: str, params: dict) -> Hashable:
+        if self.key is not None:
+            return (route_id, self.key(request, params))
+        vary = ()
+        if self.vary:
+            headers = request.headers
+            vary = tuple(headers.get(name, "") for name in self.vary)
+        return (route_id, request.method, msgspec.json.encode(params), vary)
+
+    def tags_for(self, params: dict) -> Iterable[str]:
+        return self.tags(params) if callable(self.tags) else self.tags
+
+
+def cache(
+    ttl: float,
+    key: KeyFunc | None = None,
+    vary: Iterable[str] = (),
+    tags: TagsSpec = (),
+):
+    """Cache a route's encoded ``200`` responses for ``ttl`` seconds.
+
+    By default the key combines the path params, the validated query and
+    header params, and the values of the ``vary`` request headers. Pass
+    ``key(request, params)`` to override it. ``tags`` may be a list of
+    strings or a callable receiving the resolved params, e.g.
+    ``tags=lambda p: [f"book:{p['book_id']}"]``.
+
+    Only GET and HEAD requests are served from the cache.
+    """
+    spec = CacheSpec(ttl, key, vary, tags)
+
+    def decorator(handler):
+        handler.__cache__ = spec
+        return handler
+
+    return decorator
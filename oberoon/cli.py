@@ -0,0 +1,132 @@
+"""The ``oberoon`` command line.
+
+oberoon bench examples.bookstore.app:app scenario.jsonl -n 10000 -c 1000
+oberoon bench http://127.0.0.1:8000 scenario.jsonl
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import anyio
+import msgspec
+
+from oberoon.importing import import_string
+
+
+def _bench(args: argparse.Namespace) -> int:
+    from oberoon.loadgen import (
+        format_report,
+        load_scenario,
+        run_in_process,
+        run_over_socket,
+    )
+
+    scenario = load_scenario(args.scenario)
+    if args.target.startswith(("http://", "https://")):
+        run = run_over_socket
+        target = args.target
+    else:
+        # find_handler logs every lookup; keep the app's logging out of the numbers
+        logging.getLogger("oberoon").setLevel(args.log_level.upper())
+        run = run_in_process
+        target = import_string(args.target)
+
+    result = anyio.run(
+        run, target, scenario, args.requests, args.concurrency, backend=args.backend
+    )
+    print(format_report(result, args.concurrency))
+    if args.json:
+        with open(args.json, "wb") as f:
+            f.write(msgspec.json.format(msgspec.json.encode(result.to_dict())))
+    return 1 if result.errors or result.unexpected else 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from oberoon.logging import setup_logging
+    from oberoon.server import run
+    from oberoon.supervisor import Supervisor
+
+    setup_logging(getattr(logging, args.log_level.upper()))
+    app = import_string(args.app)
+    options = {
+        "max_request_size": args.max_request_size,
+        "keep_alive_timeout": args.keep_alive_timeout,
+        "root_path": args.root_path,
+    }
+    if args.workers > 1 or args.reuse_port:
+        supervisor = Supervisor(
+            app,
+            args.host,
+            args.port,
+            workers=args.workers,
+            reuse_port=args.reuse_port,
+            graceful_timeout=args.graceful_timeout,
+            **options,
+        )
+        return supervisor.run()
+    run(app, args.host, args.port, graceful_timeout=args.graceful_timeout, **options)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="oberoon")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="run an app with the built-in server")
+    serve.add_argument("app", help="app import string (module:attr)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument(
+        "--max-request-size", type=int, default=1024 * 1024, metavar="BYTES"
+    )
+    serve.add_argument(
+        "--keep-alive-timeout", type=float, default=5.0, metavar="SECONDS"
+    )
+    serve.add_argument("--root-path", default="")
+    serve.add_argument(
+        "--workers", type=int, default=1, help="number of forked worker processes"
+    )
+    serve.add_argument(
+        "--reuse-port",
+        action="store_true",
+        help="each worker binds its own SO_REUSEPORT socket",
+    )
+    serve.add_argument(
+        "--graceful-timeout", type=float, default=30.0, metavar="SECONDS"
+    )
+    serve.add_argument(
+        "--log-level",
+        default="info",
+        choices=["debug", "info", "warning", "error"],
+    )
+    serve.set_defaults(handler=_serve)
+
+    bench = commands.add_parser(
+        "bench", help="replay a JSON-lines scenario concurrently against an app"
+    )
+    bench.add_argument(
+        "target", help="app import string (module:attr) or http://host:port"
+    )
+    bench.add_argument("scenario", help="JSON-lines file of request templates")
+    bench.add_argument("-n", "--requests", type=int, default=10_000)
+    bench.add_argument("-c", "--concurrency", type=int, default=100)
+    bench.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    bench.add_argument("--backend", default="asyncio", choices=["asyncio", "trio"])
+    bench.add_argument(
+        "--log-level",
+        default="error",
+        choices=["debug", "info", "warning", "error"],
+        help="oberoon log level for in-process runs",
+    )
+    bench.set_defaults(handler=_bench)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    # Import strings are relative to where the command is run, like uvicorn
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    return args.handler(args)
@@ -0,0 +1,84 @@
+"""Single-flight coalescing of identical concurrent requests.
+
+With ``@app.get(..., coalesce=True)``, concurrent GET/HEAD requests for the
+same method, path, query string, ``coalesce_vary`` header values and
+negotiated body format (JSON or MessagePack) share one in-flight execution
+of the route: the first request runs it, the rest wait and receive a copy of
+the same encoded response. Sharing happens below the conditional GET check,
+so each request still gets its own ``304`` decision from its validators.
+
+The shared execution is shielded from cancellation, so a client that
+disconnects while waiting (or even the one that started it) cannot cancel
+the work the others are waiting on.
+"""
+
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+
+import anyio
+
+from oberoon.negotiation import wants_msgpack
+from oberoon.requests import Request
+from oberoon.responses import Response
+
+COALESCE_METHODS = frozenset({"GET", "HEAD"})
+
+
+def coalesce_key(request: Request, vary: Iterable[str] = ()) -> Hashable:
+    scope = request._scope
+    key = (scope["method"], scope["path"], scope["query_string"])
+    if vary:
+        headers = request.headers
+        key += tuple(headers.get(name, "") for name in vary)
+    if wants_msgpack(scope):
+        key += ("msgpack",)
+    return key
+
+
+class _Call:
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self):
+        self.done = anyio.Event()
+        self.result: Response | None = None
+        self.error: BaseException | None = None
+
+
+def _share(response: Response) -> Response:
+    """Copy for a waiter: same bytes, own headers, no background tasks."""
+    shared = Response(response.status_code)
+    shared.raw_headers.extend(response.raw_headers)
+    shared._body = response.body
+    return shared
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, compute: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        while (call := self._calls.get(key)) is not None:
+            await call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if call.result is not None:
+                return _share(call.result)
+            # The leader died without a result: retry, possibly as leader
+
+        call = self._calls[key] = _Call()
+        try:
+            with anyio.CancelScope(shield=True):
+                call.result = await compute()
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            del self._calls[key]
+            call.done.set()
+        return call.result
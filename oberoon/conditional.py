@@ -0,0 +1,121 @@
+"""ETags and conditional GET (``304 Not Modified``).
+
+Routes opt in with the ``etag`` route option:
+
+- ``etag=True`` — a weak ETag is computed from the encoded body (unless the
+  handler already set an ``etag`` header)
+- ``etag=fn`` — ``fn(request, params)`` returns a version tag (sync or async)
+  *before* the handler runs; if the client already has that version the
+  handler and serialization are skipped entirely
+
+``If-None-Match`` takes precedence over ``If-Modified-Since``, which is
+checked against a ``last-modified`` header set by the handler.
+"""
+
+import hashlib
+import inspect
+from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+
+from oberoon.requests import Request
+from oberoon.responses import Response
+
+CONDITIONAL_METHODS = frozenset({"GET", "HEAD"})
+
+# Headers a 304 must carry over from the full response (RFC 9110 §15.4.5)
+_NOT_MODIFIED_HEADERS = (
+    "cache-control",
+    "content-location",
+    "date",
+    "etag",
+    "expires",
+    "last-modified",
+    "vary",
+)
+
+VersionFunc = Callable[[Request, dict], str | Awaitable[str]]
+
+
+def weak_etag(body: bytes) -> str:
+    """``W/"<hash>"`` over the encoded body using BLAKE2b (fast, 96-bit)."""
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def format_etag(tag: str) -> str:
+    """Quote a handler-supplied version tag as a weak ETag, unless it already is one."""
+    if tag.startswith(('W/"', '"')):
+        return tag
+    return f'W/"{tag}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def is_not_modified(
+    headers: dict[str, str], etag: str | None, last_modified: str | None
+) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+                if_modified_since
+            )
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Build an empty 304 carrying the validator and caching headers."""
+    response = Response(304)
+    for name in _NOT_MODIFIED_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            response.headers[name] = value
+    return response
+
+
+async def conditional_response(
+    request: Request,
+    etag: bool | VersionFunc,
+    params: dict,
+    compute: Callable[[], Awaitable[Response]],
+) -> Response:
+    """Run ``compute`` unless the client's cached copy is still current."""
+    request_headers = request.headers
+
+    if callable(etag):
+        tag = etag(request, params)
+        if inspect.isawaitable(tag):
+            tag = await tag
+        known = format_etag(tag)
+        if is_not_modified(request_headers, known, None):
+            return not_modified({"etag": known})
+        response = await compute()
+        response.headers.setdefault("etag", known)
+    else:
+        response = await compute()
+
+    if response.status_code != 200:
+        return response
+
+    headers = response.headers
+    if is_not_modified(
+        request_headers, headers.get("etag"), headers.get("last-modified")
+    ):
+        short = not_modified(headers)
+        short.background = response.background
+        return short
+    return response
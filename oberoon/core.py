@@ -1,36 +1,103 @@
-from typing import Callable
+import html
+import inspect
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import asynccontextmanager
 
+from oberoon.admission import ConcurrencyLimiter, Priority
+from oberoon.caching import ResponseCache
+from oberoon.coalescing import SingleFlight
+from oberoon.importing import import_string
+from oberoon.invoker import compose_invoker
 from oberoon.logging import get_logger
+from oberoon.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from oberoon.metrics import UNMATCHED, Metrics
+from oberoon.profiling import RequestProfiler
 from oberoon.requests import Request
 from oberoon.responses import Response
 from oberoon.exceptions import (
     HTTPException,
     NotFoundException,
     MethodNotAllowedException,
+    ServiceUnavailableException,
+    ErrorResponses,
     ValidationError,
-    default_error_handler,
-    default_http_handler,
     default_validation_handler,
     debug_error_handler,
 )
 from oberoon.routing import Route, Router, RoutingMixin, compile_path
-import msgspec
+from oberoon.schema import DOCS_HTML, OpenAPI
+import anyio
 
-from oberoon.serialization import (
-    inspect_handler_signature,
-    decode_body,
-    serialize_response,
-)
+from oberoon.serialization import inspect_handler_signature
+from oberoon.timing import PhaseTimer, Span
 
 logger = get_logger("core")
 
+ROUTE_LOADING = ("eager", "lazy", "startup")
+
 
 class Oberoon(RoutingMixin):
-    def __init__(self, debug: bool = False, title: str = "Oberoon API"):
+    def __init__(
+        self,
+        debug: bool = False,
+        title: str = "Oberoon API",
+        max_concurrency: int | None = None,
+        max_queue: int = 0,
+        queue_timeout: float | None = None,
+        retry_after: int = 1,
+        max_background_tasks: int = 100,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        metrics: bool = False,
+        server_timing: bool = False,
+        server_timing_header: str | None = None,
+        profiler: RequestProfiler | None = None,
+        shutdown_grace: float = 30.0,
+        route_loading: str = "eager",
+    ):
+        if route_loading not in ROUTE_LOADING:
+            raise ValueError(
+                f"route_loading must be one of {', '.join(ROUTE_LOADING)}, "
+                f"got {route_loading!r}"
+            )
         self.debug = debug
         self.title = title
         self._routes: list[Route] = list()
         self._exception_handlers: dict[type, Callable] = {}
+        # Resolved handler per exception class; None means the 500 fallback
+        self._exception_handler_cache: dict[type, Callable | None] = {}
+        # Default 404/405/500 bodies and headers, encoded once
+        self.error_responses = ErrorResponses()
+        self._retry_after = retry_after
+        self._limiter: ConcurrencyLimiter | None = (
+            ConcurrencyLimiter(max_concurrency, max_queue, queue_timeout, retry_after)
+            if max_concurrency is not None
+            else None
+        )
+        # Caps background tasks running at once across all requests
+        self._background_semaphore = anyio.Semaphore(max_background_tasks)
+        self.response_cache = ResponseCache(cache_max_bytes)
+        self._single_flight = SingleFlight()
+        self.metrics: Metrics | None = Metrics() if metrics else None
+        # Phase timing: always on, or per request via a debug header
+        self.server_timing = server_timing
+        self._server_timing_header = (
+            server_timing_header.lower().encode() if server_timing_header else None
+        )
+        self._timing_hooks: list[Callable] = []
+        self._timing = server_timing or server_timing_header is not None
+        self.profiler = profiler
+        # Graceful shutdown: requests (and their background tasks) in progress
+        self.shutdown_grace = shutdown_grace
+        self._in_flight = 0
+        self._draining = False
+        self._drained: anyio.Event | None = None
+        self._startup_hooks: list[Callable] = []
+        self._shutdown_hooks: list[Callable] = []
+        self.openapi: OpenAPI | None = None
+        # When handlers are inspected: at registration, on first match, or
+        # in bulk at lifespan startup
+        self.route_loading = route_loading
 
     # SECTION: core
 
@@ -38,36 +105,160 @@ class Oberoon(RoutingMixin):
         if scope["type"] == "lifespan":
             await self.handle_lifespan(receive, send)
         elif scope["type"] == "http":
-            request = Request(scope, receive)
-            response = await self.handle_request(request)
-            await response.send(send)
+            await self.handle_http(scope, receive, send)
         elif scope["type"] == "websocket":
             raise NotImplementedError("WebSockets not implemented yet")
         else:
             raise NotImplementedError(f"Unknown scope type: {scope['type']}")
 
+    async def handle_http(self, scope: dict, receive: Callable, send: Callable):
+        scope["app"] = self
+        if self._draining:
+            request = Request(scope, receive)
+            exc = ServiceUnavailableException(
+                self._retry_after, "Server is shutting down"
+            )
+            response = await self._handle_exception(request, exc)
+            response.headers["connection"] = "close"
+            await response.send(send)
+            return
+
+        self._in_flight += 1
+        try:
+            await self._serve_http(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+            if self._drained is not None and not self._in_flight:
+                self._drained.set()
+
+    async def _serve_http(self, scope: dict, receive: Callable, send: Callable):
+        request = Request(scope, receive)
+        timer = self._start_timer(request) if self._timing else None
+        start = time.perf_counter() if self.metrics is not None else 0.0
+
+        profiler = self.profiler
+        if profiler is not None and profiler.should_profile(request):
+            response = await profiler.profile(
+                request, lambda: self.handle_request(request)
+            )
+        else:
+            response = await self.handle_request(request)
+        if timer is not None:
+            self._finish_timer(request, response, timer)
+        await response.send(send)
+
+        if self.metrics is not None:
+            route = scope.get("route")
+            self.metrics.observe(
+                route.path if route is not None else UNMATCHED,
+                request.method,
+                response.status_code,
+                time.perf_counter() - start,
+            )
+        if response.background is not None:
+            await response.background.run(self._background_semaphore)
+
     def _build_route(
-        self, pattern, handler, methods: list[str], param_types: dict
+        self,
+        path: str,
+        handler,
+        methods: list[str],
+        priority: int = Priority.NORMAL,
+        max_concurrency: int | None = None,
+        max_queue: int = 0,
+        queue_timeout: float | None = None,
+        etag: bool | Callable = False,
+        coalesce: bool = False,
+        coalesce_vary: Iterable[str] = (),
+        include_in_schema: bool = True,
     ) -> Route:
-        meta = inspect_handler_signature(handler, set(param_types.keys()))
-        return Route(
-            pattern=pattern,
-            param_types=param_types,
+        limiter = None
+        if max_concurrency is not None:
+            limiter = ConcurrencyLimiter(
+                max_concurrency, max_queue, queue_timeout, self._retry_after
+            )
+        route = Route(
+            path=path,
+            pattern=None,
+            param_types={},
             handler=handler,
             methods=methods,
-            body_param=meta.body_param,
-            body_type=meta.body_type,
-            return_type=meta.return_type,
-            query_type=meta.query_type,
-            query_field_names=meta.query_field_names,
-            header_type=meta.header_type,
-            header_field_names=meta.header_field_names,
+            priority=priority,
+            limiter=limiter,
+            rate_limiter=getattr(handler, "__rate_limit__", None),
+            cache=getattr(handler, "__cache__", None),
+            etag=etag,
+            coalesce=coalesce,
+            coalesce_vary=tuple(name.lower() for name in coalesce_vary),
+            include_in_schema=include_in_schema,
+        )
+        if self.route_loading == "eager":
+            if isinstance(handler, str):
+                # Import deferred to first dispatch; the path is known now
+                self._compile_route(route)
+            else:
+                self._prepare_route(route)
+        return route
+
+    def _compile_route(self, route: Route):
+        started = time.perf_counter()
+        route.pattern, route.param_types = compile_path(route.path)
+        route.setup_time += time.perf_counter() - started
+        return route.pattern
+
+    def _prepare_route(self, route: Route) -> None:
+        """Compile the path, import a string handler and inspect its signature."""
+        if route.pattern is None:
+            self._compile_route(route)
+        started = time.perf_counter()
+        if isinstance(route.handler, str):
+            handler = route.handler = import_string(route.handler)
+            route.rate_limiter = getattr(handler, "__rate_limit__", None)
+            route.cache = getattr(handler, "__cache__", None)
+        meta = inspect_handler_signature(route.handler, set(route.param_types))
+        route.body_param = meta.body_param
+        route.body_type = meta.body_type
+        route.return_type = meta.return_type
+        route.query_type = meta.query_type
+        route.query_field_names = meta.query_field_names
+        route.header_type = meta.header_type
+        route.header_field_names = meta.header_field_names
+        route.header_names = meta.header_names
+        route.background_param = meta.background_param
+        route.invoke = compose_invoker(route, self.response_cache, self._single_flight)
+        route.inspected = True
+        route.setup_time += time.perf_counter() - started
+
+    def prepare_routes(self) -> None:
+        """Compile and inspect every route that has not been yet."""
+        for route in self._routes:
+            if not route.inspected:
+                self._prepare_route(route)
+
+    def slowest_routes(self, n: int = 10) -> list[Route]:
+        """The ``n`` routes that took longest to compile and inspect so far."""
+        return sorted(self._routes, key=lambda r: r.setup_time, reverse=True)[:n]
+
+    def _log_route_setup(self) -> None:
+        prepared = sum(1 for route in self._routes if route.inspected)
+        if not prepared:
+            return
+        total = sum(route.setup_time for route in self._routes)
+        logger.info(
+            "prepared %d/%d routes in %.1f ms; slowest: %s",
+            prepared,
+            len(self._routes),
+            total * 1000,
+            ", ".join(
+                f"{'|'.join(route.methods)} {route.path} "
+                f"({route.setup_time * 1000:.2f} ms)"
+                for route in self.slowest_routes(5)
+            ),
         )
 
-    def route(self, path: str, methods: list[str] | None = None):
+    def route(self, path: str, methods: list[str] | None = None, **options):
         def decorator(handler):
-            pattern, param_types = compile_path(path)
-            route = self._build_route(pattern, handler, methods or ["GET"], param_types)
+            route = self._build_route(path, handler, methods or ["GET"], **options)
             self._routes.append(route)
             logger.warning(
                 "route registered: %s %s -> %s",
@@ -81,15 +272,15 @@ class Oberoon(RoutingMixin):
 
     def include_router(self, router: Router, prefix: str = ""):
         for record in router._route_records:
-            pattern, param_types = compile_path(prefix + router.prefix + record.path)
+            full_path = prefix + router.prefix + record.path
             route = self._build_route(
-                pattern, record.handler, record.methods, param_types
+                full_path, record.handler, record.methods, **record.options
             )
             self._routes.append(route)
             logger.warning(
                 "route include regged: %s %s -> %s",
-                route.pattern,
-                route.param_types,
+                route.methods,
+                route.path,
                 getattr(route.handler, "__name__", repr(route.handler)),
             )
 
@@ -97,80 +288,27 @@ class Oberoon(RoutingMixin):
             self.include_router(subrouter, prefix + router.prefix)
 
     async def handle_request(self, request: Request) -> Response:
+        timer = request.timer
         try:
             route, path_params = await self.find_handler(request.method, request.path)
         except (NotFoundException, MethodNotAllowedException) as exc:
-            exc_handler = self._lookup_exception_handler(exc)
-            return exc_handler(request, exc)
+            if timer is not None:
+                timer.mark("routing")
+            return await self._handle_exception(request, exc)
 
+        if timer is not None:
+            timer.mark("routing")
+        request._scope["route"] = route
+        rate_limit = None
         try:
-            # Convert path params
-            try:
-                converted_params = {
-                    k: route.param_types[k](v) for k, v in path_params.items()
-                }
-            except (ValueError, TypeError) as e:
-                raise ValidationError(
-                    errors=[
-                        {"loc": ["path"], "msg": str(e), "type": "validation_error"}
-                    ]
-                )
-
-            # Validate and inject query params
-            if route.query_type:
-                try:
-                    query_obj = msgspec.convert(
-                        request.query_params, route.query_type, strict=False
-                    )
-                except (msgspec.ValidationError, msgspec.DecodeError) as e:
-                    raise ValidationError(
-                        errors=[
-                            {
-                                "loc": ["query"],
-                                "msg": str(e),
-                                "type": "validation_error",
-                            }
-                        ]
-                    )
-                for name in route.query_field_names:
-                    converted_params[name] = getattr(query_obj, name)
-
-            # Validate and inject header params
-            if route.header_type:
-                # Map underscore field names to hyphenated header keys
-                header_data = {}
-                for name in route.header_field_names:
-                    header_key = name.replace("_", "-")
-                    if header_key in request.headers:
-                        header_data[name] = request.headers[header_key]
-                try:
-                    header_obj = msgspec.convert(
-                        header_data, route.header_type, strict=False
-                    )
-                except (msgspec.ValidationError, msgspec.DecodeError) as e:
-                    raise ValidationError(
-                        errors=[
-                            {
-                                "loc": ["header"],
-                                "msg": str(e),
-                                "type": "validation_error",
-                            }
-                        ]
-                    )
-                for name in route.header_field_names:
-                    converted_params[name] = getattr(header_obj, name)
-
-            # Decode and validate request body
-            if route.body_param and route.body_type:
-                body = await decode_body(request, route.body_type)
-                converted_params[route.body_param] = body
-
-            # Call handler
-            result = await route.handler(request, **converted_params)
-
-            # Serialize response
-            response = serialize_response(result, route.return_type)
+            # Lazy routes are imported and inspected here, so a failure goes
+            # through the exception handlers like any other request error
+            if not route.inspected:
+                self._prepare_route(route)
+            if route.rate_limiter is not None:
+                rate_limit = route.rate_limiter.check(request)
 
+            response = await self._admitted(request, route, path_params)
         except Exception as exc:
             logger.warning(
                 "%s %s %s: %s",
@@ -179,12 +317,43 @@ class Oberoon(RoutingMixin):
                 request.path,
                 exc,
             )
-            exc_handler = self._lookup_exception_handler(exc)
-            return exc_handler(request, exc)
+            return await self._handle_exception(request, exc)
+
+        if rate_limit is not None:
+            response.headers.update(route.rate_limiter.headers(rate_limit))
 
         logger.info("%s %s -> %d", request.method, request.path, response.status_code)
         return response
 
+    async def _admitted(
+        self, request: Request, route: Route, path_params: dict
+    ) -> Response:
+        if route.limiter is None and self._limiter is None:
+            return await route.invoke(request, path_params)
+        async with self._admit(route):
+            if request.timer is not None:
+                request.timer.mark("admission")
+            return await route.invoke(request, path_params)
+
+    @asynccontextmanager
+    async def _admit(self, route: Route) -> AsyncIterator[None]:
+        """Hold a route slot and a global slot for the duration of the request.
+
+        The route slot is taken first so a request queued behind a saturated
+        route does not sit on global capacity.
+        """
+        if route.limiter is not None:
+            await route.limiter.acquire(route.priority)
+        try:
+            if self._limiter is not None:
+                async with self._limiter.slot(route.priority):
+                    yield
+            else:
+                yield
+        finally:
+            if route.limiter is not None:
+                route.limiter.release()
+
     async def find_handler(self, method: str, path: str):
         logger.warning("finding handler for: %s %s", method, path)
         method_mismatch: bool = False
@@ -193,10 +362,13 @@ class Oberoon(RoutingMixin):
             logger.warning(
                 "checking route: %s %s -> %s",
                 route.methods,
-                route.pattern,
+                route.path,
                 route.handler,
             )
-            match = route.pattern.match(path)
+            pattern = route.pattern
+            if pattern is None:
+                pattern = self._compile_route(route)
+            match = pattern.match(path)
             if match:
                 if method in route.methods:
                     return route, match.groupdict()
@@ -206,33 +378,191 @@ class Oberoon(RoutingMixin):
             raise MethodNotAllowedException
         raise NotFoundException
 
+    @property
+    def in_flight(self) -> int:
+        """Requests being handled right now, background tasks included."""
+        return self._in_flight
+
+    def on_startup(self, hook: Callable) -> Callable:
+        """Register a (sync or async) callable to run at lifespan startup."""
+        self._startup_hooks.append(hook)
+        return hook
+
+    def on_shutdown(self, hook: Callable) -> Callable:
+        """Register a (sync or async) callable to run once requests have drained."""
+        self._shutdown_hooks.append(hook)
+        return hook
+
+    async def _run_hooks(self, hooks: list[Callable]) -> None:
+        for hook in hooks:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+
+    async def drain(self) -> None:
+        """Stop admitting requests and wait up to ``shutdown_grace`` for the
+        ones in progress, including their background tasks, to finish."""
+        self._draining = True
+        if self._in_flight:
+            logger.info("draining %d in-flight requests", self._in_flight)
+            self._drained = anyio.Event()
+            with anyio.move_on_after(self.shutdown_grace):
+                await self._drained.wait()
+        if self._in_flight:
+            logger.warning(
+                "shutdown grace period expired with %d requests in flight",
+                self._in_flight,
+            )
+
     async def handle_lifespan(self, receive, send):
         while True:
             message = await receive()
             if message["type"] == "lifespan.startup":
+                # The same app object may be started again (tests, reloads)
+                self._draining = False
+                self._drained = None
+                try:
+                    if self.route_loading == "startup":
+                        self.prepare_routes()
+                    self._log_route_setup()
+                    await self._run_hooks(self._startup_hooks)
+                except Exception as exc:
+                    logger.exception("startup hook failed")
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
                 await send({"type": "lifespan.startup.complete"})
             elif message["type"] == "lifespan.shutdown":
+                await self.drain()
+                try:
+                    await self._run_hooks(self._shutdown_hooks)
+                except Exception as exc:
+                    logger.exception("shutdown hook failed")
+                    await send(
+                        {"type": "lifespan.shutdown.failed", "message": str(exc)}
+                    )
+                    return
                 await send({"type": "lifespan.shutdown.complete"})
                 return
 
+    def add_timing_hook(self, hook: Callable[[Request, list[Span]], None]) -> None:
+        """Call ``hook(request, spans)`` with the phase spans of every request."""
+        self._timing_hooks.append(hook)
+        self._timing = True
+
+    def _start_timer(self, request: Request) -> PhaseTimer | None:
+        expose = self.server_timing
+        if not expose and self._server_timing_header is not None:
+            name = self._server_timing_header
+            expose = any(k == name for k, _ in request._scope["headers"])
+        if not expose and not self._timing_hooks:
+            return None
+        request.timer = PhaseTimer(expose)
+        return request.timer
+
+    def _finish_timer(
+        self, request: Request, response: Response, timer: PhaseTimer
+    ) -> None:
+        if timer.expose:
+            response.headers["server-timing"] = timer.header()
+        if self._timing_hooks:
+            spans = timer.spans()
+            for hook in self._timing_hooks:
+                try:
+                    hook(request, spans)
+                except Exception:
+                    logger.exception("timing hook %r failed", hook)
+
+    def mount_metrics(self, path: str = "/metrics") -> None:
+        """Serve the Prometheus text exposition at ``path``, enabling metrics."""
+        if self.metrics is None:
+            self.metrics = Metrics()
+        metrics = self.metrics
+
+        async def metrics_endpoint(request: Request) -> Response:
+            response = Response(200)
+            response.set_body(metrics.render(), METRICS_CONTENT_TYPE)
+            return response
+
+        self.get(path, include_in_schema=False)(metrics_endpoint)
+
+    def mount_openapi(
+        self,
+        path: str = "/openapi.json",
+        docs_path: str | None = "/docs",
+        version: str = "0.1.0",
+        description: str | None = None,
+    ) -> OpenAPI:
+        """Serve the OpenAPI document at ``path`` and Swagger UI at ``docs_path``.
+
+        The document is generated on first request, once every router has
+        been included, and served from pre-encoded bytes with an ETag.
+        """
+        openapi = self.openapi = OpenAPI(self, version, description)
+
+        async def openapi_endpoint(request: Request) -> Response:
+            return openapi.response()
+
+        self.get(
+            path,
+            etag=lambda request, params: openapi.etag,
+            include_in_schema=False,
+        )(openapi_endpoint)
+
+        if docs_path is not None:
+            # Keyed by root_path, which the document URL has to include
+            pages: dict[str, bytes] = {}
+
+            async def docs_endpoint(request: Request) -> Response:
+                root_path = request._scope.get("root_path", "")
+                page = pages.get(root_path)
+                if page is None:
+                    page = pages[root_path] = DOCS_HTML.format(
+                        title=html.escape(self.title), openapi_url=root_path + path
+                    ).encode()
+                response = Response(200)
+                response.set_body(page, "text/html; charset=utf-8")
+                return response
+
+            self.get(docs_path, include_in_schema=False)(docs_endpoint)
+        return openapi
+
     def exception_handler(self, exc_class: type):
+        """Register a (sync or async) ``handler(request, exc) -> Response``."""
+
         def decorator(handler):
             self._exception_handlers[exc_class] = handler
+            self._exception_handler_cache.clear()
             return handler
 
         return decorator
 
+    async def _handle_exception(self, request: Request, exc: Exception) -> Response:
+        response = self._lookup_exception_handler(exc)(request, exc)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
     def _lookup_exception_handler(self, exc: Exception) -> Callable:
+        cls = type(exc)
+        try:
+            handler = self._exception_handler_cache[cls]
+        except KeyError:
+            handler = self._exception_handler_cache[cls] = self._resolve_handler(cls)
+        if handler is None:
+            if self.debug:
+                return debug_error_handler
+            return self.error_responses.error_handler
+        return handler
+
+    def _resolve_handler(self, exc_class: type) -> Callable | None:
         # Check user-registered handlers first, walking MRO for specificity
-        for cls in type(exc).__mro__:
+        for cls in exc_class.__mro__:
             if cls in self._exception_handlers:
                 return self._exception_handlers[cls]
 
         # Fall back to defaults
-        if isinstance(exc, ValidationError):
+        if issubclass(exc_class, ValidationError):
             return default_validation_handler
-        if isinstance(exc, HTTPException):
-            return default_http_handler
-        if self.debug:
-            return debug_error_handler
-        return default_error_handler
+        if issubclass(exc_class, HTTPException):
+            return self.error_responses.http_handler
+        return None
@@ -1,13 +1,21 @@
+import msgspec
+
 from oberoon.requests import Request
-from oberoon.responses import JSONResponse, Response
+from oberoon.responses import JSONResponse, PrebuiltResponse, Response
 
 # Classes
 
 
 class HTTPException(Exception):
-    def __init__(self, status_code: int, detail: str = ""):
+    def __init__(
+        self,
+        status_code: int,
+        detail: str = "",
+        headers: dict[str, str] | None = None,
+    ):
         self.status_code = status_code
         self.detail = detail
+        self.headers = headers or {}
 
 
 class NotFoundException(HTTPException):
@@ -20,6 +28,26 @@ class MethodNotAllowedException(HTTPException):
         super().__init__(status_code=405, detail=detail)
 
 
+class TooManyRequestsException(HTTPException):
+    """Raised when a client exceeds its rate limit."""
+
+    def __init__(
+        self, detail: str = "Too Many Requests", headers: dict[str, str] | None = None
+    ):
+        super().__init__(status_code=429, detail=detail, headers=headers)
+
+
+class ServiceUnavailableException(HTTPException):
+    """Raised when a request is shed by admission control."""
+
+    def __init__(self, retry_after: int = 1, detail: str = "Service Unavailable"):
+        super().__init__(
+            status_code=503,
+            detail=detail,
+            headers={"retry-after": str(retry_after)},
+        )
+
+
 class ValidationError(HTTPException):
     """Raised when request body fails msgspec validation.
 
@@ -43,7 +71,9 @@ def default_validation_handler(request: Request, exc: ValidationError) -> Respon
 
 
 def default_http_handler(request: Request, exc: HTTPException) -> Response:
-    return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+    response = JSONResponse({"error": exc.detail}, status_code=exc.status_code)
+    response.headers.update(exc.headers)
+    return response
 
 
 def default_error_handler(request: Request, exc: Exception) -> Response:
@@ -55,3 +85,49 @@ def debug_error_handler(request: Request, exc: Exception) -> Response:
         {"error": "Internal Server Error", "detail": f"{type(exc).__name__}: {exc}"},
         status_code=500,
     )
+
+
+class ErrorResponses:
+    """The default 404, 405 and 500 responses, encoded once per app.
+
+    ``http_handler`` serves a ``NotFoundException`` / ``MethodNotAllowedException``
+    carrying its default detail from the prebuilt bytes; any other
+    ``HTTPException`` goes through ``default_http_handler``. ``error_handler``
+    is the non-debug 500. Replace a body with ``set()``, or register an
+    exception handler to take over entirely.
+    """
+
+    def __init__(self):
+        self._by_detail: dict[tuple[int, str], PrebuiltResponse] = {}
+        self._internal_error = self._json(500, "Internal Server Error")
+        for exc_class in (NotFoundException, MethodNotAllowedException):
+            exc = exc_class()
+            self._by_detail[exc.status_code, exc.detail] = self._json(
+                exc.status_code, exc.detail
+            )
+
+    @staticmethod
+    def _json(status_code: int, error: str) -> PrebuiltResponse:
+        body = msgspec.json.encode({"error": error})
+        return PrebuiltResponse.build(status_code, body, "application/json")
+
+    def set(self, status_code: int, body: bytes, content_type: str) -> None:
+        """Replace the prebuilt 404, 405 or 500 response."""
+        template = PrebuiltResponse.build(status_code, body, content_type)
+        if status_code == 500:
+            self._internal_error = template
+            return
+        for key in self._by_detail:
+            if key[0] == status_code:
+                self._by_detail[key] = template
+                return
+        raise ValueError(f"No prebuilt response for status {status_code}")
+
+    def http_handler(self, request: Request, exc: HTTPException) -> Response:
+        template = self._by_detail.get((exc.status_code, exc.detail))
+        if template is None or exc.headers:
+            return default_http_handler(request, exc)
+        return template.copy()
+
+    def error_handler(self, request: Request, exc: Exception) -> Response:
+        return self._internal_error.copy()
@@ -0,0 +1,20 @@
+import importlib
+from typing import Any
+
+
+def import_string(path: str) -> Any:
+    """Import ``"package.module:attr"`` (attr may be dotted) and return it."""
+    module_name, sep, attr = path.partition(":")
+    if not sep or not module_name or not attr:
+        raise ImportError(
+            f"Import string {path!r} must be in 'module:attribute' format"
+        )
+
+    module = importlib.import_module(module_name)
+    obj = module
+    try:
+        for part in attr.split("."):
+            obj = getattr(obj, part)
+    except AttributeError:
+        raise ImportError(f"Module {module_name!r} has no attribute {attr!r}") from None
+    return obj
@@ -0,0 +1,271 @@
+"""Per-route invoker closures.
+
+``compose_invoker`` runs once per route, after its handler has been
+inspected, and returns ``invoke(request, path_params) -> Response`` made of
+only the steps that route needs:
+
+- path conversion, only for non-``str`` path params
+- ``Query`` and ``Header`` validation, only when the handler declares them
+- conditional GET, response caching and request coalescing, only when the
+  route opts in
+- body decoding, ``BackgroundTasks`` injection and body ETags, only when used
+
+Body decoding and serialization use msgspec codecs compiled for the route's
+``body_type`` and ``return_type``, negotiating MessagePack per request.
+
+A route without parameters goes straight from the router match to the
+handler call and ``serialize_response``.
+"""
+
+from collections.abc import Awaitable, Callable
+
+import msgspec
+
+from oberoon.background import BackgroundTasks
+from oberoon.caching import CACHEABLE_METHODS, ResponseCache
+from oberoon.coalescing import COALESCE_METHODS, SingleFlight, coalesce_key
+from oberoon.conditional import CONDITIONAL_METHODS, conditional_response, weak_etag
+from oberoon.exceptions import ValidationError
+from oberoon.negotiation import wants_msgpack
+from oberoon.requests import Request
+from oberoon.requests.query import compile_query_parser
+from oberoon.responses import Response
+from oberoon.routing import Route
+from oberoon.serialization import compile_body_decoder, compile_serializer
+
+Invoker = Callable[[Request, dict], Awaitable[Response]]
+Binder = Callable[[Request, dict], None]
+
+
+def _validation_error(location: str, exc: Exception) -> ValidationError:
+    return ValidationError(
+        errors=[{"loc": [location], "msg": str(exc), "type": "validation_error"}]
+    )
+
+
+def _path_converter(param_types: dict[str, type]) -> Callable[[dict], dict] | None:
+    """Convert the regex groups in place; ``None`` when all params are ``str``."""
+    converters = tuple((name, tp) for name, tp in param_types.items() if tp is not str)
+    if not converters:
+        return None
+
+    def convert(path_params: dict) -> dict:
+        try:
+            for name, tp in converters:
+                path_params[name] = tp(path_params[name])
+        except (ValueError, TypeError) as e:
+            raise _validation_error("path", e)
+        return path_params
+
+    return convert
+
+
+def _query_binder(query_type: type) -> Binder:
+    parse = compile_query_parser(query_type)
+    asdict = msgspec.structs.asdict
+
+    def bind(request: Request, params: dict) -> None:
+        data = parse(request._scope["query_string"])
+        try:
+            query = msgspec.convert(data, query_type, strict=False)
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            raise _validation_error("query", e)
+        params.update(asdict(query))
+
+    return bind
+
+
+def _header_binder(
+    header_type: type, field_names: list[str], header_names: list[bytes]
+) -> Binder:
+    # ASGI header names are lowercase bytes: match them without decoding
+    fields = dict(zip(header_names, field_names))
+    asdict = msgspec.structs.asdict
+
+    def bind(request: Request, params: dict) -> None:
+        data = {}
+        for key, value in request._scope["headers"]:
+            name = fields.get(key)
+            if name is not None:
+                data[name] = value.decode()
+        try:
+            values = msgspec.convert(data, header_type, strict=False)
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            raise _validation_error("header", e)
+        params.update(asdict(values))
+
+    return bind
+
+
+def _needs_nothing(route: Route) -> bool:
+    return (
+        route.body_type is None
+        and route.background_param is None
+        and route.query_type is None
+        and route.header_type is None
+        and route.cache is None
+        and not route.etag
+        and not route.coalesce
+        and all(tp is str for tp in route.param_types.values())
+    )
+
+
+def _direct_invoker(route: Route) -> Invoker:
+    """Match straight to handler: string path params are passed through as-is."""
+    handler = route.handler
+    serialize = compile_serializer(route.return_type)
+
+    async def invoke(request: Request, path_params: dict) -> Response:
+        timer = request.timer
+        if timer is None:
+            return serialize(await handler(request, **path_params), request)
+        timer.mark("validation")
+        result = await handler(request, **path_params)
+        timer.mark("handler")
+        response = serialize(result, request)
+        timer.mark("serialize")
+        return response
+
+    return invoke
+
+
+def _handler_call(route: Route) -> Invoker:
+    """Decode the body, call the handler and serialize its result."""
+    handler = route.handler
+    serialize = compile_serializer(route.return_type)
+    body_param = route.body_param if route.body_type is not None else None
+    decode_body = (
+        compile_body_decoder(route.body_type) if body_param is not None else None
+    )
+    background_param = route.background_param
+    body_etag = route.etag is True
+
+    if body_param is None and background_param is None and not body_etag:
+
+        async def call(request: Request, params: dict) -> Response:
+            result = await handler(request, **params)
+            timer = request.timer
+            if timer is None:
+                return serialize(result, request)
+            timer.mark("handler")
+            response = serialize(result, request)
+            timer.mark("serialize")
+            return response
+
+        return call
+
+    async def call(request: Request, params: dict) -> Response:
+        timer = request.timer
+        if body_param is not None:
+            params[body_param] = await decode_body(request)
+            if timer is not None:
+                timer.mark("body")
+
+        background = None
+        if background_param is not None:
+            background = params[background_param] = BackgroundTasks()
+
+        result = await handler(request, **params)
+        if timer is not None:
+            timer.mark("handler")
+        response = serialize(result, request)
+        if timer is not None:
+            timer.mark("serialize")
+
+        # Hash before the response cache stores it, so hits reuse the ETag
+        if body_etag and response.status_code == 200 and "etag" not in response.headers:
+            response.headers["etag"] = weak_etag(response.body)
+
+        if background:
+            if response.background is None:
+                response.background = background
+            else:
+                response.background.tasks.extend(background.tasks)
+        return response
+
+    return call
+
+
+def compose_invoker(
+    route: Route, response_cache: ResponseCache, single_flight: SingleFlight
+) -> Invoker:
+    """Build ``invoke(request, path_params)`` for an inspected ``route``."""
+    if _needs_nothing(route):
+        return _direct_invoker(route)
+
+    respond = _handler_call(route)
+
+    spec = route.cache
+    if spec is not None:
+        compute = respond
+        route_id = route.pattern.pattern
+
+        async def respond(request: Request, params: dict) -> Response:
+            if request.method not in CACHEABLE_METHODS:
+                return await compute(request, params)
+            key = spec.key_for(request, route_id, params)
+            if wants_msgpack(request._scope):
+                key = (key, "msgpack")
+            return await response_cache.fetch(
+                key,
+                lambda: compute(request, params),
+                spec.ttl,
+                spec.tags_for(params),
+            )
+
+    if route.coalesce:
+        shared = respond
+        vary = route.coalesce_vary
+
+        # Below the conditional check: waiters share the full response and
+        # each decides on its own validators whether to answer 304
+        async def respond(request: Request, params: dict) -> Response:
+            if request.method not in COALESCE_METHODS:
+                return await shared(request, params)
+            return await single_flight.do(
+                coalesce_key(request, vary), lambda: shared(request, params)
+            )
+
+    etag = route.etag
+    if etag:
+        inner = respond
+
+        async def respond(request: Request, params: dict) -> Response:
+            # Conditional GET: may answer 304 without running the handler
+            if request.method not in CONDITIONAL_METHODS:
+                return await inner(request, params)
+            return await conditional_response(
+                request, etag, params, lambda: inner(request, params)
+            )
+
+    convert = _path_converter(route.param_types)
+    binders = []
+    if route.query_type is not None:
+        binders.append(_query_binder(route.query_type))
+    if route.header_type is not None:
+        binders.append(
+            _header_binder(
+                route.header_type, route.header_field_names, route.header_names
+            )
+        )
+
+    if convert is None and not binders:
+
+        async def invoke(request: Request, path_params: dict) -> Response:
+            if request.timer is not None:
+                request.timer.mark("validation")
+            return await respond(request, path_params)
+
+        return invoke
+
+    binders = tuple(binders)
+
+    async def invoke(request: Request, path_params: dict) -> Response:
+        params = convert(path_params) if convert is not None else path_params
+        for bind in binders:
+            bind(request, params)
+        if request.timer is not None:
+            request.timer.mark("validation")
+        return await respond(request, params)
+
+    return invoke
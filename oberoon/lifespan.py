@@ -0,0 +1,58 @@
+"""Running an app's ASGI lifespan from the outside (test client, server)."""
+
+import math
+
+import anyio
+
+
+class LifespanManager:
+    """Drives the ASGI lifespan protocol of ``app`` while the context is open."""
+
+    def __init__(self, app):
+        self.app = app
+        self.state: dict = {}
+        self._supported = True
+
+    async def __aenter__(self) -> None:
+        self._to_app, inbox = anyio.create_memory_object_stream(math.inf)
+        outbox, self._from_app = anyio.create_memory_object_stream(math.inf)
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": self.state}
+
+        async def run() -> None:
+            async with outbox:
+                try:
+                    await self.app(scope, inbox.receive, outbox.send)
+                except Exception:
+                    # Apps without lifespan support may raise (ASGI spec)
+                    self._supported = False
+
+        self._tg = anyio.create_task_group()
+        await self._tg.__aenter__()
+        self._tg.start_soon(run)
+        try:
+            await self._to_app.send({"type": "lifespan.startup"})
+            message = await self._receive()
+            if message is not None and message["type"] == "lifespan.startup.failed":
+                raise RuntimeError(message.get("message") or "Lifespan startup failed")
+        except BaseException:
+            self._to_app.close()
+            self._tg.cancel_scope.cancel()
+            await self._tg.__aexit__(None, None, None)
+            raise
+
+    async def __aexit__(self, *exc_info) -> None:
+        message = None
+        if self._supported:
+            await self._to_app.send({"type": "lifespan.shutdown"})
+            message = await self._receive()
+        self._to_app.close()
+        await self._tg.__aexit__(*exc_info)
+        if message is not None and message["type"] == "lifespan.shutdown.failed":
+            raise RuntimeError(message.get("message") or "Lifespan shutdown failed")
+
+    async def _receive(self) -> dict | None:
+        try:
+            return await self._from_app.receive()
+        except anyio.EndOfStream:
+            self._supported = False
+            return None
@@ -0,0 +1,362 @@
+"""Concurrent load generation for ``oberoon bench``.
+
+A scenario is a JSON-lines file, one request template per line::
+
+    {"method": "GET", "path": "/api/books", "params": {"genre": "sci-fi"}}
+    {"method": "POST", "path": "/api/books", "json": {...}, "weight": 2, "expect": 201}
+
+Templates are replayed round-robin (``weight`` repeats a template) by
+``concurrency`` workers until ``total`` requests have completed, either
+in-process through ``AsyncTestClient`` or over keep-alive HTTP/1.1
+connections to a running server. Latencies go into an HDR-style
+log-linear histogram.
+"""
+
+import itertools
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+import anyio
+import msgspec
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from oberoon.testing import AsyncTestClient
+
+
+class ScenarioRequest(msgspec.Struct, forbid_unknown_fields=True):
+    path: str
+    method: str = "GET"
+    params: dict[str, Any] | None = None
+    headers: dict[str, str] | None = None
+    json: Any = None
+    body: str | None = None
+    weight: int = 1
+    expect: int | None = None
+
+
+def load_scenario(path: str | Path) -> list[ScenarioRequest]:
+    """Parse a JSON-lines scenario; blank lines and ``#`` comments are skipped."""
+    requests = []
+    for number, line in enumerate(Path(path).read_text().splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            requests.append(msgspec.json.decode(line, type=ScenarioRequest))
+        except msgspec.ValidationError as exc:
+            raise ValueError(f"{path}:{number}: {exc}") from None
+    if not requests:
+        raise ValueError(f"{path}: scenario is empty")
+    return requests
+
+
+# SECTION: histogram
+
+# Exact below 128, then 64 linear sub-buckets per power of two: bucket
+# width is at most 1/64 (~1.6%) of the values it holds
+_SUB_BITS = 7
+_SUB_COUNT = 1 << _SUB_BITS
+
+
+class LatencyHistogram:
+    """Log-linear histogram of integer microsecond values.
+
+    Values below 128 are exact; above that each power-of-two range is split
+    into 64 equal buckets, the same layout HdrHistogram uses.
+    """
+
+    def __init__(self):
+        self._counts: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB_COUNT:
+            return value
+        shift = value.bit_length() - _SUB_BITS
+        return (shift << (_SUB_BITS - 1)) + (value >> shift)
+
+    @staticmethod
+    def _lowest(index: int) -> int:
+        if index < _SUB_COUNT:
+            return index
+        shift = (index >> (_SUB_BITS - 1)) - 1
+        return (index - (shift << (_SUB_BITS - 1))) << shift
+
+    @classmethod
+    def _highest(cls, index: int) -> int:
+        return cls._lowest(index + 1) - 1
+
+    def record(self, value: int) -> None:
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the ``q``-th percentile (0-100)."""
+        if not self.count:
+            return 0
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    def distribution(self, ticks: int = 12) -> list[tuple[int, float, int]]:
+        """``(value_us, percentile, count)`` rows at HDR-style percentile ticks.
+
+        Ticks halve the remaining distance to 100 each step: 0, 50, 75, 87.5...
+        """
+        rows = []
+        for step in range(ticks):
+            q = 100 - 100 / 2**step
+            rows.append((self.percentile(q), q, max(1, round(q / 100 * self.count))))
+        rows.append((self.max, 100.0, self.count))
+        return rows
+
+
+# SECTION: runner
+
+
+@dataclass
+class BenchResult:
+    requests: int = 0
+    elapsed: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+    unexpected: int = 0
+    errors: Counter = field(default_factory=Counter)
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        hist = self.histogram
+        return {
+            "requests": self.requests,
+            "elapsed_s": self.elapsed,
+            "throughput_rps": self.throughput,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "unexpected_status": self.unexpected,
+            "errors": dict(self.errors),
+            "latency_us": {
+                "mean": hist.mean,
+                "p50": hist.percentile(50),
+                "p90": hist.percentile(90),
+                "p99": hist.percentile(99),
+                "p99.9": hist.percentile(99.9),
+                "max": hist.max,
+            },
+        }
+
+
+Sender = Callable[[ScenarioRequest], Awaitable[int]]
+
+
+async def _drive(
+    senders: list[Sender], scenario: list[ScenarioRequest], total: int
+) -> BenchResult:
+    schedule = [req for req in scenario for _ in range(req.weight)]
+    result = BenchResult()
+    counter = itertools.count()
+    clock = time.perf_counter_ns
+
+    async def worker(send: Sender) -> None:
+        while (i := next(counter)) < total:
+            req = schedule[i % len(schedule)]
+            start = clock()
+            try:
+                status = await send(req)
+            except Exception as exc:
+                result.errors[type(exc).__name__] += 1
+                continue
+            result.histogram.record((clock() - start) // 1000)
+            result.statuses[status] += 1
+            if req.expect is not None and status != req.expect:
+                result.unexpected += 1
+
+    started = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for send in senders:
+            tg.start_soon(worker, send)
+    result.elapsed = time.perf_counter() - started
+    result.requests = sum(result.statuses.values())
+    return result
+
+
+async def run_in_process(
+    app, scenario: list[ScenarioRequest], total: int, concurrency: int
+) -> BenchResult:
+    """Run against ``app`` directly, with lifespan startup/shutdown around it."""
+    async with AsyncTestClient(app) as client:
+
+        async def send(req: ScenarioRequest) -> int:
+            response = await client.request(
+                req.method,
+                req.path,
+                params=req.params,
+                headers=req.headers,
+                json=req.json,
+                content=req.body,
+            )
+            return response.status_code
+
+        return await _drive([send] * concurrency, scenario, total)
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 client connection."""
+
+    def __init__(self, host: str, port: int, encoded: dict[int, bytes]):
+        self.host = host
+        self.port = port
+        self.encoded = encoded
+        self._stream = None
+        self._reader: BufferedByteReceiveStream | None = None
+
+    async def send(self, req: ScenarioRequest) -> int:
+        if self._stream is None:
+            self._stream = await anyio.connect_tcp(self.host, self.port)
+            self._reader = BufferedByteReceiveStream(self._stream)
+        try:
+            await self._stream.send(self.encoded[id(req)])
+            status, keep_alive = await self._read_response(req.method == "HEAD")
+        except Exception:
+            await self.close()
+            raise
+        if not keep_alive:
+            await self.close()
+        return status
+
+    async def _read_response(self, head: bool) -> tuple[int, bool]:
+        reader = self._reader
+        raw = await reader.receive_until(b"\r\n\r\n", 65536)
+        lines = raw.split(b"\r\n")
+        version, status, *_ = lines[0].split(b" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get(b"connection", b"").lower() != b"close"
+        if version == b"HTTP/1.0":
+            keep_alive = headers.get(b"connection", b"").lower() == b"keep-alive"
+        code = int(status)
+        if head or code in (204, 304) or 100 <= code < 200:
+            return code, keep_alive
+
+        if headers.get(b"transfer-encoding", b"").lower() == b"chunked":
+            while True:
+                size_line = await reader.receive_until(b"\r\n", 1024)
+                size = int(size_line.split(b";")[0], 16)
+                if size == 0:
+                    # Trailers end with an empty line
+                    while await reader.receive_until(b"\r\n", 65536):
+                        pass
+                    break
+                await reader.receive_exactly(size + 2)
+        elif b"content-length" in headers:
+            length = int(headers[b"content-length"])
+            if length:
+                await reader.receive_exactly(length)
+        else:
+            # Body delimited by connection close
+            try:
+                while True:
+                    await reader.receive()
+            except anyio.EndOfStream:
+                pass
+            keep_alive = False
+        return code, keep_alive
+
+    async def close(self) -> None:
+        if self._stream is not None:
+            await self._stream.aclose()
+        self._stream = self._reader = None
+
+
+def _encode_request(req: ScenarioRequest, netloc: str) -> bytes:
+    target = req.path
+    if req.params:
+        separator = "&" if "?" in target else "?"
+        target += separator + urlencode(req.params, doseq=True)
+
+    headers = {"host": netloc, "user-agent": "oberoon-bench"}
+    body = b""
+    if req.json is not None:
+        body = msgspec.json.encode(req.json)
+        headers["content-type"] = "application/json"
+    elif req.body is not None:
+        body = req.body.encode()
+    if body or req.method.upper() not in ("GET", "HEAD"):
+        headers["content-length"] = str(len(body))
+    if req.headers:
+        headers.update({k.lower(): v for k, v in req.headers.items()})
+
+    head = f"{req.method.upper()} {target} HTTP/1.1\r\n"
+    head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    return (head + "\r\n").encode("latin-1") + body
+
+
+async def run_over_socket(
+    url: str, scenario: list[ScenarioRequest], total: int, concurrency: int
+) -> BenchResult:
+    """Run against a server listening at ``url`` (``http://host:port``)."""
+    parts = urlsplit(url)
+    if parts.scheme != "http" or not parts.hostname:
+        raise ValueError(f"Only http://host:port targets are supported, got {url!r}")
+    encoded = {id(req): _encode_request(req, parts.netloc) for req in scenario}
+    connections = [
+        _Connection(parts.hostname, parts.port or 80, encoded)
+        for _ in range(concurrency)
+    ]
+    try:
+        return await _drive([c.send for c in connections], scenario, total)
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+def format_report(result: BenchResult, concurrency: int) -> str:
+    hist = result.histogram
+    lines = [
+        f"Requests:     {result.requests:,} in {result.elapsed:.2f}s"
+        f" ({concurrency:,} concurrent)",
+        f"Throughput:   {result.throughput:,.0f} req/s",
+        "Status codes: "
+        + ", ".join(f"{code}: {n:,}" for code, n in sorted(result.statuses.items())),
+    ]
+    if result.unexpected:
+        lines.append(f"Unexpected:   {result.unexpected:,} responses")
+    if result.errors:
+        lines.append(
+            "Errors:       "
+            + ", ".join(f"{name}: {n:,}" for name, n in result.errors.most_common())
+        )
+
+    lines += ["", "Latency (ms)"]
+    for label, q in (("p50", 50), ("p90", 90), ("p99", 99), ("p99.9", 99.9)):
+        lines.append(f"  {label:<6} {hist.percentile(q) / 1000:10.3f}")
+    lines.append(f"  {'max':<6} {hist.max / 1000:10.3f}")
+    lines.append(f"  {'mean':<6} {hist.mean / 1000:10.3f}")
+
+    lines += ["", f"{'Value (ms)':>12} {'Percentile':>12} {'TotalCount':>12}"]
+    for value, percentile, count in hist.distribution():
+        lines.append(f"{value / 1000:>12.3f} {percentile / 100:>12.6f} {count:>12,}")
+    return "\n".join(lines)
@@ -0,0 +1,90 @@
+"""MessagePack / JSON content negotiation for typed bodies.
+
+Request bodies are decoded as MessagePack when ``Content-Type`` is a
+MessagePack media type, and as JSON otherwise. Typed responses are encoded
+as MessagePack only when ``Accept`` ranks it strictly above JSON, so
+clients that send no ``Accept``, ``*/*`` or ``application/json`` keep
+getting JSON. Typed responses in either format carry ``Vary: Accept`` so
+shared caches keep the two apart.
+
+Both checks read the raw ASGI header list, and ``Accept`` values are parsed
+once and remembered, since a service sees only a handful of distinct ones.
+"""
+
+MSGPACK_MEDIA_TYPES = frozenset(
+    {b"application/msgpack", b"application/x-msgpack", b"application/vnd.msgpack"}
+)
+
+_ACCEPT = b"accept"
+_CONTENT_TYPE = b"content-type"
+
+# Parsed Accept values; bounded, since clients send a small fixed set
+_PREFERS_MSGPACK: dict[bytes, bool] = {}
+_MAX_ACCEPT_VALUES = 256
+
+
+def _media_type(value: bytes) -> bytes:
+    return value.partition(b";")[0].strip().lower()
+
+
+def _quality(params: bytes) -> float:
+    for param in params.split(b";"):
+        name, _, value = param.partition(b"=")
+        if name.strip().lower() == b"q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def prefers_msgpack(accept: bytes) -> bool:
+    """True if the ``Accept`` value ranks MessagePack above JSON.
+
+    Each side takes the quality of its most specific matching range (the
+    exact type, then ``application/*``, then ``*/*``); ties go to JSON.
+    """
+    result = _PREFERS_MSGPACK.get(accept)
+    if result is not None:
+        return result
+
+    msgpack = json = application = anything = None
+    for media_range in accept.split(b","):
+        media_type, _, params = media_range.partition(b";")
+        media_type = media_type.strip().lower()
+        q = _quality(params) if params else 1.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack = q if msgpack is None else max(msgpack, q)
+        elif media_type == b"application/json":
+            json = q
+        elif media_type == b"application/*":
+            application = q
+        elif media_type == b"*/*":
+            anything = q
+
+    def rank(exact: float | None) -> float:
+        for q in (exact, application, anything):
+            if q is not None:
+                return q
+        return 0.0
+
+    result = rank(msgpack) > rank(json)
+    if len(_PREFERS_MSGPACK) < _MAX_ACCEPT_VALUES:
+        _PREFERS_MSGPACK[accept] = result
+    return result
+
+
+def wants_msgpack(scope: dict) -> bool:
+    """True if the request's ``Accept`` header asks for MessagePack."""
+    for name, value in scope["headers"]:
+        if name == _ACCEPT:
+            return prefers_msgpack(value)
+    return False
+
+
+def sends_msgpack(scope: dict) -> bool:
+    """True if the request body is declared as MessagePack."""
+    for name, value in scope["headers"]:
+        if name == _CONTENT_TYPE:
+            return _media_type(value) in MSGPACK_MEDIA_TYPES
+    return False
@@ -0,0 +1,192 @@
+"""On-demand profiling of individual requests.
+
+A ``RequestProfiler`` wraps exactly the ``handle_request`` call of the
+requests it selects and leaves every other request untouched. Requests are
+selected either
+
+- by a signed header (``x-oberoon-profile: <token>``, see ``make_profile_token``)
+- or by sampling every ``sample_every``-th request
+
+Two modes are available:
+
+- ``"cprofile"`` — deterministic ``cProfile``; one ``.prof`` file per request,
+  loadable with ``pstats.Stats`` (pass several files to aggregate them)
+- ``"sampling"`` — a background thread samples the event loop thread's stack
+  every ``interval`` seconds; one ``.collapsed`` file per request in the
+  collapsed-stack format consumed by flamegraph tools
+
+Only one request is profiled at a time. Because the profiler observes the
+whole event loop thread, work from other requests interleaving with the
+profiled one shows up too. The output directory keeps the newest
+``max_files`` profiles.
+"""
+
+import cProfile
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Literal
+
+import anyio.to_thread
+
+from oberoon.logging import get_logger
+from oberoon.requests import Request
+from oberoon.responses import Response
+
+logger = get_logger("profiling")
+
+_SUFFIXES = (".prof", ".collapsed")
+
+
+def _signature(secret: str, expires: int) -> str:
+    return hmac.new(secret.encode(), str(expires).encode(), hashlib.sha256).hexdigest()
+
+
+def make_profile_token(secret: str, ttl: int = 300) -> str:
+    """Create a header value that enables profiling for ``ttl`` seconds."""
+    expires = int(time.time()) + ttl
+    return f"{expires}.{_signature(secret, expires)}"
+
+
+def verify_profile_token(secret: str, token: str) -> bool:
+    expires, _, signature = token.partition(".")
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    if expires_at < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, expires_at))
+
+
+class _StackSampler(threading.Thread):
+    """Counts collapsed stacks of another thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="oberoon-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_qualname} ({os.path.basename(code.co_filename)}"
+                    f":{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+class RequestProfiler:
+    """Profiles selected requests and writes the results to ``directory``."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        secret: str | None = None,
+        sample_every: int | None = None,
+        mode: Literal["cprofile", "sampling"] = "cprofile",
+        header: str = "x-oberoon-profile",
+        interval: float = 0.001,
+        max_files: int = 100,
+    ):
+        if mode not in ("cprofile", "sampling"):
+            raise ValueError(f"Unknown profiling mode: {mode!r}")
+        if sample_every is not None and sample_every < 1:
+            raise ValueError("sample_every must be >= 1")
+        self.directory = Path(directory)
+        self.secret = secret
+        self.sample_every = sample_every
+        self.mode = mode
+        self.header = header.lower().encode()
+        self.interval = interval
+        self.max_files = max_files
+        self._seen = 0
+        self._active = False
+
+    def should_profile(self, request: Request) -> bool:
+        if self._active:
+            return False
+        if self.sample_every is not None:
+            self._seen += 1
+            if self._seen % self.sample_every == 0:
+                return True
+        if self.secret is not None:
+            for name, value in request._scope["headers"]:
+                if name == self.header:
+                    return verify_profile_token(self.secret, value.decode("latin-1"))
+        return False
+
+    async def profile(
+        self, request: Request, call: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        """Run ``call`` under the profiler and write the result."""
+        self._active = True
+        try:
+            if self.mode == "cprofile":
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    response = await call()
+                finally:
+                    profiler.disable()
+                write = self._write_pstats
+                result = profiler
+            else:
+                sampler = _StackSampler(threading.get_ident(), self.interval)
+                sampler.start()
+                try:
+                    response = await call()
+                finally:
+                    stacks = sampler.stop()
+                write = self._write_collapsed
+                result = stacks
+        finally:
+            self._active = False
+
+        route = request._scope.get("route")
+        label = route.path if route is not None else request.path
+        try:
+            await anyio.to_thread.run_sync(write, result, request.method, label)
+        except OSError:
+            logger.exception("could not write profile for %s %s", request.method, label)
+        return response
+
+    def _path(self, method: str, label: str, suffix: str) -> Path:
+        slug = "".join(c if c.isalnum() else "_" for c in label).strip("_")[:80]
+        return self.directory / f"{time.time_ns()}-{method}-{slug or 'root'}{suffix}"
+
+    def _write_pstats(self, profiler: cProfile.Profile, method: str, label: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self._path(method, label, ".prof"))
+        self._rotate()
+
+    def _write_collapsed(self, stacks: Counter[str], method: str, label: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}\n" for stack, count in stacks.most_common()]
+        self._path(method, label, ".collapsed").write_text("".join(lines))
+        self._rotate()
+
+    def _rotate(self) -> None:
+        # File names start with time_ns(), so name order is age order
+        files = sorted(p for p in self.directory.iterdir() if p.suffix in _SUFFIXES)
+        for old in files[: max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
@@ -0,0 +1,305 @@
+"""In-process rate limiting: token bucket and sliding window counters.
+
+State lives in a per-limiter ``OrderedDict`` keyed by client. Every check is
+O(1): buckets refill lazily from the elapsed time, and keys are kept in
+least-recently-used order so idle entries are evicted from the front a few at
+a time. A key is only evicted once its state is indistinguishable from a fresh
+one (a full bucket, an expired window), so eviction never resets a client's
+budget early; ``max_keys`` adds a hard cap on top.
+
+Two entry points share the same limiters:
+
+- ``@rate_limit(...)`` on a handler limits that route
+- ``RateLimitMiddleware(app, ...)`` limits every HTTP request to the app
+
+Denied requests get ``429 Too Many Requests``; all limited responses carry
+``RateLimit-Limit``, ``RateLimit-Remaining`` and ``RateLimit-Reset`` headers.
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Literal, NamedTuple
+
+from oberoon.exceptions import TooManyRequestsException
+from oberoon.requests import Request
+from oberoon.responses import JSONResponse
+
+# How many idle keys a single check may evict.
+_EVICT_PER_CHECK = 2
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # seconds until the budget is fully restored
+    retry_after: float  # seconds until the next request would be allowed
+
+
+# Key functions
+
+
+def client_ip(request: Request) -> str:
+    """Key requests by the peer address reported by the ASGI server."""
+    client = request.client
+    return client[0] if client else "unknown"
+
+
+def header_key(name: str) -> Callable[[Request], str]:
+    """Key requests by a header value, e.g. ``header_key("authorization")``."""
+    name = name.lower()
+
+    def key(request: Request) -> str:
+        return request.headers.get(name, "")
+
+    return key
+
+
+# Stores
+
+
+class _Store(ABC):
+    """LRU-ordered per-key state with incremental eviction of idle keys."""
+
+    def __init__(
+        self,
+        limit: int,
+        period: float,
+        max_keys: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        if period <= 0:
+            raise ValueError("period must be > 0")
+        self.limit = limit
+        self.period = period
+        self.max_keys = max_keys
+        self.clock = clock
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @abstractmethod
+    def _is_idle(self, entry: list[float], now: float) -> bool:
+        """True once ``entry`` is indistinguishable from a fresh one."""
+
+    def _evict(self, now: float) -> None:
+        entries = self._entries
+        for _ in range(_EVICT_PER_CHECK):
+            if not entries:
+                return
+            oldest = next(iter(entries.values()))
+            if not self._is_idle(oldest, now):
+                return
+            entries.popitem(last=False)
+
+    def _get(self, key: str, now: float, fresh: list[float]) -> list[float]:
+        # Evict before the lookup: a key evicted here was idle, so recreating
+        # it fresh below is equivalent.
+        self._evict(now)
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = fresh
+            if self.max_keys is not None and len(entries) > self.max_keys:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(key)
+        return entry
+
+
+class TokenBucket(_Store):
+    """``limit`` tokens per ``period``, refilled continuously.
+
+    Entry layout: ``[tokens, updated_at]``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate = self.limit / self.period
+
+    def _is_idle(self, entry: list[float], now: float) -> bool:
+        return entry[0] + (now - entry[1]) * self.rate >= self.limit
+
+    def hit(self, key: str) -> RateLimitResult:
+        now = self.clock()
+        entry = self._get(key, now, [float(self.limit), now])
+        tokens = min(self.limit, entry[0] + (now - entry[1]) * self.rate)
+        entry[1] = now
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        entry[0] = tokens
+
+        return RateLimitResult(
+            allowed,
+            self.limit,
+            int(tokens),
+            (self.limit - tokens) / self.rate,
+            0.0 if allowed else (1 - tokens) / self.rate,
+        )
+
+
+class SlidingWindow(_Store):
+    """At most ``limit`` requests in any rolling ``period``.
+
+    Approximates the rolling window by weighting the previous fixed window's
+    count by how much of it still overlaps. Entry layout:
+    ``[window_index, current_count, previous_count]``, where the index is
+    ``now // period`` kept as an int so adjacency is exact for any period.
+    """
+
+    def _is_idle(self, entry: list[float], now: float) -> bool:
+        return int(now // self.period) - entry[0] >= 2
+
+    def hit(self, key: str) -> RateLimitResult:
+        now = self.clock()
+        period = self.period
+        index, elapsed = divmod(now, period)
+        index = int(index)
+        entry = self._get(key, now, [index, 0.0, 0.0])
+
+        if entry[0] != index:
+            # Roll over: the old current window becomes previous only if it
+            # is the window immediately before this one.
+            entry[2] = entry[1] if index - entry[0] == 1 else 0.0
+            entry[1] = 0.0
+            entry[0] = index
+
+        weight = 1 - elapsed / period
+        estimate = entry[2] * weight + entry[1]
+
+        allowed = estimate < self.limit
+        if allowed:
+            entry[1] += 1
+            estimate += 1
+
+        reset = period - elapsed
+        return RateLimitResult(
+            allowed,
+            self.limit,
+            max(0, int(self.limit - estimate)),
+            reset,
+            0.0 if allowed else reset,
+        )
+
+
+_ALGORITHMS: dict[str, type[_Store]] = {
+    "token_bucket": TokenBucket,
+    "sliding_window": SlidingWindow,
+}
+
+
+# Limiter
+
+
+class RateLimiter:
+    """Binds a key function to a store and renders ``RateLimit-*`` headers."""
+
+    def __init__(
+        self,
+        limit: int,
+        period: float = 60.0,
+        key: Callable[[Request], str] = client_ip,
+        algorithm: Literal["token_bucket", "sliding_window"] = "token_bucket",
+        max_keys: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        try:
+            store_class = _ALGORITHMS[algorithm]
+        except KeyError:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm!r}")
+        self.key = key
+        self.store = store_class(limit, period, max_keys=max_keys, clock=clock)
+
+    def hit(self, request: Request) -> RateLimitResult:
+        return self.store.hit(self.key(request))
+
+    def check(self, request: Request) -> RateLimitResult:
+        """Count the request, raising ``TooManyRequestsException`` if denied."""
+        result = self.hit(request)
+        if not result.allowed:
+            headers = self.headers(result)
+            headers["retry-after"] = str(math.ceil(result.retry_after))
+            raise TooManyRequestsException(headers=headers)
+        return result
+
+    @staticmethod
+    def headers(result: RateLimitResult) -> dict[str, str]:
+        return {
+            "ratelimit-limit": str(result.limit),
+            "ratelimit-remaining": str(result.remaining),
+            "ratelimit-reset": str(math.ceil(result.reset)),
+        }
+
+
+def rate_limit(
+    limit: int,
+    period: float = 60.0,
+    key: Callable[[Request], str] = client_ip,
+    algorithm: Literal["token_bucket", "sliding_window"] = "token_bucket",
+    max_keys: int | None = None,
+):
+    """Limit a single route. Apply below the route decorator::
+
+    @app.get("/search")
+    @rate_limit(10, period=1.0, key=header_key("authorization"))
+    async def search(request: Request) -> list[Book]:
+        ...
+    """
+    limiter = RateLimiter(limit, period, key, algorithm, max_keys)
+
+    def decorator(handler):
+        handler.__rate_limit__ = limiter
+        return handler
+
+    return decorator
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying one limiter to every HTTP request::
+
+    app = RateLimitMiddleware(app, limit=100, period=60.0)
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        limit: int,
+        period: float = 60.0,
+        key: Callable[[Request], str] = client_ip,
+        algorithm: Literal["token_bucket", "sliding_window"] = "token_bucket",
+        max_keys: int | None = None,
+    ):
+        self.app = app
+        self.limiter = RateLimiter(limit, period, key, algorithm, max_keys)
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        result = self.limiter.hit(Request(scope, receive))
+        headers = [
+            [k.encode(), v.encode()] for k, v in self.limiter.headers(result).items()
+        ]
+
+        if not result.allowed:
+            response = JSONResponse({"error": "Too Many Requests"}, status_code=429)
+            response.headers.update(self.limiter.headers(result))
+            response.headers["retry-after"] = str(math.ceil(result.retry_after))
+            await response.send(send)
+            return
+
+        async def send_with_headers(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -44,20 +44,31 @@ class Header:
             request: Request,
             authorization: Annotated[str, Header()],
             x_request_id: Annotated[str, Header()] = "",
+            trace: Annotated[str, Header(alias="X-Trace-Context")] = "",
         ) -> dict:
             ...
 
     Python underscores are auto-converted to hyphens for header lookup
-    (e.g., ``x_request_id`` matches the ``x-request-id`` header).
+    (e.g., ``x_request_id`` matches the ``x-request-id`` header); ``alias``
+    names the header explicitly. Matching is case-insensitive.
 
     Constraint kwargs are forwarded to msgspec.Meta for validation.
     """
 
-    def __init__(self, **constraints):
+    def __init__(self, alias: str | None = None, **constraints):
+        self.alias = alias
         self.constraints = constraints
 
+    def header_name(self, param_name: str) -> bytes:
+        """The lowercase header name this parameter is read from."""
+        name = self.alias if self.alias is not None else param_name.replace("_", "-")
+        return name.lower().encode("latin-1")
+
     def __repr__(self) -> str:
-        if self.constraints:
-            kw = ", ".join(f"{k}={v!r}" for k, v in self.constraints.items())
+        kwargs = dict(self.constraints)
+        if self.alias is not None:
+            kwargs = {"alias": self.alias, **kwargs}
+        if kwargs:
+            kw = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
             return f"Header({kw})"
         return "Header()"
@@ -0,0 +1,73 @@
+"""Per-route query string parsing.
+
+``Request.query_params`` is general purpose: ``parse_qs`` decodes every key
+into a dict of lists, then keeps the last value. Routes with ``Query``
+parameters instead get a parser compiled from their generated query struct
+that scans the raw ``query_string`` bytes once, skips keys the route does not
+declare, and percent-decodes only what it keeps. Repeated keys are collected
+for ``list[T]`` (and set/tuple) fields; other fields keep the last value.
+"""
+
+import types
+from collections.abc import Callable
+from typing import Annotated, Union, get_args, get_origin
+from urllib.parse import unquote_to_bytes
+
+import msgspec
+
+_SEQUENCES = (list, set, frozenset, tuple)
+
+
+def is_sequence_type(annotation) -> bool:
+    """True for ``list[T]``, ``set[T]``... including inside Annotated/Optional."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return is_sequence_type(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        return any(is_sequence_type(arg) for arg in get_args(annotation))
+    return annotation in _SEQUENCES or origin in _SEQUENCES
+
+
+def _unquote(raw: bytes) -> bytes:
+    if b"+" in raw:
+        raw = raw.replace(b"+", b" ")
+    if b"%" in raw:
+        raw = unquote_to_bytes(raw)
+    return raw
+
+
+def compile_query_parser(query_type: type) -> Callable[[bytes], dict]:
+    """``parse(query_string) -> {field: value or [values]}`` for ``query_type``."""
+    wanted = {
+        field.encode_name.encode(): (field.encode_name, is_sequence_type(field.type))
+        for field in msgspec.structs.fields(query_type)
+    }
+
+    def parse(query_string: bytes) -> dict:
+        data: dict = {}
+        if not query_string:
+            return data
+        for pair in query_string.split(b"&"):
+            key, _, value = pair.partition(b"=")
+            spec = wanted.get(key)
+            if spec is None:
+                if b"%" not in key and b"+" not in key:
+                    continue
+                spec = wanted.get(_unquote(key))
+                if spec is None:
+                    continue
+            name, many = spec
+            if b"%" in value or b"+" in value:
+                value = _unquote(value)
+            text = value.decode("utf-8", "replace")
+            if many:
+                values = data.get(name)
+                if values is None:
+                    data[name] = [text]
+                else:
+                    values.append(text)
+            else:
+                data[name] = text
+        return data
+
+    return parse
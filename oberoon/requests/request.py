@@ -7,6 +7,13 @@ class Request:
     def __init__(self, scope, receive):
         self._scope = scope
         self._receive = receive
+        # PhaseTimer, set by the app when phase timing is enabled
+        self.timer = None
+
+    @property
+    def app(self):
+        """The application handling this request."""
+        return self._scope.get("app")
 
     @property
     def method(self) -> str:
@@ -16,6 +23,11 @@ class Request:
     def path(self) -> str:
         return self._scope["path"]
 
+    @property
+    def client(self) -> tuple[str, int] | None:
+        """(host, port) of the peer, if the server reports it."""
+        return self._scope.get("client")
+
     @property
     def query_string(self) -> str:
         return self._scope["query_string"].decode()
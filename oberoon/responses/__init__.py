@@ -1,3 +1,15 @@
-from .response import Response, JSONResponse, TextResponse, HTMLResponse
+from .response import (
+    Response,
+    JSONResponse,
+    TextResponse,
+    HTMLResponse,
+    PrebuiltResponse,
+)
 
-__all__ = ("Response", "JSONResponse", "TextResponse", "HTMLResponse")
+__all__ = (
+    "Response",
+    "JSONResponse",
+    "TextResponse",
+    "HTMLResponse",
+    "PrebuiltResponse",
+)
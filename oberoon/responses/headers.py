@@ -0,0 +1,152 @@
+"""Response headers stored as the raw ASGI ``[(name, value), ...]`` bytes list.
+
+``Response.send`` passes the list to the server as is, so nothing is
+re-encoded per response, and a name may appear more than once
+(``Set-Cookie``). ``MutableHeaders`` is the case-insensitive ``str`` view
+that handlers and the framework use to read and edit it.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+
+CONTENT_TYPE = b"content-type"
+
+# Interned (name, value) pairs for the content types the framework sets
+JSON_CONTENT_TYPE = (CONTENT_TYPE, b"application/json")
+TEXT_CONTENT_TYPE = (CONTENT_TYPE, b"text/plain; charset=utf-8")
+HTML_CONTENT_TYPE = (CONTENT_TYPE, b"text/html; charset=utf-8")
+MSGPACK_CONTENT_TYPE = (CONTENT_TYPE, b"application/msgpack")
+VARY_ACCEPT = (b"vary", b"accept")
+
+_CONTENT_TYPES = {
+    pair[1].decode(): pair
+    for pair in (
+        JSON_CONTENT_TYPE,
+        TEXT_CONTENT_TYPE,
+        HTML_CONTENT_TYPE,
+        MSGPACK_CONTENT_TYPE,
+    )
+}
+
+RawHeaders = list[tuple[bytes, bytes]]
+
+# Encoded lowercase names by the str the caller used; bounded, since names
+# are almost always a small fixed set
+_NAMES: dict[str, bytes] = {}
+_MAX_NAMES = 1024
+
+
+def _encode_name(name: str) -> bytes:
+    key = _NAMES.get(name)
+    if key is None:
+        key = name.lower().encode()
+        if len(_NAMES) < _MAX_NAMES:
+            _NAMES[name] = key
+    return key
+
+
+def content_type_header(content_type: str) -> tuple[bytes, bytes]:
+    """The ``content-type`` pair, shared for the common values."""
+    pair = _CONTENT_TYPES.get(content_type)
+    if pair is None:
+        pair = (CONTENT_TYPE, content_type.encode())
+    return pair
+
+
+class MutableHeaders:
+    """Case-insensitive ``str`` view over a raw header list.
+
+    Assigning a name replaces every header with that name; ``append`` adds
+    another one alongside.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: RawHeaders):
+        self.raw = raw
+
+    def __getitem__(self, name: str) -> str:
+        key = _encode_name(name)
+        for k, v in self.raw:
+            if k == key:
+                return v.decode()
+        raise KeyError(name)
+
+    def get(self, name: str, default: str | None = None) -> str | None:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def getlist(self, name: str) -> list[str]:
+        key = _encode_name(name)
+        return [v.decode() for k, v in self.raw if k == key]
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        key = _encode_name(name)
+        return any(k == key for k, _ in self.raw)
+
+    def __setitem__(self, name: str, value: str) -> None:
+        key = _encode_name(name)
+        pair = (key, value.encode())
+        raw = self.raw
+        matches = [i for i, (k, _) in enumerate(raw) if k == key]
+        if not matches:
+            raw.append(pair)
+            return
+        raw[matches[0]] = pair
+        for i in reversed(matches[1:]):
+            del raw[i]
+
+    def __delitem__(self, name: str) -> None:
+        key = _encode_name(name)
+        before = len(self.raw)
+        self.raw[:] = [pair for pair in self.raw if pair[0] != key]
+        if len(self.raw) == before:
+            raise KeyError(name)
+
+    def setdefault(self, name: str, value: str) -> str:
+        existing = self.get(name)
+        if existing is not None:
+            return existing
+        self.raw.append((_encode_name(name), value.encode()))
+        return value
+
+    def update(
+        self, other: "MutableHeaders | Mapping[str, str] | Iterable[tuple[str, str]]"
+    ) -> None:
+        if isinstance(other, (MutableHeaders, Mapping)):
+            items = other.items()
+        else:
+            items = other
+        for name, value in items:
+            self[name] = value
+
+    def append(self, name: str, value: str) -> None:
+        self.raw.append((_encode_name(name), value.encode()))
+
+    def keys(self) -> list[str]:
+        return [k.decode() for k, _ in self.raw]
+
+    def values(self) -> list[str]:
+        return [v.decode() for _, v in self.raw]
+
+    def items(self) -> list[tuple[str, str]]:
+        return [(k.decode(), v.decode()) for k, v in self.raw]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MutableHeaders):
+            return self.raw == other.raw
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MutableHeaders({self.items()!r})"
@@ -1,61 +1,148 @@
-from typing import Any, Callable
+from collections.abc import Callable
+from typing import Any
 
 import msgspec.json
 
+from oberoon.background import BackgroundTasks
+from oberoon.responses.headers import (
+    CONTENT_TYPE,
+    HTML_CONTENT_TYPE,
+    JSON_CONTENT_TYPE,
+    TEXT_CONTENT_TYPE,
+    MutableHeaders,
+    RawHeaders,
+    content_type_header,
+)
+
+_encode_json = msgspec.json.encode
+
 
 class Response:
-    def __init__(self, status_code: int = 200):
+    __slots__ = ("_body", "_raw_headers", "_status_code", "background")
+
+    def __init__(
+        self, status_code: int = 200, background: BackgroundTasks | None = None
+    ):
         self._status_code: int = status_code
-        self._headers: dict[str, str] = {}
+        # Sent to the server as is: [(lowercase name, value), ...]
+        self._raw_headers: RawHeaders = []
         self._body: bytes = b""
+        # Run by the app after send() completes
+        self.background = background
 
     async def send(self, send: Callable) -> None:
-        encoded_headers = [[k.encode(), v.encode()] for k, v in self.headers.items()]
         await send(
             {
                 "type": "http.response.start",
-                "status": self.status_code,
-                "headers": encoded_headers,
-            }
-        )
-        await send(
-            {
-                "type": "http.response.body",
-                "body": self._body,
-                "more_body": False,
+                "status": self._status_code,
+                "headers": self._raw_headers,
             }
         )
+        await send({"type": "http.response.body", "body": self._body})
 
     def set_body(self, body: bytes, content_type: str):
         self._body = body
-        self.headers["content-type"] = content_type
+        pair = content_type_header(content_type)
+        raw = self.raw_headers
+        for i, (name, _) in enumerate(raw):
+            if name == CONTENT_TYPE:
+                raw[i] = pair
+                return
+        raw.append(pair)
 
     @property
     def status_code(self):
         return self._status_code
 
     @property
-    def headers(self):
-        return self._headers
+    def raw_headers(self) -> RawHeaders:
+        return self._raw_headers
+
+    @property
+    def headers(self) -> MutableHeaders:
+        return MutableHeaders(self.raw_headers)
 
     @property
     def body(self):
         return self._body
 
 
+class PrebuiltResponse(Response):
+    """A response whose status, encoded header list and body were built once.
+
+    Copies share the header tuple and body bytes and send them as they are;
+    the header list is only copied if something edits it.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        status_code: int,
+        raw_headers: tuple[tuple[bytes, bytes], ...],
+        body: bytes,
+    ):
+        self._status_code = status_code
+        self._raw_headers = raw_headers
+        self._body = body
+        self.background = None
+
+    @classmethod
+    def build(
+        cls, status_code: int, body: bytes, content_type: str
+    ) -> "PrebuiltResponse":
+        return cls(status_code, (content_type_header(content_type),), body)
+
+    def copy(self) -> "PrebuiltResponse":
+        return PrebuiltResponse(self._status_code, self._raw_headers, self._body)
+
+    @property
+    def raw_headers(self) -> RawHeaders:
+        if type(self._raw_headers) is tuple:
+            self._raw_headers = list(self._raw_headers)
+        return self._raw_headers
+
+
 class JSONResponse(Response):
-    def __init__(self, content: Any, status_code: int = 200):
-        super().__init__(status_code)
-        self.set_body(msgspec.json.encode(content), "application/json")
+    __slots__ = ()
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        background: BackgroundTasks | None = None,
+    ):
+        self._status_code = status_code
+        self._raw_headers = [JSON_CONTENT_TYPE]
+        self._body = _encode_json(content)
+        self.background = background
 
 
 class TextResponse(Response):
-    def __init__(self, content: str, status_code: int = 200):
-        super().__init__(status_code)
-        self.set_body(content.encode("utf-8"), "text/plain; charset=utf-8")
+    __slots__ = ()
+
+    def __init__(
+        self,
+        content: str,
+        status_code: int = 200,
+        background: BackgroundTasks | None = None,
+    ):
+        self._status_code = status_code
+        self._raw_headers = [TEXT_CONTENT_TYPE]
+        self._body = content.encode("utf-8")
+        self.background = background
 
 
 class HTMLResponse(Response):
-    def __init__(self, content: str, status_code: int = 200):
-        super().__init__(status_code)
-        self.set_body(content.encode("utf-8"), "text/html; charset=utf-8")
+    __slots__ = ()
+
+    def __init__(
+        self,
+        content: str,
+        status_code: int = 200,
+        background: BackgroundTasks | None = None,
+    ):
+        self._status_code = status_code
+        self._raw_headers = [HTML_CONTENT_TYPE]
+        self._body = content.encode("utf-8")
+        self.background = background
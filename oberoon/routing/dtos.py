@@ -1,17 +1,24 @@
+from collections.abc import Callable
 from dataclasses import dataclass, field
 import re
-from typing import Any, Callable
+from typing import Any
+
+from oberoon.admission import ConcurrencyLimiter, Priority
+from oberoon.caching import CacheSpec
+from oberoon.ratelimit import RateLimiter
 
 
 @dataclass
 class Route:
     """Regex compiled, final routes"""
 
-    pattern: re.Pattern
+    # None until compiled (lazy route loading)
+    pattern: re.Pattern | None
     param_types: dict[str, type]
-    handler: Callable
+    handler: Callable | str  # "module:attr" until first dispatch imports it
     methods: list[str]
     # msgspec fields (populated by inspect_handler_signature)
+    inspected: bool = False
     body_param: str | None = None
     body_type: type | None = None
     return_type: Any = field(default=None)
@@ -19,6 +26,28 @@ class Route:
     query_field_names: list[str] = field(default_factory=list)
     header_type: type | None = None
     header_field_names: list[str] = field(default_factory=list)
+    header_names: list[bytes] = field(default_factory=list)
+    background_param: str | None = None
+    # invoke(request, path_params) -> Response, composed by oberoon.invoker
+    invoke: Callable | None = None
+    # route template, e.g. "/books/{book_id:int}"
+    path: str = ""
+    # admission control
+    priority: int = Priority.NORMAL
+    limiter: ConcurrencyLimiter | None = None
+    # set by @rate_limit
+    rate_limiter: RateLimiter | None = None
+    # set by @cache
+    cache: CacheSpec | None = None
+    # True for body-hash ETags, or a fn(request, params) -> version tag
+    etag: bool | Callable = False
+    # single-flight sharing of identical concurrent GETs
+    coalesce: bool = False
+    coalesce_vary: tuple[str, ...] = ()
+    # listed in the OpenAPI document
+    include_in_schema: bool = True
+    # seconds spent compiling the path and inspecting the handler
+    setup_time: float = 0.0
 
 
 @dataclass
@@ -26,5 +55,6 @@ class RouteRecord:
     """Uncompiled raw routes, collected and compiled at `include_router()` time"""
 
     path: str
-    handler: Callable
+    handler: Callable | str
     methods: list[str]
+    options: dict[str, Any] = field(default_factory=dict)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from typing import Callable
+from collections.abc import Callable
 
 from oberoon.routing.dtos import RouteRecord
 from oberoon.logging import get_logger
@@ -11,23 +11,39 @@ logger = get_logger("routing")
 
 class RoutingMixin:
     @abstractmethod
-    def route(self, path: str, methods: list[str] | None = None) -> Callable:
+    def route(self, path: str, methods: list[str] | None = None, **options) -> Callable:
         raise NotImplementedError
 
-    def get(self, path: str) -> Callable:
-        return self.route(path, methods=["GET"])
+    def add(
+        self,
+        path: str,
+        handler: Callable | str,
+        methods: list[str] | None = None,
+        **options,
+    ) -> None:
+        """Register ``handler`` without decorating it.
 
-    def post(self, path: str) -> Callable:
-        return self.route(path, methods=["POST"])
+        ``handler`` may be a ``"package.module:function"`` string: the module is
+        imported and the signature inspected on first dispatch, so workers
+        never import handlers they don't serve. The path and methods are
+        registered immediately, so 404/405 answers don't need the import.
+        """
+        self.route(path, methods=methods, **options)(handler)
 
-    def put(self, path: str) -> Callable:
-        return self.route(path, methods=["PUT"])
+    def get(self, path: str, **options) -> Callable:
+        return self.route(path, methods=["GET"], **options)
 
-    def patch(self, path: str) -> Callable:
-        return self.route(path, methods=["PATCH"])
+    def post(self, path: str, **options) -> Callable:
+        return self.route(path, methods=["POST"], **options)
 
-    def delete(self, path: str) -> Callable:
-        return self.route(path, methods=["DELETE"])
+    def put(self, path: str, **options) -> Callable:
+        return self.route(path, methods=["PUT"], **options)
+
+    def patch(self, path: str, **options) -> Callable:
+        return self.route(path, methods=["PATCH"], **options)
+
+    def delete(self, path: str, **options) -> Callable:
+        return self.route(path, methods=["DELETE"], **options)
 
 
 class Router(RoutingMixin):
@@ -36,12 +52,13 @@ class Router(RoutingMixin):
         self._route_records: list[RouteRecord] = []
         self._subrouters: list[Router] = []
 
-    def route(self, path: str, methods: list[str] | None = None):
+    def route(self, path: str, methods: list[str] | None = None, **options):
         def decorator(handler):
             route_record = RouteRecord(
                 path=path,
                 handler=handler,
                 methods=methods or ["GET"],
+                options=options,
             )
             self._route_records.append(route_record)
             logger.warning(
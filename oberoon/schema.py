@@ -0,0 +1,245 @@
+"""OpenAPI 3.1 generation from route metadata.
+
+Everything comes from what ``inspect_handler_signature`` already recorded on
+each ``Route`` — path parameter types, the ``Query``/``Header`` structs, the
+body struct and the return annotation. All types are handed to a single
+``msgspec.json.schema_components`` call so shared models end up as one entry
+under ``components/schemas``.
+
+``OpenAPI`` builds the document lazily on first use — by then every router
+has been included — and keeps it as encoded bytes with an ETag, so serving
+``/openapi.json`` and the docs page costs nothing per request however many
+routes there are. Routes registered afterwards trigger one rebuild.
+"""
+
+import re
+from typing import Any
+
+import msgspec
+
+from oberoon.conditional import weak_etag
+from oberoon.responses import Response
+from oberoon.routing import Route
+
+REF_TEMPLATE = "#/components/schemas/{name}"
+
+_PATH_TYPES = {int: {"type": "integer"}, str: {"type": "string"}}
+_TEMPLATE_PARAM = re.compile(r"\{([^}:]+)(?::[^}]*)?\}")
+
+_VALIDATION_ERROR = {
+    "description": "Validation Error",
+    "content": {
+        "application/json": {
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "error": {"type": "string"},
+                    "detail": {"type": "array", "items": {"type": "object"}},
+                },
+            }
+        }
+    },
+}
+
+DOCS_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui.css">
+</head>
+<body>
+<div id="swagger-ui"></div>
+<script src="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5/swagger-ui-bundle.js"></script>
+<script>SwaggerUIBundle({{url: "{openapi_url}", dom_id: "#swagger-ui"}});</script>
+</body>
+</html>
+"""
+
+
+def openapi_path(template: str) -> str:
+    """``/books/{book_id:int}`` -> ``/books/{book_id}``"""
+    return _TEMPLATE_PARAM.sub(r"{\1}", template)
+
+
+def _is_response_type(tp: Any) -> bool:
+    return isinstance(tp, type) and issubclass(tp, Response)
+
+
+def _field_default(field: msgspec.structs.FieldInfo) -> dict:
+    if field.default is msgspec.NODEFAULT:
+        return {}
+    try:
+        return {"default": msgspec.to_builtins(field.default)}
+    except TypeError:
+        return {}
+
+
+def build_openapi(
+    routes: list[Route], title: str, version: str, description: str | None = None
+) -> dict:
+    """Assemble the OpenAPI document for ``routes``."""
+    types: list[Any] = []
+
+    def slot(tp: Any) -> int:
+        types.append(tp)
+        return len(types) - 1
+
+    # First pass: queue every type for one schema_components call
+    planned = []
+    for route in routes:
+        if not route.include_in_schema:
+            continue
+        query = [(f.name, f, slot(f.type)) for f in _fields(route.query_type)]
+        header = [
+            (name.decode("latin-1"), f, slot(f.type))
+            for name, f in zip(route.header_names, _fields(route.header_type))
+        ]
+        body = slot(route.body_type) if route.body_type is not None else None
+        returns = None
+        if route.return_type is not type(None) and not _is_response_type(
+            route.return_type
+        ):
+            returns = slot(route.return_type)
+        planned.append((route, query, header, body, returns))
+
+    schemas, components = msgspec.json.schema_components(
+        types, ref_template=REF_TEMPLATE
+    )
+
+    paths: dict[str, dict] = {}
+    operation_ids: set[str] = set()
+    for route, query, header, body, returns in planned:
+        parameters = [
+            {
+                "name": name,
+                "in": "path",
+                "required": True,
+                "schema": dict(_PATH_TYPES.get(tp, {"type": "string"})),
+            }
+            for name, tp in route.param_types.items()
+        ]
+        for location, fields in (("query", query), ("header", header)):
+            for name, field, index in fields:
+                parameters.append(
+                    {
+                        "name": name,
+                        "in": location,
+                        "required": field.required,
+                        "schema": {**schemas[index], **_field_default(field)},
+                    }
+                )
+
+        if returns is not None:
+            success = {
+                "200": {
+                    "description": "Successful Response",
+                    "content": _content(schemas[returns]),
+                }
+            }
+        elif route.return_type is type(None):
+            success = {"204": {"description": "No Content"}}
+        else:
+            success = {"200": {"description": "Successful Response"}}
+
+        handler_name = getattr(route.handler, "__name__", "handler")
+        for method in route.methods:
+            operation: dict[str, Any] = {
+                "operationId": _unique(
+                    f"{handler_name}_{method.lower()}", operation_ids
+                ),
+                "responses": dict(success),
+            }
+            doc = (getattr(route.handler, "__doc__", None) or "").strip()
+            if doc:
+                summary, _, rest = doc.partition("\n")
+                operation["summary"] = summary.strip()
+                if rest.strip():
+                    operation["description"] = rest.strip()
+            if parameters:
+                operation["parameters"] = parameters
+            if body is not None:
+                operation["requestBody"] = {
+                    "required": True,
+                    "content": _content(schemas[body]),
+                }
+            if parameters or body is not None:
+                operation["responses"]["422"] = _VALIDATION_ERROR
+            paths.setdefault(openapi_path(route.path), {})[method.lower()] = operation
+
+    info = {"title": title, "version": version}
+    if description:
+        info["description"] = description
+    document: dict[str, Any] = {"openapi": "3.1.0", "info": info, "paths": paths}
+    if components:
+        document["components"] = {"schemas": components}
+    return document
+
+
+def _content(schema: dict) -> dict:
+    # Typed bodies are negotiated between JSON and MessagePack
+    return {
+        "application/json": {"schema": schema},
+        "application/msgpack": {"schema": schema},
+    }
+
+
+def _fields(struct: type | None) -> tuple[msgspec.structs.FieldInfo, ...]:
+    return msgspec.structs.fields(struct) if struct is not None else ()
+
+
+def _unique(name: str, seen: set[str]) -> str:
+    candidate, n = name, 1
+    while candidate in seen:
+        n += 1
+        candidate = f"{name}_{n}"
+    seen.add(candidate)
+    return candidate
+
+
+class OpenAPI:
+    """The app's OpenAPI document, encoded once and reused for every request."""
+
+    def __init__(self, app, version: str = "0.1.0", description: str | None = None):
+        self.app = app
+        self.version = version
+        self.description = description
+        self._built_for = -1  # route count the cached document reflects
+        self._document: dict | None = None
+        self._body = b""
+        self._etag = ""
+
+    def _ensure(self) -> None:
+        routes = self.app._routes
+        if self._built_for == len(routes):
+            return
+        self.app.prepare_routes()
+        self._document = build_openapi(
+            routes, self.app.title, self.version, self.description
+        )
+        self._body = msgspec.json.encode(self._document)
+        self._etag = weak_etag(self._body)
+        self._built_for = len(routes)
+
+    @property
+    def document(self) -> dict:
+        self._ensure()
+        return self._document
+
+    @property
+    def body(self) -> bytes:
+        self._ensure()
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        self._ensure()
+        return self._etag
+
+    def response(self) -> Response:
+        self._ensure()
+        response = Response(200)
+        response.set_body(self._body, "application/json")
+        response.headers["etag"] = self._etag
+        return response
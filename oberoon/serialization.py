@@ -5,18 +5,30 @@ This module powers the automatic msgspec integration:
 - Decodes and validates request bodies against those types
 - Detects Query/Header annotated parameters and builds dynamic validation structs
 - Converts handler return values into proper Response objects based on return type
+
+Routes compile a body decoder and a serializer once, holding msgspec JSON and
+MessagePack codecs for their types; the format is picked per request from
+``Content-Type`` and ``Accept`` (see ``oberoon.negotiation``).
 """
 
 import inspect
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Annotated, Any, get_args, get_origin, get_type_hints
 
 import msgspec
 
+from oberoon.background import BackgroundTasks
 from oberoon.exceptions import ValidationError
+from oberoon.negotiation import sends_msgpack, wants_msgpack
 from oberoon.requests.params import Header, Query
 from oberoon.requests import Request
 from oberoon.responses import Response
+from oberoon.responses.headers import (
+    JSON_CONTENT_TYPE,
+    MSGPACK_CONTENT_TYPE,
+    VARY_ACCEPT,
+)
 
 Field = msgspec.Meta
 
@@ -63,6 +75,9 @@ class HandlerMeta:
     query_field_names: list[str] = field(default_factory=list)
     header_type: type | None = None
     header_field_names: list[str] = field(default_factory=list)
+    # lowercase header names, parallel to header_field_names
+    header_names: list[bytes] = field(default_factory=list)
+    background_param: str | None = None
 
 
 def _find_marker(annotation, marker_class):
@@ -107,6 +122,7 @@ def inspect_handler_signature(handler, path_param_names: set[str]) -> HandlerMet
     Rules:
     - skip path parameters
     - skip `Request` parameters
+    - detect a `BackgroundTasks` parameter to inject
     - detect `msgspec.Struct` body parameters
     - detect `Annotated[type, Query(...)]` query parameters
     - detect `Annotated[type, Header(...)]` header parameters
@@ -122,6 +138,7 @@ def inspect_handler_signature(handler, path_param_names: set[str]) -> HandlerMet
 
     query_params: list[tuple[str, type, dict, Any]] = []
     header_params: list[tuple[str, type, dict, Any]] = []
+    header_names: list[bytes] = []
 
     body_param = None
     body_type = None
@@ -140,6 +157,10 @@ def inspect_handler_signature(handler, path_param_names: set[str]) -> HandlerMet
         ):
             continue
 
+        if annotation is BackgroundTasks:
+            meta.background_param = name
+            continue
+
         # Check for Query marker
         base_type, query_marker = _find_marker(annotation, Query)
         if query_marker is not None:
@@ -156,6 +177,7 @@ def inspect_handler_signature(handler, path_param_names: set[str]) -> HandlerMet
                 _MISSING if param.default is inspect.Parameter.empty else param.default
             )
             header_params.append((name, base_type, header_marker.constraints, default))
+            header_names.append(header_marker.header_name(name))
             continue
 
         # Check for msgspec.Struct body parameter
@@ -180,6 +202,7 @@ def inspect_handler_signature(handler, path_param_names: set[str]) -> HandlerMet
             f"_HeaderParams_{handler.__name__}", header_params
         )
         meta.header_field_names = [p[0] for p in header_params]
+        meta.header_names = header_names
 
     meta.body_param = body_param
     meta.body_type = body_type
@@ -195,62 +218,110 @@ def inspect_handler_signature(handler, path_param_names: set[str]) -> HandlerMet
     return meta
 
 
+BodyDecoder = Callable[[Request], Awaitable[Any]]
+Serializer = Callable[[Any, Request | None], Response]
+
+
+def compile_body_decoder(body_type: type) -> BodyDecoder:
+    """``decode(request)`` for ``body_type``, as JSON or MessagePack.
+
+    Raises ValidationError (422) on a missing, malformed or invalid body.
+    """
+    decode_json = msgspec.json.Decoder(body_type).decode
+    decode_msgpack = msgspec.msgpack.Decoder(body_type).decode
+
+    async def decode(request: Request) -> Any:
+        raw = await request.body()
+        if not raw:
+            raise ValidationError(
+                errors=[
+                    {
+                        "loc": ["body"],
+                        "msg": "Request body is required",
+                        "type": "missing",
+                    }
+                ]
+            )
+
+        try:
+            if sends_msgpack(request._scope):
+                return decode_msgpack(raw)
+            return decode_json(raw)
+        except msgspec.ValidationError as e:
+            raise ValidationError(
+                errors=[{"loc": ["body"], "msg": str(e), "type": "validation_error"}]
+            )
+        except msgspec.DecodeError as e:
+            raise ValidationError(
+                errors=[{"loc": ["body"], "msg": str(e), "type": "decode_error"}]
+            )
+
+    return decode
+
+
 async def decode_body(request: Request, body_type: BaseModel) -> Any:
     """Decode and validate the request body against a msgspec.Struct type.
 
-    Raises ValidationError (422) on malformed or invalid JSON.
+    Raises ValidationError (422) on malformed or invalid JSON or MessagePack.
     """
-    raw = await request.body()
-    if not raw:
-        raise ValidationError(
-            errors=[
-                {"loc": ["body"], "msg": "Request body is required", "type": "missing"}
-            ]
-        )
+    return await compile_body_decoder(body_type)(request)
 
-    try:
-        return msgspec.json.decode(raw, type=body_type)
-    except msgspec.ValidationError as e:
-        raise ValidationError(
-            errors=[{"loc": ["body"], "msg": str(e), "type": "validation_error"}]
-        )
-    except msgspec.DecodeError as e:
-        raise ValidationError(
-            errors=[{"loc": ["body"], "msg": str(e), "type": "decode_error"}]
-        )
 
-
-def serialize_response(result: Any, return_type: Any) -> Response:
-    """Convert a handler's return value into a Response object.
+def compile_serializer(return_type: Any) -> Serializer:
+    """``serialize(result, request)`` for handlers annotated ``-> return_type``.
 
     Rules:
     - Response instance → pass through as-is
     - return type is None → 204 No Content
     - return type is a Response subclass → type-check only
-    - return type is set → validate/convert result via msgspec, encode to JSON
+    - return type is set → validate/convert result via msgspec, encode to
+      MessagePack if the request's ``Accept`` prefers it, JSON otherwise
     """
-    if isinstance(result, Response):
-        return result
-
-    if return_type is type(None):
-        return Response(status_code=204)
-
-    if (
+    no_content = return_type is type(None)
+    response_type = (
         return_type is not _MISSING
         and isinstance(return_type, type)
         and issubclass(return_type, Response)
-    ):
-        raise TypeError(
-            f"Handler declared return type {return_type.__name__} "
-            f"but returned {type(result).__name__}"
-        )
+    )
+    encode_json = msgspec.json.Encoder().encode
+    encode_msgpack = msgspec.msgpack.Encoder().encode
 
-    try:
-        validated = msgspec.convert(result, return_type)
-    except Exception as e:
-        raise TypeError(f"Response validation failed for type {return_type}: {e}")
-
-    encoded = msgspec.json.encode(validated)
-    resp = Response(status_code=200)
-    resp.set_body(encoded, "application/json")
-    return resp
+    def serialize(result: Any, request: Request | None = None) -> Response:
+        if isinstance(result, Response):
+            return result
+
+        if no_content:
+            return Response(status_code=204)
+
+        if response_type:
+            raise TypeError(
+                f"Handler declared return type {return_type.__name__} "
+                f"but returned {type(result).__name__}"
+            )
+
+        try:
+            validated = msgspec.convert(result, return_type)
+        except Exception as e:
+            raise TypeError(f"Response validation failed for type {return_type}: {e}")
+
+        resp = Response(status_code=200)
+        if request is not None and wants_msgpack(request._scope):
+            resp._body = encode_msgpack(validated)
+            resp._raw_headers = [MSGPACK_CONTENT_TYPE, VARY_ACCEPT]
+        else:
+            resp._body = encode_json(validated)
+            resp._raw_headers = [JSON_CONTENT_TYPE, VARY_ACCEPT]
+        return resp
+
+    return serialize
+
+
+def serialize_response(
+    result: Any, return_type: Any, request: Request | None = None
+) -> Response:
+    """Convert a handler's return value into a Response object.
+
+    See ``compile_serializer`` for the rules; routes use a serializer compiled
+    once for their return type instead.
+    """
+    return compile_serializer(return_type)(result, request)
@@ -0,0 +1,715 @@
+"""Minimal asyncio HTTP/1.1 server for ASGI apps.
+
+    oberoon serve examples.bookstore.app:app --port 8000
+
+Built on ``asyncio.Protocol`` and tuned for how oberoon responds:
+
+- keep-alive and pipelining — requests on a connection are parsed as bytes
+  arrive and answered strictly in order
+- request bodies by ``Content-Length`` (sliced straight out of the read
+  buffer when it is already there) or ``Transfer-Encoding: chunked``
+- ``max_header_size`` / ``max_request_size`` limits answered with 431 / 413
+- ``keep_alive_timeout`` closes idle connections, and answers 408 when a
+  request body stalls for that long
+- a response whose start and single body message arrive together goes out
+  as one ``transport.write`` with ``content-length``; streamed responses
+  without one use chunked encoding, or end by closing the connection for
+  HTTP/1.0 clients
+
+Request bodies are buffered whole (bounded by ``max_request_size``) before
+the app is called. There is no TLS or HTTP/2; put a proxy in front for those.
+"""
+
+import asyncio
+import email.utils
+import signal
+import socket
+import time
+from collections import deque
+from http import HTTPStatus
+from urllib.parse import unquote
+
+from oberoon.lifespan import LifespanManager
+from oberoon.logging import get_logger
+
+logger = get_logger("server")
+
+_STATUS_LINES = {
+    status.value: f"HTTP/1.1 {status.value} {status.phrase}\r\n".encode()
+    for status in HTTPStatus
+}
+
+# Pipelined requests parsed ahead of the one being answered before reading
+# from the socket is paused
+_MAX_PIPELINE = 16
+
+
+def _status_line(status: int) -> bytes:
+    line = _STATUS_LINES.get(status)
+    if line is None:
+        line = f"HTTP/1.1 {status} \r\n".encode()
+    return line
+
+
+class _DateHeader:
+    """``date`` header value, re-rendered at most once per second."""
+
+    def __init__(self):
+        self._second = 0
+        self._value = b""
+
+    def __call__(self) -> bytes:
+        now = int(time.time())
+        if now != self._second:
+            self._second = now
+            self._value = email.utils.formatdate(now, usegmt=True).encode()
+        return self._value
+
+
+_date = _DateHeader()
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+
+
+class _Request:
+    __slots__ = ("body", "keep_alive", "scope")
+
+    def __init__(self, scope: dict, body: bytes, keep_alive: bool):
+        self.scope = scope
+        self.body = body
+        self.keep_alive = keep_alive
+
+
+class HttpProtocol(asyncio.Protocol):
+    """One client connection."""
+
+    def __init__(self, server: "Server"):
+        self.server = server
+        self.app = server.app
+        self.loop = asyncio.get_running_loop()
+        self.transport: asyncio.Transport | None = None
+        self.client: tuple[str, int] | None = None
+        self.local: tuple[str, int] | None = None
+
+        self._buffer = bytearray()
+        self._head: tuple[dict, bool] | None = None  # parsed, awaiting body
+        self._expected = 0  # content-length of the body being read
+        self._chunked = False
+        self._chunks: list[bytes] = []
+        self._body_size = 0
+        # Expect: 100-continue seen, interim response not yet sent
+        self._expect_continue = False
+
+        self._pending: deque[_Request] = deque()
+        self._worker: asyncio.Task | None = None
+        self._current: _Cycle | None = None  # the request being answered
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._reading = True
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self.closing = False
+        self.disconnected = False
+
+    # SECTION: asyncio callbacks
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        peer = transport.get_extra_info("peername")
+        local = transport.get_extra_info("sockname")
+        self.client = tuple(peer[:2]) if isinstance(peer, tuple) else None
+        self.local = tuple(local[:2]) if isinstance(local, tuple) else None
+        self.server.connections.add(self)
+        self._arm_idle_timer()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.disconnected = True
+        self.server._connection_closed(self)
+        self._cancel_idle_timer()
+        self._writable.set()  # unblock a sender waiting on flow control
+        if self._current is not None:
+            self._current.done()  # wake a receive() waiting for http.disconnect
+        for request in self._pending:
+            request.keep_alive = False
+
+    def data_received(self, data: bytes) -> None:
+        if self.closing:
+            return  # nothing after the last request will be answered
+        self._cancel_idle_timer()
+        self._buffer += data
+        try:
+            self._parse()
+            # What is left is at most one request head and body in progress
+            server = self.server
+            if len(self._buffer) > server.max_header_size + server.max_request_size:
+                raise _BadRequest(413, "Request body too large")
+        except _BadRequest as exc:
+            self._reject(exc.status, str(exc))
+            return
+        if self._worker is None:
+            # Waiting on the rest of a request: the idle timeout applies
+            self._arm_idle_timer()
+
+    def eof_received(self) -> bool:
+        return False  # half-closed: let the transport close
+
+    def pause_writing(self) -> None:
+        self._writable.clear()
+
+    def resume_writing(self) -> None:
+        self._writable.set()
+
+    # SECTION: parsing
+
+    def _parse(self) -> None:
+        buffer = self._buffer
+        while not self.closing:
+            if self._head is None:
+                end = buffer.find(b"\r\n\r\n")
+                if end == -1:
+                    if len(buffer) > self.server.max_header_size:
+                        raise _BadRequest(431, "Request header fields too large")
+                    return
+                if end > self.server.max_header_size:
+                    raise _BadRequest(431, "Request header fields too large")
+                self._head = self._parse_head(bytes(buffer[:end]))
+                del buffer[: end + 4]
+
+            body = self._read_body()
+            if body is None:
+                self._send_continue()
+                return
+            scope, keep_alive = self._head
+            self._head = None
+            self._expect_continue = False
+            self._pending.append(_Request(scope, body, keep_alive))
+            if self._worker is None:
+                self._worker = self.loop.create_task(self._run())
+            if len(self._pending) >= _MAX_PIPELINE and self._reading:
+                self._reading = False
+                self.transport.pause_reading()
+            if not keep_alive:
+                # Anything after a "Connection: close" request is ignored
+                self.closing = True
+                buffer.clear()
+                return
+
+    def _parse_head(self, head: bytes) -> tuple[dict, bool]:
+        lines = head.split(b"\r\n")
+        parts = lines[0].split(b" ")
+        if len(parts) != 3:
+            raise _BadRequest(400, "Malformed request line")
+        method, target, version = parts
+        if version not in (b"HTTP/1.1", b"HTTP/1.0"):
+            raise _BadRequest(505, "HTTP version not supported")
+
+        headers = []
+        content_length = None
+        chunked = False
+        connection = b""
+        expect_continue = False
+        for line in lines[1:]:
+            name, sep, value = line.partition(b":")
+            if not sep or not name or name != name.strip():
+                raise _BadRequest(400, "Malformed header line")
+            name = name.lower()
+            value = value.strip()
+            headers.append((name, value))
+            if name == b"content-length":
+                if not value.isdigit() or (
+                    content_length is not None and content_length != int(value)
+                ):
+                    raise _BadRequest(400, "Invalid Content-Length")
+                content_length = int(value)
+            elif name == b"transfer-encoding":
+                if value.lower() != b"chunked":
+                    raise _BadRequest(501, "Unsupported Transfer-Encoding")
+                chunked = True
+            elif name == b"connection":
+                connection = value.lower()
+            elif name == b"expect":
+                expect_continue = value.lower() == b"100-continue"
+
+        if chunked and content_length is not None:
+            raise _BadRequest(400, "Both Content-Length and Transfer-Encoding given")
+        if content_length is not None and content_length > self.server.max_request_size:
+            raise _BadRequest(413, "Request body too large")
+
+        if version == b"HTTP/1.1":
+            keep_alive = b"close" not in connection
+        else:
+            keep_alive = b"keep-alive" in connection
+
+        raw_path, _, query = target.partition(b"?")
+        http_version = version[5:].decode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": http_version,
+            "server": self.local,
+            "client": self.client,
+            "scheme": "http",
+            "method": method.decode("ascii"),
+            "root_path": self.server.root_path,
+            "path": unquote(raw_path.decode("latin-1")),
+            "raw_path": raw_path,
+            "query_string": query,
+            "headers": headers,
+            "state": dict(self.server.state),
+        }
+
+        self._chunked = chunked
+        self._expected = content_length or 0
+        self._chunks = []
+        self._body_size = 0
+        self._expect_continue = (
+            expect_continue
+            and http_version == "1.1"
+            and bool(chunked or content_length)
+        )
+        return scope, keep_alive
+
+    def _send_continue(self) -> None:
+        """Invite the body of the request being read once nothing is ahead of it.
+
+        Sent only when no earlier pipelined request is still being answered,
+        so the interim response never lands before or inside another response.
+        """
+        if self._expect_continue and self._worker is None and not self._pending:
+            self._expect_continue = False
+            self.transport.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+    def _read_body(self) -> bytes | None:
+        """The complete body of the current request, or ``None`` if incomplete."""
+        buffer = self._buffer
+        if not self._chunked:
+            size = self._expected
+            if not size:
+                return b""
+            if len(buffer) < size:
+                return None
+            # Content-Length fast path: one slice out of the read buffer
+            body = bytes(buffer[:size])
+            del buffer[:size]
+            return body
+
+        while True:
+            line_end = buffer.find(b"\r\n")
+            if line_end == -1:
+                if len(buffer) > 1024:
+                    raise _BadRequest(400, "Malformed chunk size")
+                return None
+            size_field = bytes(buffer[:line_end]).split(b";")[0].strip()
+            try:
+                size = int(size_field, 16)
+            except ValueError:
+                raise _BadRequest(400, "Malformed chunk size") from None
+
+            if size == 0:
+                # Skip trailer fields up to the terminating empty line
+                if buffer[line_end + 2 : line_end + 4] == b"\r\n":
+                    del buffer[: line_end + 4]
+                else:
+                    trailers_end = buffer.find(b"\r\n\r\n", line_end)
+                    if trailers_end == -1:
+                        return None
+                    del buffer[: trailers_end + 4]
+                body = b"".join(self._chunks)
+                self._chunks = []
+                return body
+
+            if self._body_size + size > self.server.max_request_size:
+                raise _BadRequest(413, "Request body too large")
+            if len(buffer) < line_end + 2 + size + 2:
+                return None
+            self._body_size += size
+            start = line_end + 2
+            self._chunks.append(bytes(buffer[start : start + size]))
+            del buffer[: start + size + 2]
+
+    def _reject(self, status: int, detail: str) -> None:
+        """Answer a request we could not parse and close the connection."""
+        self.closing = True
+        self._buffer.clear()
+        if self._worker is None and not self.disconnected:
+            body = detail.encode()
+            self.transport.write(
+                _status_line(status)
+                + b"content-type: text/plain; charset=utf-8\r\n"
+                + b"content-length: %d\r\nconnection: close\r\n\r\n" % len(body)
+                + body
+            )
+            self.transport.close()
+        else:
+            # Answer the requests parsed before the bad one first
+            self._pending.append(_BadRequestMarker(status, detail))
+
+    # SECTION: request cycle
+
+    async def _run(self) -> None:
+        try:
+            while self._pending and not self.disconnected:
+                request = self._pending.popleft()
+                if not self._reading and len(self._pending) < _MAX_PIPELINE // 2:
+                    self._reading = True
+                    self.transport.resume_reading()
+                if isinstance(request, _BadRequestMarker):
+                    self._worker = None
+                    self._reject(request.status, request.detail)
+                    return
+                keep_alive = await self._cycle(request)
+                if not keep_alive or self.server.should_exit:
+                    self.closing = True
+                    self.transport.close()
+                    return
+        finally:
+            self._worker = None
+        if not self.disconnected:
+            self._send_continue()
+            self._arm_idle_timer()
+
+    async def _cycle(self, request: _Request) -> bool:
+        """Run the app for one request; return whether to keep the connection."""
+        cycle = self._current = _Cycle(self, request)
+        self.server.in_flight += 1
+        failed = False
+        try:
+            await self.app(request.scope, cycle.receive, cycle.send)
+        except Exception:
+            logger.exception("Exception in ASGI application")
+            failed = True
+        finally:
+            self.server.in_flight -= 1
+            self._current = None
+        if cycle.complete and not failed:
+            return request.keep_alive and cycle.keep_alive
+
+        if not cycle.started:
+            if not failed:
+                logger.error("ASGI app returned without sending a response")
+            await cycle.send_error(500)
+        # A response cut short cannot be framed correctly: drop the connection
+        cycle.done()
+        return False
+
+    # SECTION: idle connections
+
+    def _arm_idle_timer(self) -> None:
+        self._cancel_idle_timer()
+        self._idle_handle = self.loop.call_later(
+            self.server.keep_alive_timeout, self._close_idle
+        )
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    def _close_idle(self) -> None:
+        if self._worker is not None or self._pending:
+            return
+        if self._head is not None:
+            # Headers parsed but the body stopped arriving
+            self._reject(408, "Request body timed out")
+            return
+        self.closing = True
+        self.transport.close()
+
+    def shutdown(self) -> None:
+        """Close now if idle; otherwise close after the current response."""
+        if self._worker is None:
+            self.closing = True
+            self.transport.close()
+
+    def abort(self) -> None:
+        """Drop the connection and cancel the request being answered."""
+        self.closing = True
+        if self._worker is not None:
+            self._worker.cancel()
+        self.transport.abort()
+
+
+class _BadRequestMarker:
+    __slots__ = ("detail", "status")
+
+    def __init__(self, status: int, detail: str):
+        self.status = status
+        self.detail = detail
+
+
+class _Cycle:
+    """ASGI ``receive``/``send`` for one request on a connection."""
+
+    __slots__ = (
+        "_body_sent",
+        "_chunked",
+        "_done",
+        "_head_only",
+        "_headers",
+        "_status",
+        "complete",
+        "keep_alive",
+        "protocol",
+        "request",
+        "started",
+    )
+
+    def __init__(self, protocol: HttpProtocol, request: _Request):
+        self.protocol = protocol
+        self.request = request
+        self.started = False
+        self.complete = False
+        self.keep_alive = True
+        self._body_sent = False
+        self._status = 200
+        self._headers: list = []
+        self._chunked = False
+        self._head_only = request.scope["method"] == "HEAD"
+        self._done: asyncio.Event | None = None
+
+    async def receive(self) -> dict:
+        if not self._body_sent:
+            self._body_sent = True
+            return {
+                "type": "http.request",
+                "body": self.request.body,
+                "more_body": False,
+            }
+        # Body already delivered: the next event is the client going away
+        if not self.protocol.disconnected and not self.complete:
+            if self._done is None:
+                self._done = asyncio.Event()
+            await self._done.wait()
+        return {"type": "http.disconnect"}
+
+    def done(self) -> None:
+        self.complete = True
+        if self._done is not None:
+            self._done.set()
+
+    def _head(self, content_length: int | None) -> bytearray:
+        head = bytearray(_status_line(self._status))
+        has_length = has_date = False
+        for name, value in self._headers:
+            name = name.lower() if isinstance(name, bytes) else name.encode().lower()
+            if isinstance(value, str):
+                value = value.encode("latin-1")
+            if name == b"content-length":
+                has_length = True
+            elif name == b"date":
+                has_date = True
+            elif name == b"connection":
+                if b"close" in value.lower():
+                    self.keep_alive = False
+                continue  # written once below, from the server's decision
+            elif name == b"transfer-encoding":
+                continue  # the server decides the framing
+            head += name + b": " + value + b"\r\n"
+        if not has_date:
+            head += b"date: " + _date() + b"\r\n"
+        # 1xx, 204 and 304 responses have no body, and no framing (RFC 9110)
+        if not has_length and self._status >= 200 and self._status not in (204, 304):
+            if content_length is not None:
+                head += b"content-length: %d\r\n" % content_length
+            elif self.request.scope["http_version"] == "1.0":
+                # No chunked encoding in HTTP/1.0: closing ends the body
+                self.keep_alive = False
+            else:
+                self._chunked = True
+                head += b"transfer-encoding: chunked\r\n"
+        keep_alive = self.request.keep_alive and self.keep_alive
+        if not keep_alive or self.protocol.server.should_exit:
+            head += b"connection: close\r\n"
+        elif self.request.scope["http_version"] == "1.0":
+            head += b"connection: keep-alive\r\n"
+        head += b"\r\n"
+        return head
+
+    async def send(self, message: dict) -> None:
+        protocol = self.protocol
+        if protocol.disconnected:
+            return
+        kind = message["type"]
+
+        if kind == "http.response.start":
+            if self.started:
+                raise RuntimeError("http.response.start sent twice")
+            self.started = True
+            self._status = message["status"]
+            self._headers = message.get("headers", [])
+            return
+
+        if kind != "http.response.body":
+            raise RuntimeError(f"Unexpected ASGI message {kind!r}")
+        if not self.started:
+            raise RuntimeError("http.response.body sent before http.response.start")
+        if self.complete:
+            raise RuntimeError("http.response.body sent after the response completed")
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not protocol._writable.is_set():
+            await protocol._writable.wait()
+            if protocol.disconnected:
+                return
+
+        transport = protocol.transport
+        if self._headers is not None:
+            # First body message: headers go out with it in one write
+            head = self._head(None if more_body else len(body))
+            self._headers = None
+            if self._head_only:
+                transport.write(head)
+            elif self._chunked:
+                transport.write(head + self._frame(body, more_body))
+            else:
+                transport.write(head + body)
+        elif not self._head_only:
+            if self._chunked:
+                transport.write(self._frame(body, more_body))
+            elif body:
+                transport.write(body)
+
+        if not more_body:
+            self.done()
+
+    def _frame(self, body: bytes, more_body: bool) -> bytes:
+        frame = b"%x\r\n%s\r\n" % (len(body), body) if body else b""
+        return frame if more_body else frame + b"0\r\n\r\n"
+
+    async def send_error(self, status: int) -> None:
+        self._status = status
+        self._headers = [(b"content-type", b"text/plain; charset=utf-8")]
+        self.keep_alive = False
+        self.started = True
+        phrase = HTTPStatus(status).phrase.encode()
+        await self.send({"type": "http.response.body", "body": phrase})
+
+
+class Server:
+    """Listens on ``host:port`` (or given sockets) and serves ``app``."""
+
+    def __init__(
+        self,
+        app,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        *,
+        max_request_size: int = 1024 * 1024,
+        max_header_size: int = 64 * 1024,
+        keep_alive_timeout: float = 5.0,
+        graceful_timeout: float = 30.0,
+        backlog: int = 2048,
+        root_path: str = "",
+        lifespan: bool = True,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.max_request_size = max_request_size
+        self.max_header_size = max_header_size
+        self.keep_alive_timeout = keep_alive_timeout
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self.root_path = root_path
+        self.lifespan = lifespan
+        self.state: dict = {}
+        self.connections: set[HttpProtocol] = set()
+        self.in_flight = 0
+        self.should_exit = False
+        self._servers: list[asyncio.AbstractServer] = []
+        self._exit: asyncio.Event | None = None
+        self._drained: asyncio.Event | None = None
+
+    @property
+    def sockets(self) -> list[socket.socket]:
+        return [sock for server in self._servers for sock in server.sockets]
+
+    async def startup(self, sockets: list[socket.socket] | None = None) -> None:
+        loop = asyncio.get_running_loop()
+        self._exit = asyncio.Event()
+        if self.should_exit:
+            self._exit.set()
+
+        def factory() -> HttpProtocol:
+            return HttpProtocol(self)
+
+        if sockets:
+            for sock in sockets:
+                self._servers.append(
+                    await loop.create_server(factory, sock=sock, backlog=self.backlog)
+                )
+        else:
+            self._servers.append(
+                await loop.create_server(
+                    factory, self.host, self.port, backlog=self.backlog
+                )
+            )
+        for sock in self.sockets:
+            name = sock.getsockname()
+            logger.info("Listening on http://%s:%s", name[0], name[1])
+
+    def request_exit(self) -> None:
+        self.should_exit = True
+        if self._exit is not None:
+            self._exit.set()
+
+    async def shutdown(self) -> None:
+        """Stop accepting, finish responses in progress, close connections.
+
+        Connections still busy after ``graceful_timeout`` are aborted and
+        their requests cancelled, so lifespan shutdown always gets to run.
+        """
+        self.should_exit = True
+        for server in self._servers:
+            server.close()
+        self._drained = asyncio.Event()
+        for connection in list(self.connections):
+            connection.shutdown()
+        if self.connections:
+            try:
+                await asyncio.wait_for(self._drained.wait(), self.graceful_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Graceful shutdown timed out; aborting %d connections",
+                    len(self.connections),
+                )
+                for connection in list(self.connections):
+                    connection.abort()
+        self._servers.clear()
+
+    def _connection_closed(self, connection: HttpProtocol) -> None:
+        self.connections.discard(connection)
+        if self._drained is not None and not self.connections:
+            self._drained.set()
+
+    async def serve(self, sockets: list[socket.socket] | None = None) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_exit)
+            except (NotImplementedError, RuntimeError):
+                pass  # not the main thread, or not supported on this platform
+
+        if self.lifespan:
+            lifespan = LifespanManager(self.app)
+            await lifespan.__aenter__()
+            self.state = lifespan.state
+        try:
+            await self.startup(sockets)
+            await self._exit.wait()
+            await self.shutdown()
+        finally:
+            if self.lifespan:
+                await lifespan.__aexit__(None, None, None)
+
+
+def run(app, host: str = "127.0.0.1", port: int = 8000, **options) -> None:
+    """Serve ``app`` until SIGINT/SIGTERM."""
+    asyncio.run(Server(app, host, port, **options).serve())
@@ -0,0 +1,242 @@
+"""Prefork multi-process serving.
+
+    oberoon serve examples.bookstore.app:app --workers 4 [--reuse-port]
+
+The master process imports the app *once* and then forks the workers, so
+the imported code and any data built at import time are shared
+copy-on-write. Each worker runs the asyncio ``Server`` on either
+
+- the listening socket the master bound before forking (default), or
+- its own ``SO_REUSEPORT`` socket, letting the kernel balance connections
+
+The master only supervises:
+
+- a worker that dies is replaced (a worker that fails during lifespan
+  startup stops the whole server instead of crash-looping)
+- ``SIGHUP`` rolls the workers over: replacements are started first, then
+  the old ones get ``SIGTERM`` and drain — finishing in-flight requests and
+  running lifespan shutdown — before exiting
+- ``SIGTERM`` / ``SIGINT`` drain all workers and exit; workers still alive
+  after ``graceful_timeout`` are killed
+
+``SIGHUP`` does not re-import the app: the master's copy is what the new
+workers run. Restart the master to deploy new code.
+"""
+
+import asyncio
+import os
+import select
+import signal
+import socket
+import sys
+import time
+
+from oberoon.logging import get_logger
+from oberoon.server import Server
+
+logger = get_logger("supervisor")
+
+# Worker exit status meaning "failed before serving"; not worth restarting
+BOOT_FAILURE = 3
+
+_HANDLED = (signal.SIGCHLD, signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
+
+
+def bind_socket(
+    host: str, port: int, reuse_port: bool = False, backlog: int = 2048
+) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    sock.setblocking(False)
+    return sock
+
+
+class Supervisor:
+    """Forks and babysits ``workers`` server processes for ``app``."""
+
+    def __init__(
+        self,
+        app,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 2,
+        reuse_port: bool = False,
+        graceful_timeout: float = 30.0,
+        **server_options,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.reuse_port = reuse_port
+        self.graceful_timeout = graceful_timeout
+        self.server_options = server_options
+
+        self._sockets: list[socket.socket] = []
+        self._children: dict[int, float] = {}  # pid -> start time
+        self._retiring: dict[int, float] = {}  # pid -> SIGTERM time
+        self._signals: list[int] = []
+        self._wakeup_r: int | None = None
+        self._wakeup_w: int | None = None
+        self._stopping = False
+        self.exit_code = 0
+
+    # SECTION: workers
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+
+        # Child: drop the master's signal plumbing and serve
+        code = 0
+        try:
+            signal.set_wakeup_fd(-1)
+            for sig in _HANDLED:
+                signal.signal(sig, signal.SIG_DFL)
+            # Reloads are the master's business
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            code = self._serve_worker()
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+
+    def _serve_worker(self) -> int:
+        if self.reuse_port:
+            sockets = [bind_socket(self.host, self.port, reuse_port=True)]
+        else:
+            sockets = self._sockets
+        server = Server(self.app, self.host, self.port, **self.server_options)
+        try:
+            asyncio.run(server.serve(sockets))
+        except RuntimeError as exc:
+            if not server.sockets and not server.should_exit:
+                logger.error("Worker %d failed to start: %s", os.getpid(), exc)
+                return BOOT_FAILURE
+            raise
+        return 0
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            code = os.waitstatus_to_exitcode(status)
+            started = self._children.pop(pid, None)
+            if self._retiring.pop(pid, None) is not None or self._stopping:
+                logger.info("Worker %d exited (%d)", pid, code)
+                continue
+            if started is None:
+                continue
+            if code == BOOT_FAILURE:
+                logger.error("Worker %d failed to boot; shutting down", pid)
+                self.exit_code = BOOT_FAILURE
+                self._stop()
+                continue
+            logger.warning("Worker %d died (%d); restarting", pid, code)
+            if time.monotonic() - started < 1.0:
+                time.sleep(1.0)  # crash loop guard
+            self._spawn()
+
+    def _reload(self) -> None:
+        logger.info("Reloading %d workers", self.workers)
+        old = list(self._children)
+        for _ in range(self.workers):
+            self._spawn()
+        now = time.monotonic()
+        for pid in old:
+            self._retire(pid, now)
+
+    def _retire(self, pid: int, now: float) -> None:
+        self._children.pop(pid, None)
+        self._retiring[pid] = now
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _stop(self) -> None:
+        self._stopping = True
+        now = time.monotonic()
+        for pid in list(self._children):
+            self._retire(pid, now)
+
+    def _kill_stragglers(self) -> None:
+        now = time.monotonic()
+        for pid, since in list(self._retiring.items()):
+            if now - since > self.graceful_timeout:
+                logger.warning("Worker %d did not drain in time; killing", pid)
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self._retiring[pid] = float("inf")  # don't signal again
+
+    # SECTION: master loop
+
+    def _on_signal(self, sig: int, frame) -> None:
+        self._signals.append(sig)
+
+    def run(self) -> int:
+        if not self.reuse_port:
+            self._sockets = [bind_socket(self.host, self.port)]
+            self.port = self._sockets[0].getsockname()[1]
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        signal.set_wakeup_fd(self._wakeup_w)
+        for sig in _HANDLED:
+            signal.signal(sig, self._on_signal)
+
+        logger.info(
+            "Master %d serving on http://%s:%d with %d workers",
+            os.getpid(),
+            self.host,
+            self.port,
+            self.workers,
+        )
+        try:
+            for _ in range(self.workers):
+                self._spawn()
+            while self._children or self._retiring:
+                select.select([self._wakeup_r], [], [], 1.0)
+                try:
+                    os.read(self._wakeup_r, 512)
+                except BlockingIOError:
+                    pass
+                signals, self._signals = self._signals, []
+                for sig in signals:
+                    if sig in (signal.SIGTERM, signal.SIGINT) and not self._stopping:
+                        logger.info("Shutting down")
+                        self._stop()
+                    elif sig == signal.SIGHUP and not self._stopping:
+                        self._reload()
+                self._reap()
+                self._kill_stragglers()
+        finally:
+            signal.set_wakeup_fd(-1)
+            for sig in _HANDLED:
+                signal.signal(sig, signal.SIG_DFL)
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            for sock in self._sockets:
+                sock.close()
+        return self.exit_code
@@ -0,0 +1,641 @@
+"""In-process ASGI test client.
+
+``TestClient`` (sync) and ``AsyncTestClient`` build ASGI scopes and call the
+application directly — no sockets, no HTTP parsing, no transport layer —
+so a request costs little more than the application itself::
+
+    from oberoon.testing import TestClient
+
+    with TestClient(app) as client:          # runs lifespan startup/shutdown
+        response = client.get("/books", params={"page": 2})
+        assert response.json() == [...]
+
+        with client.stream("GET", "/export") as response:
+            for chunk in response.iter_bytes():
+                ...
+
+        with client.websocket_connect("/ws") as ws:
+            ws.send_text("ping")
+            assert ws.receive_text() == "pong"
+
+``AsyncTestClient`` has the same API with ``await`` / ``async with`` and runs
+on the caller's event loop. ``TestClient`` runs the app in a blocking portal
+(``anyio.from_thread``) that lives for the client's lifetime.
+
+Exceptions raised by the app propagate to the caller unless
+``raise_server_exceptions=False``, in which case a bare 500 is returned.
+"""
+
+import math
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from typing import Any
+from urllib.parse import unquote, urlencode, urljoin, urlsplit
+
+import anyio
+import anyio.from_thread
+import msgspec
+
+from oberoon.lifespan import LifespanManager
+
+Content = bytes | str | Iterable[bytes] | AsyncIterable[bytes]
+Params = dict[str, Any] | list[tuple[str, Any]]
+
+
+class WebSocketDisconnect(Exception):
+    """The application closed (or refused) the WebSocket."""
+
+    def __init__(self, code: int = 1000, reason: str = ""):
+        super().__init__(code, reason)
+        self.code = code
+        self.reason = reason
+
+
+# SECTION: responses
+
+
+def _decode_headers(raw: Iterable) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    for name, value in raw:
+        key = name.decode("latin-1").lower()
+        text = value.decode("latin-1")
+        headers[key] = f"{headers[key]}, {text}" if key in headers else text
+    return headers
+
+
+class TestResponse:
+    """A fully received response."""
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, status_code: int, raw_headers: list, content: bytes):
+        self.status_code = status_code
+        self.raw_headers = raw_headers
+        self.headers = _decode_headers(raw_headers)
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+    def json(self) -> Any:
+        return msgspec.json.decode(self.content)
+
+    def __repr__(self) -> str:
+        return f"<TestResponse [{self.status_code}]>"
+
+
+class AsyncStreamResponse:
+    """A response whose body is read chunk by chunk as the app sends it."""
+
+    def __init__(self, status_code: int, raw_headers: list, chunks, exchange):
+        self.status_code = status_code
+        self.raw_headers = raw_headers
+        self.headers = _decode_headers(raw_headers)
+        self._chunks = chunks
+        self._exchange = exchange
+
+    async def next_chunk(self) -> bytes | None:
+        """The next non-empty body chunk, or ``None`` once the body is done."""
+        async for message in self._chunks:
+            if message["type"] != "http.response.body":
+                continue
+            body = message.get("body", b"")
+            if not message.get("more_body", False):
+                self._chunks = _empty()
+                if body:
+                    return body
+                break
+            if body:
+                return body
+        self._exchange.raise_error()
+        return None
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        while (chunk := await self.next_chunk()) is not None:
+            yield chunk
+
+    async def aread(self) -> bytes:
+        return b"".join([chunk async for chunk in self.aiter_bytes()])
+
+
+async def _empty() -> AsyncIterator[dict]:
+    return
+    yield
+
+
+class StreamResponse:
+    """Sync view of an ``AsyncStreamResponse``."""
+
+    def __init__(self, portal, response: AsyncStreamResponse):
+        self._portal = portal
+        self._response = response
+        self.status_code = response.status_code
+        self.raw_headers = response.raw_headers
+        self.headers = response.headers
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        while (chunk := self._portal.call(self._response.next_chunk)) is not None:
+            yield chunk
+
+    def read(self) -> bytes:
+        return b"".join(self.iter_bytes())
+
+
+# SECTION: http exchange
+
+
+class _Exchange:
+    """ASGI ``receive``/``send`` for one HTTP request."""
+
+    def __init__(self, body: Content, raise_server_exceptions: bool):
+        self._body = body
+        self._raise = raise_server_exceptions
+        self._chunks: Iterator | AsyncIterator | None = None
+        self._body_done = False
+        self._complete: anyio.Event | None = None
+        self.error: BaseException | None = None
+
+    async def receive(self) -> dict:
+        if self._body_done:
+            # Like a real client: the connection stays open until the
+            # response is complete, then the app sees a disconnect
+            if self._complete is None:
+                self._complete = anyio.Event()
+            await self._complete.wait()
+            return {"type": "http.disconnect"}
+
+        body = self._body
+        if isinstance(body, bytes):
+            self._body_done = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        if self._chunks is None:
+            self._chunks = (
+                aiter(body) if isinstance(body, AsyncIterable) else iter(body)
+            )
+        try:
+            if isinstance(self._chunks, AsyncIterator):
+                chunk = await anext(self._chunks)
+            else:
+                chunk = next(self._chunks)
+        except (StopIteration, StopAsyncIteration):
+            self._body_done = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    def complete(self) -> None:
+        self._body_done = True
+        if self._complete is None:
+            self._complete = anyio.Event()
+        self._complete.set()
+
+    def raise_error(self) -> None:
+        if self.error is not None and self._raise:
+            raise self.error
+
+
+# SECTION: clients
+
+
+class AsyncTestClient:
+    """Calls an ASGI app in-process on the current event loop."""
+
+    __test__ = False
+
+    def __init__(
+        self,
+        app,
+        base_url: str = "http://testserver",
+        headers: dict[str, str] | None = None,
+        raise_server_exceptions: bool = True,
+        root_path: str = "",
+        client: tuple[str, int] = ("testclient", 50000),
+    ):
+        self.app = app
+        self.base_url = base_url
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.raise_server_exceptions = raise_server_exceptions
+        self.root_path = root_path
+        self.client = client
+        self._lifespan: LifespanManager | None = None
+
+    # SECTION: lifespan
+
+    async def __aenter__(self) -> "AsyncTestClient":
+        self._lifespan = LifespanManager(self.app)
+        await self._lifespan.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        lifespan, self._lifespan = self._lifespan, None
+        if lifespan is not None:
+            await lifespan.__aexit__(*exc_info)
+
+    # SECTION: http
+
+    def _build(
+        self,
+        method: str,
+        url: str,
+        params: Params | None,
+        headers: dict[str, str] | None,
+        content: Content | None,
+        json: Any,
+        scheme_map: dict[str, str],
+    ) -> tuple[dict, Content]:
+        parts = urlsplit(urljoin(self.base_url, url))
+        query = parts.query
+        if params:
+            extra = urlencode(params, doseq=True)
+            query = f"{query}&{extra}" if query else extra
+
+        merged = {"host": parts.netloc, "user-agent": "testclient", **self.headers}
+        if headers:
+            merged.update({k.lower(): v for k, v in headers.items()})
+
+        body: Content = b""
+        if json is not None:
+            body = msgspec.json.encode(json)
+            merged.setdefault("content-type", "application/json")
+        elif content is not None:
+            body = content.encode() if isinstance(content, str) else content
+        if isinstance(body, bytes):
+            if body or method not in ("GET", "HEAD"):
+                merged.setdefault("content-length", str(len(body)))
+        else:
+            merged.setdefault("transfer-encoding", "chunked")
+
+        path = parts.path or "/"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": scheme_map.get(parts.scheme, parts.scheme),
+            "path": unquote(path),
+            "raw_path": path.encode(),
+            "root_path": self.root_path,
+            "query_string": query.encode(),
+            "headers": [(k.encode(), str(v).encode()) for k, v in merged.items()],
+            "client": self.client,
+            "server": (parts.hostname, parts.port or 80),
+        }
+        return scope, body
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Params | None = None,
+        headers: dict[str, str] | None = None,
+        content: Content | None = None,
+        json: Any = None,
+    ) -> TestResponse:
+        method = method.upper()
+        scope, body = self._build(
+            method, url, params, headers, content, json, {"ws": "http", "wss": "https"}
+        )
+        exchange = _Exchange(body, self.raise_server_exceptions)
+        status = 0
+        raw_headers: list = []
+        chunks: list[bytes] = []
+
+        async def send(message: dict) -> None:
+            nonlocal status, raw_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                raw_headers = [tuple(pair) for pair in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    exchange.complete()
+
+        try:
+            await self.app(scope, exchange.receive, send)
+        except Exception:
+            if self.raise_server_exceptions:
+                raise
+            if not status:
+                return TestResponse(500, [], b"")
+        return TestResponse(status, raw_headers, b"".join(chunks))
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Params | None = None,
+        headers: dict[str, str] | None = None,
+        content: Content | None = None,
+        json: Any = None,
+    ) -> AsyncIterator[AsyncStreamResponse]:
+        method = method.upper()
+        scope, body = self._build(
+            method, url, params, headers, content, json, {"ws": "http", "wss": "https"}
+        )
+        exchange = _Exchange(body, self.raise_server_exceptions)
+        to_client, from_app = anyio.create_memory_object_stream(math.inf)
+
+        async def send(message: dict) -> None:
+            await to_client.send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                exchange.complete()
+
+        async def run_app() -> None:
+            async with to_client:
+                try:
+                    await self.app(scope, exchange.receive, send)
+                except Exception as exc:
+                    exchange.error = exc
+
+        async with anyio.create_task_group() as tg, from_app:
+            tg.start_soon(run_app)
+            try:
+                start = await from_app.receive()
+            except anyio.EndOfStream:
+                exchange.raise_error()
+                start = {"status": 500}
+            response = AsyncStreamResponse(
+                start["status"],
+                [tuple(pair) for pair in start.get("headers", [])],
+                from_app,
+                exchange,
+            )
+            try:
+                yield response
+            finally:
+                # Leaving early abandons the rest of the body
+                exchange.complete()
+                tg.cancel_scope.cancel()
+
+    async def get(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def options(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("OPTIONS", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> TestResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    # SECTION: websockets
+
+    def websocket_connect(
+        self,
+        url: str,
+        *,
+        params: Params | None = None,
+        headers: dict[str, str] | None = None,
+        subprotocols: Iterable[str] = (),
+    ) -> "AsyncWebSocketSession":
+        scope, _ = self._build(
+            "GET", url, params, headers, None, None, {"http": "ws", "https": "wss"}
+        )
+        scope["type"] = "websocket"
+        scope["asgi"] = {"version": "3.0"}
+        scope["subprotocols"] = list(subprotocols)
+        del scope["method"]
+        return AsyncWebSocketSession(self.app, scope)
+
+
+class AsyncWebSocketSession:
+    """Client side of one WebSocket connection; use with ``async with``."""
+
+    def __init__(self, app, scope: dict):
+        self.app = app
+        self.scope = scope
+        self.accepted_subprotocol: str | None = None
+        self.extra_headers: list = []
+        self._error: BaseException | None = None
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncWebSocketSession":
+        self._to_app, self._app_inbox = anyio.create_memory_object_stream(math.inf)
+        self._app_outbox, self._from_app = anyio.create_memory_object_stream(math.inf)
+        self._tg = anyio.create_task_group()
+        await self._tg.__aenter__()
+        self._tg.start_soon(self._run)
+        try:
+            await self._to_app.send({"type": "websocket.connect"})
+            message = await self._next_message()
+            if message["type"] == "websocket.close":
+                self._closed = True
+                raise WebSocketDisconnect(
+                    message.get("code", 1000), message.get("reason", "")
+                )
+            if message["type"] != "websocket.accept":
+                raise RuntimeError(f"Expected websocket.accept, got {message['type']}")
+        except BaseException:
+            self._to_app.close()
+            self._tg.cancel_scope.cancel()
+            await self._tg.__aexit__(None, None, None)
+            raise
+        self.accepted_subprotocol = message.get("subprotocol")
+        self.extra_headers = message.get("headers", [])
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if not self._closed:
+            self._closed = True
+            await self._to_app.send({"type": "websocket.disconnect", "code": 1000})
+        self._to_app.close()
+        await self._tg.__aexit__(*exc_info)
+        if self._error is not None and exc_info[0] is None:
+            raise self._error
+
+    async def _run(self) -> None:
+        async with self._app_outbox:
+            try:
+                await self.app(
+                    self.scope, self._app_inbox.receive, self._app_outbox.send
+                )
+            except Exception as exc:
+                self._error = exc
+
+    async def _next_message(self) -> dict:
+        try:
+            return await self._from_app.receive()
+        except anyio.EndOfStream:
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error from None
+            raise WebSocketDisconnect(1006, "The app exited without closing") from None
+
+    async def send_text(self, data: str) -> None:
+        await self._to_app.send({"type": "websocket.receive", "text": data})
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._to_app.send({"type": "websocket.receive", "bytes": data})
+
+    async def send_json(self, data: Any) -> None:
+        await self.send_text(msgspec.json.encode(data).decode())
+
+    async def receive(self) -> dict:
+        message = await self._next_message()
+        if message["type"] == "websocket.close":
+            self._closed = True
+            raise WebSocketDisconnect(
+                message.get("code", 1000), message.get("reason", "")
+            )
+        return message
+
+    async def receive_text(self) -> str:
+        return (await self.receive())["text"]
+
+    async def receive_bytes(self) -> bytes:
+        return (await self.receive())["bytes"]
+
+    async def receive_json(self) -> Any:
+        message = await self.receive()
+        return msgspec.json.decode(message.get("text") or message.get("bytes"))
+
+    async def close(self, code: int = 1000) -> None:
+        if not self._closed:
+            self._closed = True
+            await self._to_app.send({"type": "websocket.disconnect", "code": code})
+
+
+class TestClient:
+    """Synchronous client; the app runs on an event loop in a helper thread."""
+
+    __test__ = False
+
+    def __init__(
+        self,
+        app,
+        base_url: str = "http://testserver",
+        headers: dict[str, str] | None = None,
+        raise_server_exceptions: bool = True,
+        root_path: str = "",
+        backend: str = "asyncio",
+        backend_options: dict | None = None,
+    ):
+        self._client = AsyncTestClient(
+            app,
+            base_url=base_url,
+            headers=headers,
+            raise_server_exceptions=raise_server_exceptions,
+            root_path=root_path,
+        )
+        self.app = app
+        self.backend = backend
+        self.backend_options = backend_options
+        self._stack: ExitStack | None = None
+        self._portal = None
+
+    @property
+    def portal(self) -> anyio.from_thread.BlockingPortal:
+        # Started lazily and reused: one event loop thread per client
+        if self._portal is None:
+            self._stack = ExitStack()
+            self._portal = self._stack.enter_context(
+                anyio.from_thread.start_blocking_portal(
+                    self.backend, self.backend_options
+                )
+            )
+        return self._portal
+
+    def close(self) -> None:
+        stack, self._stack, self._portal = self._stack, None, None
+        if stack is not None:
+            stack.close()
+
+    def __enter__(self) -> "TestClient":
+        lifespan = self.portal.wrap_async_context_manager(self._client)
+        lifespan.__enter__()
+        self._stack.push(lifespan.__exit__)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def request(self, method: str, url: str, **kwargs) -> TestResponse:
+        return self.portal.call(lambda: self._client.request(method, url, **kwargs))
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[StreamResponse]:
+        portal = self.portal
+        with portal.wrap_async_context_manager(
+            self._client.stream(method, url, **kwargs)
+        ) as response:
+            yield StreamResponse(portal, response)
+
+    def get(self, url: str, **kwargs) -> TestResponse:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> TestResponse:
+        return self.request("HEAD", url, **kwargs)
+
+    def options(self, url: str, **kwargs) -> TestResponse:
+        return self.request("OPTIONS", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> TestResponse:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> TestResponse:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> TestResponse:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> TestResponse:
+        return self.request("DELETE", url, **kwargs)
+
+    @contextmanager
+    def websocket_connect(self, url: str, **kwargs) -> Iterator["WebSocketSession"]:
+        portal = self.portal
+        session = self._client.websocket_connect(url, **kwargs)
+        with portal.wrap_async_context_manager(session):
+            yield WebSocketSession(portal, session)
+
+
+class WebSocketSession:
+    """Sync view of an ``AsyncWebSocketSession``."""
+
+    def __init__(self, portal, session: AsyncWebSocketSession):
+        self._portal = portal
+        self._session = session
+
+    @property
+    def accepted_subprotocol(self) -> str | None:
+        return self._session.accepted_subprotocol
+
+    def send_text(self, data: str) -> None:
+        self._portal.call(self._session.send_text, data)
+
+    def send_bytes(self, data: bytes) -> None:
+        self._portal.call(self._session.send_bytes, data)
+
+    def send_json(self, data: Any) -> None:
+        self._portal.call(self._session.send_json, data)
+
+    def receive(self) -> dict:
+        return self._portal.call(self._session.receive)
+
+    def receive_text(self) -> str:
+        return self._portal.call(self._session.receive_text)
+
+    def receive_bytes(self) -> bytes:
+        return self._portal.call(self._session.receive_bytes)
+
+    def receive_json(self) -> Any:
+        return self._portal.call(self._session.receive_json)
+
+    def close(self, code: int = 1000) -> None:
+        self._portal.call(self._session.close, code)
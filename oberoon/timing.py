@@ -0,0 +1,53 @@
+"""Phase-level request timing and the ``Server-Timing`` header.
+
+When timing is on, ``handle_request`` marks a monotonic timestamp at each
+phase boundary (routing, admission, validation, body decode, handler,
+serialization). The spans between marks can be:
+
+- sent back in a ``Server-Timing`` header (``Oberoon(server_timing=True)``,
+  or per request when the header named by ``server_timing_header`` is sent)
+- passed to hooks registered with ``app.add_timing_hook(fn)``, e.g. to
+  forward them to a tracer
+
+With neither enabled no timer is created and each phase boundary costs one
+``is None`` check.
+"""
+
+import time
+from typing import NamedTuple
+
+
+class Span(NamedTuple):
+    name: str
+    start: float  # time.perf_counter() value
+    duration: float  # seconds
+
+
+class PhaseTimer:
+    """Collects ``(phase, timestamp)`` marks for one request."""
+
+    __slots__ = ("expose", "marks")
+
+    def __init__(self, expose: bool = False):
+        self.expose = expose
+        self.marks: list[tuple[str, float]] = [("start", time.perf_counter())]
+
+    def mark(self, phase: str) -> None:
+        """Close the phase that ends now."""
+        self.marks.append((phase, time.perf_counter()))
+
+    def spans(self) -> list[Span]:
+        marks = self.marks
+        return [
+            Span(name, marks[i - 1][1], at - marks[i - 1][1])
+            for i, (name, at) in enumerate(marks)
+            if i
+        ]
+
+    def header(self) -> str:
+        """Render as a ``Server-Timing`` value, durations in milliseconds."""
+        spans = self.spans()
+        parts = [f"{span.name};dur={span.duration * 1000:.3f}" for span in spans]
+        total = self.marks[-1][1] - self.marks[0][1]
+        parts.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(parts)
@@ -1,7 +1,7 @@
-import httpx
 import pytest
 
 from oberoon import Oberoon, HTTPException, Request, Response
+from oberoon.testing import AsyncTestClient
 
 
 @pytest.fixture
@@ -58,6 +58,5 @@ def app():
 
 @pytest.fixture
 async def client(app):
-    transport = httpx.ASGITransport(app=app)
-    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+    async with AsyncTestClient(app, base_url="http://test") as c:
         yield c
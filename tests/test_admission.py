@@ -0,0 +1,195 @@
+"""Tests for admission control: concurrency limits, wait queue and load shedding."""
+
+import anyio
+import httpx
+import pytest
+
+from oberoon import Oberoon, Priority, Request
+from oberoon.admission import ConcurrencyLimiter
+from oberoon.exceptions import ServiceUnavailableException
+
+pytestmark = pytest.mark.anyio
+
+
+# ── ConcurrencyLimiter ──────────────────────────────────────────────────────
+
+
+class TestConcurrencyLimiter:
+    async def test_acquire_within_limit(self):
+        limiter = ConcurrencyLimiter(max_concurrency=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        assert limiter.in_flight == 2
+
+    async def test_shed_when_full_and_no_queue(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, retry_after=7)
+        await limiter.acquire()
+        with pytest.raises(ServiceUnavailableException) as info:
+            await limiter.acquire()
+        assert info.value.status_code == 503
+        assert info.value.headers == {"retry-after": "7"}
+
+    async def test_release_hands_slot_to_waiter(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        await limiter.acquire()
+        admitted = []
+
+        async def waiter():
+            await limiter.acquire()
+            admitted.append(True)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(waiter)
+            await anyio.wait_all_tasks_blocked()
+            assert limiter.queued == 1
+            limiter.release()
+
+        assert admitted == [True]
+        assert limiter.in_flight == 1
+        assert limiter.queued == 0
+
+    async def test_queue_full_sheds(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        await limiter.acquire()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(limiter.acquire)
+            await anyio.wait_all_tasks_blocked()
+            with pytest.raises(ServiceUnavailableException):
+                await limiter.acquire()
+            limiter.release()
+
+    async def test_priority_order(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=2)
+        await limiter.acquire()
+        order = []
+
+        async def waiter(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+            limiter.release()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(waiter, "bulk", Priority.LOW)
+            await anyio.wait_all_tasks_blocked()
+            tg.start_soon(waiter, "health", Priority.CRITICAL)
+            await anyio.wait_all_tasks_blocked()
+            limiter.release()
+
+        assert order == ["health", "bulk"]
+
+    async def test_higher_priority_displaces_lower(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        await limiter.acquire()
+        results = {}
+
+        async def waiter(name, priority):
+            try:
+                await limiter.acquire(priority)
+                results[name] = "admitted"
+                limiter.release()
+            except ServiceUnavailableException:
+                results[name] = "shed"
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(waiter, "bulk", Priority.LOW)
+            await anyio.wait_all_tasks_blocked()
+            tg.start_soon(waiter, "auth", Priority.HIGH)
+            await anyio.wait_all_tasks_blocked()
+            limiter.release()
+
+        assert results == {"bulk": "shed", "auth": "admitted"}
+
+    async def test_queue_timeout_sheds(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(ServiceUnavailableException):
+            await limiter.acquire()
+        assert limiter.queued == 0
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1)
+        await limiter.acquire()
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(limiter.acquire)
+            await anyio.wait_all_tasks_blocked()
+            tg.cancel_scope.cancel()
+
+        assert limiter.queued == 0
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    def test_rejects_invalid_limits(self):
+        with pytest.raises(ValueError):
+            ConcurrencyLimiter(max_concurrency=0)
+        with pytest.raises(ValueError):
+            ConcurrencyLimiter(max_concurrency=1, max_queue=-1)
+
+
+# ── App integration ─────────────────────────────────────────────────────────
+
+
+def build_app(**app_kwargs):
+    app = Oberoon(**app_kwargs)
+    app.state_gate = None
+
+    @app.get("/slow")
+    async def slow(request: Request) -> dict:
+        await app.state_gate.wait()
+        return {"ok": True}
+
+    @app.get("/limited", max_concurrency=1)
+    async def limited(request: Request) -> dict:
+        await app.state_gate.wait()
+        return {"ok": True}
+
+    @app.get("/fast")
+    async def fast(request: Request) -> dict:
+        return {"ok": True}
+
+    return app
+
+
+async def hold_and_probe(app, hold_path, probe_path):
+    """Start one request on ``hold_path`` and probe ``probe_path`` while it runs."""
+    app.state_gate = anyio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(c.get, hold_path)
+            await anyio.wait_all_tasks_blocked()
+            probe = await c.get(probe_path)
+            app.state_gate.set()
+    return probe
+
+
+class TestAppAdmission:
+    async def test_unlimited_by_default(self):
+        probe = await hold_and_probe(build_app(), "/slow", "/fast")
+        assert probe.status_code == 200
+
+    async def test_global_limit_sheds_with_retry_after(self):
+        app = build_app(max_concurrency=1, retry_after=3)
+        probe = await hold_and_probe(app, "/slow", "/fast")
+        assert probe.status_code == 503
+        assert probe.headers["retry-after"] == "3"
+        assert probe.json() == {"error": "Service Unavailable"}
+
+    async def test_route_limit_only_affects_route(self):
+        app = build_app()
+        assert (await hold_and_probe(app, "/limited", "/fast")).status_code == 200
+        assert (await hold_and_probe(app, "/limited", "/limited")).status_code == 503
+
+    async def test_slot_released_after_error(self):
+        app = Oberoon(max_concurrency=1)
+
+        @app.get("/boom")
+        async def boom(request: Request) -> dict:
+            raise RuntimeError("boom")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            assert (await c.get("/boom")).status_code == 500
+            assert (await c.get("/boom")).status_code == 500
+        assert app._limiter.in_flight == 0
@@ -0,0 +1,154 @@
+"""Tests for background tasks run after the response is sent."""
+
+import logging
+
+import anyio
+import httpx
+import pytest
+
+from oberoon import BackgroundTasks, JSONResponse, Oberoon, Request, Response
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def app(events):
+    app = Oberoon()
+
+    async def record(name: str) -> None:
+        events.append(name)
+
+    def record_sync(name: str) -> None:
+        events.append(name)
+
+    async def explode() -> None:
+        raise RuntimeError("smtp down")
+
+    @app.post("/injected")
+    async def injected(request: Request, tasks: BackgroundTasks) -> dict:
+        tasks.add_task(record, "email")
+        tasks.add_task(record_sync, "audit")
+        events.append("handler")
+        return {"ok": True}
+
+    @app.get("/attached")
+    async def attached(request: Request) -> Response:
+        tasks = BackgroundTasks()
+        tasks.add_task(record, "attached")
+        return JSONResponse({"ok": True}, background=tasks)
+
+    @app.get("/both")
+    async def both(request: Request, tasks: BackgroundTasks) -> Response:
+        tasks.add_task(record, "injected")
+        response = JSONResponse({"ok": True})
+        response.background = BackgroundTasks()
+        response.background.add_task(record, "attached")
+        return response
+
+    @app.get("/failing")
+    async def failing(request: Request, tasks: BackgroundTasks) -> dict:
+        tasks.add_task(explode)
+        tasks.add_task(record, "after-failure")
+        return {"ok": True}
+
+    @app.get("/error")
+    async def error(request: Request, tasks: BackgroundTasks) -> dict:
+        tasks.add_task(record, "should-not-run")
+        raise RuntimeError("handler failed")
+
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestBackgroundTasks:
+    async def test_injected_tasks_run_after_handler(self, client, events):
+        resp = await client.post("/injected")
+        assert resp.status_code == 200
+        assert resp.json() == {"ok": True}
+        assert events == ["handler", "email", "audit"]
+
+    async def test_tasks_attached_to_response(self, client, events):
+        resp = await client.get("/attached")
+        assert resp.status_code == 200
+        assert events == ["attached"]
+
+    async def test_injected_and_attached_tasks_merge(self, client, events):
+        await client.get("/both")
+        assert events == ["attached", "injected"]
+
+    async def test_failure_logged_and_does_not_stop_others(
+        self, client, events, caplog
+    ):
+        with caplog.at_level(logging.ERROR, logger="oberoon.background"):
+            resp = await client.get("/failing")
+        assert resp.status_code == 200
+        assert events == ["after-failure"]
+        assert "background task explode failed" in caplog.text
+
+    async def test_not_run_when_handler_fails(self, client, events):
+        resp = await client.get("/error")
+        assert resp.status_code == 500
+        assert events == []
+
+    async def test_tasks_run_after_body_sent(self):
+        app = Oberoon()
+        messages = []
+
+        async def task() -> None:
+            messages.append("task")
+
+        @app.get("/")
+        async def index(request: Request, tasks: BackgroundTasks) -> dict:
+            tasks.add_task(task)
+            return {}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message["type"])
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+            "headers": [],
+        }
+        await app(scope, receive, send)
+        assert messages == ["http.response.start", "http.response.body", "task"]
+
+    async def test_concurrency_bounded(self):
+        app = Oberoon(max_background_tasks=1)
+        running = 0
+        peak = 0
+
+        async def task() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await anyio.sleep(0.01)
+            running -= 1
+
+        @app.get("/")
+        async def index(request: Request, tasks: BackgroundTasks) -> dict:
+            tasks.add_task(task)
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            async with anyio.create_task_group() as tg:
+                for _ in range(3):
+                    tg.start_soon(c.get, "/")
+        assert peak == 1
@@ -0,0 +1,264 @@
+"""Tests for the server-side response cache (@cache, ResponseCache)."""
+
+from typing import Annotated
+
+import anyio
+import httpx
+import pytest
+
+from oberoon import Header, Oberoon, Query, Request, Response, cache
+from oberoon.caching import ResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_response(body: bytes, status_code: int = 200) -> Response:
+    response = Response(status_code)
+    response.set_body(body, "application/json")
+    return response
+
+
+# ── ResponseCache ───────────────────────────────────────────────────────────
+
+
+class TestResponseCache:
+    def test_set_and_get(self):
+        store = ResponseCache()
+        store.set("k", make_response(b"[1]"), ttl=10)
+        entry = store.get("k")
+        assert entry.body == b"[1]"
+        assert entry.headers == [(b"content-type", b"application/json")]
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        store = ResponseCache(clock=clock)
+        store.set("k", make_response(b"[1]"), ttl=10)
+        clock.now = 9.9
+        assert "k" in store
+        clock.now = 10.0
+        assert "k" not in store
+        assert store.size == 0
+
+    def test_byte_budget_evicts_lru(self):
+        store = ResponseCache(max_bytes=1500)
+        for key in ("a", "b", "c"):
+            store.set(key, make_response(b"x" * 200), ttl=10)
+        store.get("a")  # a becomes most recently used
+        store.set("d", make_response(b"x" * 200), ttl=10)
+        assert "a" in store
+        assert "b" not in store
+        assert store.size <= 1500
+
+    def test_oversized_entry_not_stored(self):
+        store = ResponseCache(max_bytes=100)
+        store.set("k", make_response(b"x" * 500), ttl=10)
+        assert len(store) == 0
+
+    def test_invalidate_by_tag(self):
+        store = ResponseCache()
+        store.set("list", make_response(b"[]"), ttl=10, tags=["books"])
+        store.set("one", make_response(b"{}"), ttl=10, tags=["books", "book:1"])
+        store.set("other", make_response(b"{}"), ttl=10, tags=["reviews"])
+        assert store.invalidate("books") == 2
+        assert len(store) == 1
+        assert "other" in store
+
+    def test_cached_response_is_a_copy(self):
+        store = ResponseCache()
+        store.set("k", make_response(b"[1]"), ttl=10)
+        first = store.get("k").to_response()
+        first.headers["x-extra"] = "1"
+        assert "x-extra" not in store.get("k").to_response().headers
+
+    async def test_concurrent_misses_collapse(self):
+        store = ResponseCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await anyio.sleep(0.01)
+            return make_response(b"[1]")
+
+        results = []
+
+        async def fetch():
+            results.append(await store.fetch("k", compute, ttl=10))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(10):
+                tg.start_soon(fetch)
+
+        assert calls == 1
+        assert [r.body for r in results] == [b"[1]"] * 10
+
+    async def test_failed_computation_shared_with_waiters(self):
+        store = ResponseCache()
+        attempts = 0
+
+        async def compute():
+            nonlocal attempts
+            attempts += 1
+            await anyio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        outcomes = []
+
+        async def fetch():
+            try:
+                outcomes.append((await store.fetch("k", compute, ttl=10)).body)
+            except RuntimeError:
+                outcomes.append("error")
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(fetch)
+
+        assert outcomes == ["error"] * 3
+        assert attempts == 1
+
+    async def test_unstored_result_shared_with_waiters(self):
+        store = ResponseCache(max_bytes=100)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await anyio.sleep(0.01)
+            return make_response(b"x" * 500)  # over budget: never stored
+
+        results = []
+
+        async def fetch():
+            results.append(await store.fetch("k", compute, ttl=10))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(10):
+                tg.start_soon(fetch)
+
+        assert calls == 1
+        assert len(store) == 0
+        assert [len(r.body) for r in results] == [500] * 10
+
+    async def test_non_200_not_cached(self):
+        store = ResponseCache()
+
+        async def compute():
+            return make_response(b"{}", status_code=201)
+
+        await store.fetch("k", compute, ttl=10)
+        assert len(store) == 0
+
+    async def test_invalidation_during_compute_skips_store(self):
+        store = ResponseCache()
+
+        async def compute():
+            store.invalidate("books")
+            return make_response(b"[1]")
+
+        await store.fetch("k", compute, ttl=10, tags=["books"])
+        assert len(store) == 0
+
+
+# ── @cache on routes ────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def calls():
+    return {"books": 0, "book": 0, "lang": 0}
+
+
+@pytest.fixture
+def app(calls):
+    app = Oberoon()
+
+    @app.get("/books")
+    @cache(ttl=60, tags=["books"])
+    async def list_books(
+        request: Request,
+        genre: Annotated[str, Query()] = "all",
+    ) -> list[dict]:
+        calls["books"] += 1
+        return [{"genre": genre, "call": calls["books"]}]
+
+    @app.get("/books/{book_id:int}")
+    @cache(ttl=60, tags=lambda params: ["books", f"book:{params['book_id']}"])
+    async def get_book(request: Request, book_id: int) -> dict:
+        calls["book"] += 1
+        return {"id": book_id, "call": calls["book"]}
+
+    @app.get("/greeting")
+    @cache(ttl=60, vary=["accept-language"])
+    async def greeting(
+        request: Request, x_tenant: Annotated[str, Header()] = ""
+    ) -> dict:
+        calls["lang"] += 1
+        return {"lang": request.headers.get("accept-language", ""), "tenant": x_tenant}
+
+    @app.post("/books")
+    async def create_book(request: Request) -> dict:
+        request.app.response_cache.invalidate("books")
+        return {"created": True}
+
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestCacheDecorator:
+    async def test_hit_skips_handler(self, client, calls):
+        first = await client.get("/books")
+        second = await client.get("/books")
+        assert first.json() == second.json() == [{"genre": "all", "call": 1}]
+        assert second.headers["content-type"] == "application/json"
+        assert calls["books"] == 1
+
+    async def test_query_params_in_key(self, client, calls):
+        await client.get("/books?genre=sci-fi")
+        resp = await client.get("/books?genre=fantasy")
+        assert resp.json() == [{"genre": "fantasy", "call": 2}]
+        # Equivalent validated query hits the same entry
+        await client.get("/books?genre=sci-fi&unknown=1")
+        assert calls["books"] == 2
+
+    async def test_path_params_in_key(self, client, calls):
+        await client.get("/books/1")
+        await client.get("/books/2")
+        await client.get("/books/1")
+        assert calls["book"] == 2
+
+    async def test_vary_and_header_params_in_key(self, client, calls):
+        await client.get("/greeting", headers={"accept-language": "en"})
+        await client.get("/greeting", headers={"accept-language": "uz"})
+        await client.get("/greeting", headers={"accept-language": "en"})
+        assert calls["lang"] == 2
+        resp = await client.get(
+            "/greeting", headers={"accept-language": "en", "x-tenant": "acme"}
+        )
+        assert resp.json() == {"lang": "en", "tenant": "acme"}
+        assert calls["lang"] == 3
+
+    async def test_invalidation_from_handler(self, client, calls):
+        await client.get("/books")
+        await client.get("/books/1")
+        await client.post("/books")
+        await client.get("/books")
+        await client.get("/books/1")
+        assert calls == {"books": 2, "book": 2, "lang": 0}
+
+    async def test_validation_errors_not_cached(self, client, calls):
+        assert (await client.get("/books/abc")).status_code == 404
+        assert calls["book"] == 0
@@ -0,0 +1,213 @@
+"""Tests for single-flight coalescing of identical concurrent GETs."""
+
+import anyio
+import httpx
+import pytest
+
+from oberoon import HTTPException, Oberoon, Request, Response
+from oberoon.coalescing import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+
+def make_response(body: bytes) -> Response:
+    response = Response(200)
+    response.set_body(body, "application/json")
+    return response
+
+
+class TestSingleFlight:
+    async def test_waiters_share_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await anyio.sleep(0.01)
+            return make_response(b"[1]")
+
+        results = []
+
+        async def run():
+            results.append(await flight.do("k", compute))
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(5):
+                tg.start_soon(run)
+
+        assert calls == 1
+        assert {r.body for r in results} == {b"[1]"}
+        # Each waiter owns its headers
+        results[0].headers["x-mine"] = "1"
+        assert sum("x-mine" in r.headers for r in results) == 1
+        assert len(flight) == 0
+
+    async def test_cancelled_waiter_does_not_cancel_computation(self):
+        flight = SingleFlight()
+        gate = anyio.Event()
+        finished = []
+
+        async def compute():
+            await gate.wait()
+            finished.append(True)
+            return make_response(b"[1]")
+
+        result = []
+
+        async def leader():
+            result.append(await flight.do("k", compute))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(leader)
+            await anyio.wait_all_tasks_blocked()
+            with anyio.move_on_after(0.01):
+                await flight.do("k", compute)
+            gate.set()
+
+        assert finished == [True]
+        assert result[0].body == b"[1]"
+
+    async def test_cancelled_leader_still_completes(self):
+        flight = SingleFlight()
+        gate = anyio.Event()
+
+        async def compute():
+            await gate.wait()
+            return make_response(b"[1]")
+
+        leader_scope = anyio.CancelScope()
+        waiter_result = []
+
+        async def leader():
+            with leader_scope:
+                await flight.do("k", compute)
+
+        async def waiter():
+            waiter_result.append(await flight.do("k", compute))
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(leader)
+            await anyio.wait_all_tasks_blocked()
+            tg.start_soon(waiter)
+            await anyio.wait_all_tasks_blocked()
+            leader_scope.cancel()
+            await anyio.wait_all_tasks_blocked()
+            gate.set()
+
+        assert waiter_result[0].body == b"[1]"
+
+    async def test_errors_shared(self):
+        flight = SingleFlight()
+
+        async def compute():
+            await anyio.sleep(0.01)
+            raise HTTPException(404, "gone")
+
+        errors = []
+
+        async def run():
+            try:
+                await flight.do("k", compute)
+            except HTTPException as exc:
+                errors.append(exc.status_code)
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(run)
+
+        assert errors == [404, 404, 404]
+
+
+@pytest.fixture
+def calls():
+    return {"n": 0}
+
+
+@pytest.fixture
+def app(calls):
+    app = Oberoon()
+
+    @app.route("/books/{book_id:int}", methods=["GET", "POST"], coalesce=True)
+    async def get_book(request: Request, book_id: int) -> dict:
+        calls["n"] += 1
+        await anyio.sleep(0.02)
+        return {"id": book_id, "call": calls["n"]}
+
+    @app.get("/me", coalesce=True, coalesce_vary=["Authorization"])
+    async def me(request: Request) -> dict:
+        calls["n"] += 1
+        await anyio.sleep(0.02)
+        return {"user": request.headers.get("authorization", "")}
+
+    @app.get("/tagged", coalesce=True, etag=True)
+    async def tagged(request: Request) -> dict:
+        calls["n"] += 1
+        await anyio.sleep(0.02)
+        return {"tagged": True}
+
+    return app
+
+
+async def burst(app, requests):
+    transport = httpx.ASGITransport(app=app)
+    responses = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+
+        async def one(method, url, headers):
+            responses.append(await c.request(method, url, headers=headers))
+
+        async with anyio.create_task_group() as tg:
+            for method, url, headers in requests:
+                tg.start_soon(one, method, url, headers)
+    return responses
+
+
+class TestCoalesceRoute:
+    async def test_identical_gets_share_execution(self, app, calls):
+        responses = await burst(app, [("GET", "/books/1", {})] * 10)
+        assert calls["n"] == 1
+        assert {r.content for r in responses} == {b'{"id":1,"call":1}'}
+        assert all(r.headers["content-type"] == "application/json" for r in responses)
+
+    async def test_different_query_not_shared(self, app, calls):
+        await burst(app, [("GET", "/books/1?a=1", {}), ("GET", "/books/1?a=2", {})])
+        assert calls["n"] == 2
+
+    async def test_post_not_coalesced(self, app, calls):
+        await burst(app, [("POST", "/books/1", {})] * 3)
+        assert calls["n"] == 3
+
+    async def test_vary_headers_split_flights(self, app, calls):
+        responses = await burst(
+            app,
+            [
+                ("GET", "/me", {"authorization": "alice"}),
+                ("GET", "/me", {"authorization": "bob"}),
+                ("GET", "/me", {"authorization": "alice"}),
+            ],
+        )
+        assert calls["n"] == 2
+        assert sorted(r.json()["user"] for r in responses) == ["alice", "alice", "bob"]
+
+    async def test_conditional_waiters_decide_304_each(self, app, calls):
+        etag = (await burst(app, [("GET", "/tagged", {})]))[0].headers["etag"]
+        calls["n"] = 0
+
+        responses = await burst(
+            app,
+            [
+                ("GET", "/tagged", {"if-none-match": etag}),
+                ("GET", "/tagged", {}),
+                ("GET", "/tagged", {"if-none-match": etag}),
+                ("GET", "/tagged", {}),
+            ],
+        )
+        assert calls["n"] == 1
+        by_status = sorted((r.status_code, r.content) for r in responses)
+        assert by_status == [
+            (200, b'{"tagged":true}'),
+            (200, b'{"tagged":true}'),
+            (304, b""),
+            (304, b""),
+        ]
@@ -0,0 +1,168 @@
+"""Tests for ETag generation and conditional GET (304 Not Modified)."""
+
+import httpx
+import pytest
+
+from oberoon import Oberoon, Request, Response, cache
+from oberoon.conditional import etag_matches, format_etag, weak_etag
+
+pytestmark = pytest.mark.anyio
+
+
+class TestHelpers:
+    def test_weak_etag_is_stable(self):
+        assert weak_etag(b"[1,2]") == weak_etag(b"[1,2]")
+        assert weak_etag(b"[1,2]") != weak_etag(b"[1,3]")
+        assert weak_etag(b"").startswith('W/"')
+
+    def test_format_etag(self):
+        assert format_etag("v3") == 'W/"v3"'
+        assert format_etag('"strong"') == '"strong"'
+        assert format_etag('W/"v3"') == 'W/"v3"'
+
+    def test_etag_matches_weak_comparison(self):
+        assert etag_matches('W/"a"', '"a"')
+        assert etag_matches('"b", W/"a"', 'W/"a"')
+        assert etag_matches("*", 'W/"a"')
+        assert not etag_matches('"b"', 'W/"a"')
+
+
+@pytest.fixture
+def calls():
+    return {"books": 0, "versioned": 0, "cached": 0}
+
+
+@pytest.fixture
+def app(calls):
+    app = Oberoon()
+    state = {"version": 1}
+
+    @app.get("/books", etag=True)
+    async def list_books(request: Request) -> list[dict]:
+        calls["books"] += 1
+        return [{"id": 1}]
+
+    @app.get("/versioned", etag=lambda request, params: f"v{state['version']}")
+    async def versioned(request: Request) -> dict:
+        calls["versioned"] += 1
+        return {"version": state["version"]}
+
+    @app.post("/bump")
+    async def bump(request: Request) -> None:
+        state["version"] += 1
+
+    async def async_version(request, params):
+        return "async-v1"
+
+    @app.get("/async-versioned", etag=async_version)
+    async def async_versioned(request: Request) -> dict:
+        return {}
+
+    @app.get("/dated", etag=True)
+    async def dated(request: Request) -> Response:
+        response = Response(200)
+        response.set_body(b"{}", "application/json")
+        response.headers["last-modified"] = "Wed, 21 Oct 2026 07:28:00 GMT"
+        response.headers["cache-control"] = "max-age=60"
+        return response
+
+    @app.get("/cached", etag=True)
+    @cache(ttl=60)
+    async def cached(request: Request) -> dict:
+        calls["cached"] += 1
+        return {"cached": True}
+
+    @app.get("/plain")
+    async def plain(request: Request) -> dict:
+        return {}
+
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestAutomaticETag:
+    async def test_etag_header_added(self, client):
+        resp = await client.get("/books")
+        assert resp.headers["etag"] == weak_etag(resp.content)
+
+    async def test_matching_if_none_match_returns_304(self, client):
+        etag = (await client.get("/books")).headers["etag"]
+        resp = await client.get("/books", headers={"if-none-match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+        assert "content-type" not in resp.headers
+
+    async def test_stale_if_none_match_returns_full_body(self, client):
+        resp = await client.get("/books", headers={"if-none-match": 'W/"stale"'})
+        assert resp.status_code == 200
+        assert resp.json() == [{"id": 1}]
+
+    async def test_routes_without_option_untouched(self, client):
+        resp = await client.get("/plain", headers={"if-none-match": "*"})
+        assert resp.status_code == 200
+        assert "etag" not in resp.headers
+
+    async def test_etag_stored_with_cached_response(self, client, calls):
+        etag = (await client.get("/cached")).headers["etag"]
+        resp = await client.get("/cached", headers={"if-none-match": etag})
+        assert resp.status_code == 304
+        assert calls["cached"] == 1
+
+
+class TestVersionTag:
+    async def test_304_skips_handler(self, client, calls):
+        first = await client.get("/versioned")
+        assert first.headers["etag"] == 'W/"v1"'
+        resp = await client.get("/versioned", headers={"if-none-match": 'W/"v1"'})
+        assert resp.status_code == 304
+        assert calls["versioned"] == 1
+
+    async def test_new_version_runs_handler(self, client, calls):
+        await client.post("/bump")
+        resp = await client.get("/versioned", headers={"if-none-match": 'W/"v1"'})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] == 'W/"v2"'
+        assert resp.json() == {"version": 2}
+
+    async def test_async_version_function(self, client):
+        resp = await client.get(
+            "/async-versioned", headers={"if-none-match": 'W/"async-v1"'}
+        )
+        assert resp.status_code == 304
+
+
+class TestIfModifiedSince:
+    async def test_not_modified_since(self, client):
+        resp = await client.get(
+            "/dated", headers={"if-modified-since": "Thu, 22 Oct 2026 00:00:00 GMT"}
+        )
+        assert resp.status_code == 304
+        assert resp.headers["last-modified"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+        assert resp.headers["cache-control"] == "max-age=60"
+
+    async def test_modified_since(self, client):
+        resp = await client.get(
+            "/dated", headers={"if-modified-since": "Tue, 20 Oct 2026 00:00:00 GMT"}
+        )
+        assert resp.status_code == 200
+
+    async def test_if_none_match_takes_precedence(self, client):
+        resp = await client.get(
+            "/dated",
+            headers={
+                "if-none-match": 'W/"other"',
+                "if-modified-since": "Thu, 22 Oct 2026 00:00:00 GMT",
+            },
+        )
+        assert resp.status_code == 200
+
+    async def test_invalid_date_ignored(self, client):
+        resp = await client.get("/dated", headers={"if-modified-since": "yesterday"})
+        assert resp.status_code == 200
@@ -4,6 +4,7 @@ import httpx
 import pytest
 
 from oberoon import Oberoon, HTTPException, Request, JSONResponse
+from oberoon.exceptions import NotFoundException, debug_error_handler
 
 pytestmark = pytest.mark.anyio
 
@@ -111,3 +112,124 @@ class TestCustomExceptionHandler:
 
         assert resp.status_code == 503
         assert resp.json() == {"error": "Custom", "msg": "oops"}
+
+    async def test_async_handler(self):
+        app = Oberoon()
+
+        @app.exception_handler(RuntimeError)
+        async def handle_runtime(request, exc):
+            return JSONResponse({"error": "Async", "msg": str(exc)}, status_code=503)
+
+        @app.exception_handler(NotFoundException)
+        async def not_found(request, exc):
+            return JSONResponse({"error": "nowhere"}, status_code=404)
+
+        @app.get("/crash")
+        async def crash(request: Request) -> dict:
+            raise RuntimeError("oops")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            resp = await c.get("/crash")
+            missing = await c.get("/missing")
+
+        assert resp.status_code == 503
+        assert resp.json() == {"error": "Async", "msg": "oops"}
+        assert missing.json() == {"error": "nowhere"}
+
+
+class TestHandlerResolutionCache:
+    def test_resolved_once_per_class(self):
+        app = Oberoon()
+        first = app._lookup_exception_handler(NotFoundException())
+        assert app._exception_handler_cache == {NotFoundException: first}
+        assert app._lookup_exception_handler(NotFoundException()) is first
+
+    def test_registration_invalidates(self):
+        app = Oberoon()
+        assert app._lookup_exception_handler(KeyError()) == (
+            app.error_responses.error_handler
+        )
+
+        @app.exception_handler(LookupError)
+        def lookup(request, exc):
+            return JSONResponse({}, status_code=400)
+
+        assert app._lookup_exception_handler(KeyError()) is lookup
+        assert app._lookup_exception_handler(NotFoundException()) == (
+            app.error_responses.http_handler
+        )
+
+    def test_debug_read_at_call_time(self):
+        app = Oberoon()
+        assert app._lookup_exception_handler(RuntimeError()) == (
+            app.error_responses.error_handler
+        )
+        app.debug = True
+        assert app._lookup_exception_handler(RuntimeError()) is debug_error_handler
+
+
+class TestPrebuiltErrorResponses:
+    async def send_messages(self, response):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        await response.send(send)
+        return messages
+
+    async def test_shared_bytes(self):
+        app = Oberoon()
+        handler = app._lookup_exception_handler(NotFoundException())
+        first = await self.send_messages(handler(None, NotFoundException()))
+        second = await self.send_messages(handler(None, NotFoundException()))
+        assert first[0]["status"] == 404
+        assert first[0]["headers"] == ((b"content-type", b"application/json"),)
+        assert first[0]["headers"] is second[0]["headers"]
+        assert first[1]["body"] == b'{"error":"Not Found"}'
+        assert first[1]["body"] is second[1]["body"]
+
+    async def test_mutated_headers_are_private(self):
+        app = Oberoon()
+        handler = app._lookup_exception_handler(NotFoundException())
+        response = handler(None, NotFoundException())
+        response.headers["x-extra"] = "1"
+        messages = await self.send_messages(response)
+        assert (b"x-extra", b"1") in messages[0]["headers"]
+        clean = await self.send_messages(handler(None, NotFoundException()))
+        assert len(clean[0]["headers"]) == 1
+
+    async def test_custom_detail_and_headers_not_prebuilt(self):
+        app = Oberoon()
+
+        @app.get("/books/{book_id:int}")
+        async def get_book(request: Request, book_id: int) -> dict:
+            raise HTTPException(404, "Book not found", headers={"x-id": "1"})
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            resp = await c.get("/books/1")
+        assert resp.json() == {"error": "Book not found"}
+        assert resp.headers["x-id"] == "1"
+
+    async def test_override_prebuilt_body(self):
+        app = Oberoon()
+        app.error_responses.set(404, b"<h1>Nothing here</h1>", "text/html")
+        app.error_responses.set(500, b"oops", "text/plain")
+
+        @app.get("/crash")
+        async def crash(request: Request) -> dict:
+            raise RuntimeError("boom")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            missing = await c.get("/missing")
+            crashed = await c.get("/crash")
+        assert missing.status_code == 404
+        assert missing.text == "<h1>Nothing here</h1>"
+        assert missing.headers["content-type"] == "text/html"
+        assert (crashed.status_code, crashed.text) == (500, "oops")
+
+        with pytest.raises(ValueError):
+            app.error_responses.set(418, b"", "text/plain")
@@ -6,6 +6,7 @@ import httpx
 import pytest
 
 from oberoon import Oberoon, Header, Request
+from oberoon.serialization import inspect_handler_signature
 
 pytestmark = pytest.mark.anyio
 
@@ -39,6 +40,14 @@ def app():
     ) -> dict:
         return {"auth": authorization, "id": x_request_id}
 
+    @app.get("/alias")
+    async def alias(
+        request: Request,
+        request_id: Annotated[str, Header(alias="X-Request-ID")] = "",
+        retries: Annotated[int, Header(alias="X-Retries", ge=0)] = 0,
+    ) -> dict:
+        return {"id": request_id, "retries": retries}
+
     return app
 
 
@@ -82,3 +91,38 @@ class TestHeaderParams:
         )
         assert resp.status_code == 200
         assert resp.json() == {"auth": "Bearer xyz", "id": "req-1"}
+
+    async def test_alias(self, client):
+        resp = await client.get(
+            "/alias", headers={"x-request-id": "r-9", "X-Retries": "2"}
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"id": "r-9", "retries": 2}
+
+    async def test_alias_replaces_derived_name(self, client):
+        resp = await client.get("/alias", headers={"request-id": "nope"})
+        assert resp.json() == {"id": "", "retries": 0}
+
+    async def test_alias_constraints(self, client):
+        resp = await client.get("/alias", headers={"x-retries": "-1"})
+        assert resp.status_code == 422
+
+
+class TestHeaderMarker:
+    def test_header_names_stored_at_registration(self, app):
+        route = next(r for r in app._routes if r.path == "/alias")
+        assert route.header_names == [b"x-request-id", b"x-retries"]
+
+    def test_derived_names(self):
+        async def handler(
+            request: Request, x_request_id: Annotated[str, Header()]
+        ) -> dict: ...
+
+        meta = inspect_handler_signature(handler, set())
+        assert meta.header_names == [b"x-request-id"]
+
+    def test_repr(self):
+        assert repr(Header()) == "Header()"
+        assert repr(Header(alias="X-Id", min_length=1)) == (
+            "Header(alias='X-Id', min_length=1)"
+        )
@@ -0,0 +1,70 @@
+"""Tests for the per-route invoker closures."""
+
+from typing import Annotated
+
+import pytest
+
+from oberoon import BackgroundTasks, Header, Oberoon, Query, Request
+from oberoon.testing import AsyncTestClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def app():
+    app = Oberoon()
+
+    @app.get("/plain")
+    async def plain(request: Request) -> dict:
+        return {"plain": True}
+
+    @app.get("/users/{name}/posts/{post_id:int}")
+    async def post(request: Request, name: str, post_id: int) -> dict:
+        return {"name": name, "post_id": post_id}
+
+    @app.get("/search")
+    async def search(
+        request: Request,
+        q: Annotated[str, Query()],
+        x_token: Annotated[str, Header()] = "",
+    ) -> dict:
+        return {"q": q, "token": x_token}
+
+    @app.post("/jobs")
+    async def jobs(request: Request, tasks: BackgroundTasks) -> None:
+        tasks.add_task(lambda: None)
+
+    return app
+
+
+def test_each_prepared_route_gets_an_invoker(app):
+    assert all(route.invoke is not None for route in app._routes)
+    # Routes needing different steps get different closures
+    names = {route.invoke.__qualname__ for route in app._routes}
+    assert "_direct_invoker.<locals>.invoke" in names
+    assert "compose_invoker.<locals>.invoke" in names
+
+
+def test_lazy_routes_have_no_invoker_until_matched():
+    app = Oberoon(route_loading="lazy")
+
+    @app.get("/plain")
+    async def plain(request: Request) -> dict:
+        return {}
+
+    assert app._routes[0].invoke is None
+
+
+async def test_steps(app):
+    async with AsyncTestClient(app) as client:
+        assert (await client.get("/plain")).json() == {"plain": True}
+        assert (await client.get("/users/ann/posts/7")).json() == {
+            "name": "ann",
+            "post_id": 7,
+        }
+        response = await client.get(
+            "/search", params={"q": "x"}, headers={"x-token": "t"}
+        )
+        assert response.json() == {"q": "x", "token": "t"}
+        assert (await client.get("/search")).status_code == 422
+        assert (await client.post("/jobs")).status_code == 204
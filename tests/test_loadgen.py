@@ -0,0 +1,198 @@
+"""Tests for the load generator behind ``oberoon bench``."""
+
+import json
+import logging
+
+import anyio
+import pytest
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+from oberoon import Oberoon, Request
+from oberoon.cli import main
+from oberoon.loadgen import (
+    LatencyHistogram,
+    ScenarioRequest,
+    load_scenario,
+    run_in_process,
+    run_over_socket,
+)
+
+bench_app = Oberoon()
+
+
+@bench_app.get("/ping")
+async def ping(request: Request) -> dict:
+    return {"ok": True}
+
+
+@bench_app.post("/echo")
+async def echo(request: Request) -> dict:
+    return await request.json()
+
+
+class TestHistogram:
+    def test_small_values_exact(self):
+        hist = LatencyHistogram()
+        for value in range(1, 101):
+            hist.record(value)
+        assert hist.percentile(50) == 50
+        assert hist.percentile(99) == 99
+        assert hist.percentile(100) == 100
+        assert hist.max == 100
+
+    def test_relative_error_bounded(self):
+        hist = LatencyHistogram()
+        for value in (1_000, 123_456, 9_876_543):
+            hist.record(value)
+        for q, expected in ((33, 1_000), (66, 123_456), (100, 9_876_543)):
+            assert abs(hist.percentile(q) - expected) / expected < 0.02
+
+    def test_bucket_bounds_round_trip(self):
+        for value in (0, 127, 128, 255, 256, 1_000, 65_535, 10**7):
+            index = LatencyHistogram._index(value)
+            assert LatencyHistogram._lowest(index) <= value
+            assert value <= LatencyHistogram._highest(index)
+
+    def test_distribution_ends_at_max(self):
+        hist = LatencyHistogram()
+        for value in range(1000):
+            hist.record(value)
+        rows = hist.distribution()
+        assert rows[0][1] == 0
+        assert rows[-1] == (999, 100.0, 1000)
+        assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0
+
+
+class TestScenario:
+    def test_load(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_text(
+            '# comment\n{"path": "/ping"}\n\n{"method": "POST", "path": "/echo", "json": {"a": 1}, "weight": 3}\n'
+        )
+        scenario = load_scenario(path)
+        assert [r.path for r in scenario] == ["/ping", "/echo"]
+        assert scenario[1].weight == 3
+
+    def test_unknown_field(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_text('{"path": "/ping", "verb": "GET"}\n')
+        with pytest.raises(ValueError, match="s.jsonl:1"):
+            load_scenario(path)
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "s.jsonl"
+        path.write_text("\n")
+        with pytest.raises(ValueError, match="empty"):
+            load_scenario(path)
+
+
+@pytest.mark.anyio
+class TestRunners:
+    async def test_in_process(self):
+        scenario = [
+            ScenarioRequest("/ping", expect=200, weight=3),
+            ScenarioRequest("/echo", method="POST", json={"a": 1}, expect=200),
+            ScenarioRequest("/missing", expect=200),
+        ]
+        result = await run_in_process(bench_app, scenario, total=50, concurrency=8)
+        assert result.requests == 50
+        assert result.statuses[404] == 10
+        assert result.unexpected == 10
+        assert result.histogram.count == 50
+
+    async def test_over_socket(self):
+        seen = []
+
+        async def handle(stream):
+            reader = BufferedByteReceiveStream(stream)
+            async with stream:
+                try:
+                    while True:
+                        head = await reader.receive_until(b"\r\n\r\n", 65536)
+                        seen.append(head.split(b"\r\n")[0])
+                        if head.startswith(b"GET /chunked"):
+                            await stream.send(
+                                b"HTTP/1.1 200 OK\r\ntransfer-encoding: chunked\r\n\r\n"
+                                b"3\r\nabc\r\n0\r\n\r\n"
+                            )
+                        else:
+                            await stream.send(
+                                b"HTTP/1.1 201 Created\r\ncontent-length: 2\r\n\r\nok"
+                            )
+                except (anyio.EndOfStream, anyio.IncompleteRead):
+                    pass
+
+        listener = await anyio.create_tcp_listener(local_host="127.0.0.1")
+        port = listener.extra(anyio.abc.SocketAttribute.local_port)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(listener.serve, handle)
+            scenario = [
+                ScenarioRequest("/chunked", expect=200),
+                ScenarioRequest("/items", params={"q": "x"}, expect=201),
+            ]
+            result = await run_over_socket(
+                f"http://127.0.0.1:{port}", scenario, total=20, concurrency=4
+            )
+            tg.cancel_scope.cancel()
+
+        assert dict(result.statuses) == {200: 10, 201: 10}
+        assert result.unexpected == 0
+        assert not result.errors
+        assert b"GET /items?q=x HTTP/1.1" in seen
+
+    async def test_connection_refused_counts_errors(self):
+        listener = await anyio.create_tcp_listener(local_host="127.0.0.1")
+        port = listener.extra(anyio.abc.SocketAttribute.local_port)
+        await listener.aclose()
+        result = await run_over_socket(
+            f"http://127.0.0.1:{port}", [ScenarioRequest("/")], total=5, concurrency=1
+        )
+        assert result.requests == 0
+        assert sum(result.errors.values()) == 5
+
+
+class TestCli:
+    @pytest.fixture(autouse=True)
+    def restore_log_level(self):
+        logger = logging.getLogger("oberoon")
+        level = logger.level
+        yield
+        logger.setLevel(level)
+
+    def test_bench_in_process(self, tmp_path, capsys):
+        scenario = tmp_path / "s.jsonl"
+        scenario.write_text('{"path": "/ping", "expect": 200}\n')
+        out = tmp_path / "out.json"
+        code = main(
+            [
+                "bench",
+                "tests.test_loadgen:bench_app",
+                str(scenario),
+                "-n",
+                "100",
+                "-c",
+                "10",
+                "--json",
+                str(out),
+            ]
+        )
+        assert code == 0
+        assert "Throughput" in capsys.readouterr().out
+        report = json.loads(out.read_text())
+        assert report["requests"] == 100
+        assert report["statuses"] == {"200": 100}
+
+    def test_bench_unexpected_status_fails(self, tmp_path, capsys):
+        scenario = tmp_path / "s.jsonl"
+        scenario.write_text('{"path": "/nope", "expect": 200}\n')
+        code = main(["bench", "tests.test_loadgen:bench_app", str(scenario), "-n", "5"])
+        assert code == 1
+
+    def test_bad_import_string(self, tmp_path):
+        scenario = tmp_path / "s.jsonl"
+        scenario.write_text('{"path": "/"}\n')
+        with pytest.raises(ImportError, match="module:attribute"):
+            main(["bench", "tests.test_loadgen", str(scenario)])
@@ -0,0 +1,118 @@
+"""Tests for per-route metrics and the Prometheus endpoint."""
+
+import httpx
+import pytest
+
+from oberoon import HTTPException, Oberoon, Request, Router
+from oberoon.metrics import BUCKETS, Metrics
+
+pytestmark = pytest.mark.anyio
+
+
+def parse(text: str) -> dict[str, float]:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetricsRegistry:
+    def test_status_classes(self):
+        metrics = Metrics()
+        metrics.observe("/a", "GET", 200, 0.001)
+        metrics.observe("/a", "GET", 204, 0.001)
+        metrics.observe("/a", "GET", 404, 0.001)
+        metrics.observe("/a", "GET", 503, 0.001)
+        samples = parse(metrics.render().decode())
+        base = 'oberoon_requests_total{method="GET",route="/a",status='
+        assert samples[base + '"2xx"}'] == 2
+        assert samples[base + '"4xx"}'] == 1
+        assert samples[base + '"5xx"}'] == 1
+        assert base + '"3xx"}' not in samples
+
+    def test_histogram_is_cumulative(self):
+        metrics = Metrics()
+        metrics.observe("/a", "GET", 200, 0.00005)
+        metrics.observe("/a", "GET", 200, 0.003)
+        metrics.observe("/a", "GET", 200, 100.0)
+        samples = parse(metrics.render().decode())
+        bucket = 'oberoon_request_duration_seconds_bucket{method="GET",route="/a",le='
+        assert samples[bucket + '"0.0001"}'] == 1
+        assert samples[bucket + '"0.0032"}'] == 2
+        assert samples[bucket + f'"{BUCKETS[-1]!r}"}}'] == 2
+        assert samples[bucket + '"+Inf"}'] == 3
+        labels = '{method="GET",route="/a"}'
+        assert samples["oberoon_request_duration_seconds_count" + labels] == 3
+        assert samples["oberoon_request_duration_seconds_sum" + labels] == (
+            pytest.approx(100.00305)
+        )
+
+    def test_label_values_escaped(self):
+        metrics = Metrics()
+        metrics.observe('/a"b\\c', "GET", 200, 0.001)
+        assert b'route="/a\\"b\\\\c"' in metrics.render()
+
+    def test_namespace(self):
+        metrics = Metrics(namespace="bookstore")
+        metrics.observe("/a", "GET", 200, 0.001)
+        assert b"bookstore_requests_total" in metrics.render()
+
+
+@pytest.fixture
+def app():
+    app = Oberoon(metrics=True)
+
+    @app.get("/books/{book_id:int}")
+    async def get_book(request: Request, book_id: int) -> dict:
+        if book_id == 0:
+            raise HTTPException(404, "missing")
+        return {"id": book_id}
+
+    api = Router(prefix="/api")
+
+    @api.post("/items")
+    async def create_item(request: Request) -> dict:
+        return {}
+
+    app.include_router(api)
+    app.mount_metrics("/metrics")
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestMetricsEndpoint:
+    async def test_labelled_by_route_template(self, client):
+        await client.get("/books/1")
+        await client.get("/books/2")
+        await client.get("/books/0")
+        await client.post("/api/items")
+        resp = await client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+        samples = parse(resp.text)
+        book = 'method="GET",route="/books/{book_id:int}"'
+        assert samples[f'oberoon_requests_total{{{book},status="2xx"}}'] == 2
+        assert samples[f'oberoon_requests_total{{{book},status="4xx"}}'] == 1
+        assert samples[f"oberoon_request_duration_seconds_count{{{book}}}"] == 3
+        item = 'method="POST",route="/api/items"'
+        assert samples[f'oberoon_requests_total{{{item},status="2xx"}}'] == 1
+        assert "/books/1" not in resp.text
+
+    async def test_unmatched_paths_grouped(self, client):
+        await client.get("/wp-admin")
+        await client.get("/.env")
+        samples = parse((await client.get("/metrics")).text)
+        key = 'oberoon_requests_total{method="GET",route="<unmatched>",status="4xx"}'
+        assert samples[key] == 2
+
+    async def test_disabled_by_default(self):
+        assert Oberoon().metrics is None
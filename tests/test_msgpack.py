@@ -0,0 +1,147 @@
+"""Tests for MessagePack request and response body negotiation."""
+
+import msgspec
+import pytest
+
+from oberoon import BaseModel, Oberoon, Request, cache
+from oberoon.negotiation import prefers_msgpack
+from oberoon.testing import AsyncTestClient
+
+pytestmark = pytest.mark.anyio
+
+MSGPACK = {"accept": "application/msgpack"}
+
+
+class CreateUser(BaseModel):
+    name: str
+    age: int = 0
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    age: int
+
+
+@pytest.fixture
+def app():
+    app = Oberoon()
+
+    @app.get("/users/{user_id:int}")
+    async def get_user(request: Request, user_id: int) -> User:
+        return User(id=user_id, name="Alice", age=30)
+
+    @app.get("/plain")
+    async def plain(request: Request) -> dict:
+        return {"ok": True}
+
+    @app.post("/users")
+    async def create_user(request: Request, body: CreateUser) -> User:
+        return User(id=1, name=body.name, age=body.age)
+
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    async with AsyncTestClient(app) as client:
+        yield client
+
+
+class TestAccept:
+    @pytest.mark.parametrize(
+        "accept, expected",
+        [
+            (b"application/msgpack", True),
+            (b"application/x-msgpack", True),
+            (b"application/msgpack, application/json;q=0.5", True),
+            (b"application/json, application/msgpack", False),
+            (b"application/msgpack;q=0.5, application/json", False),
+            (b"application/msgpack;q=0.5, */*;q=0.1", True),
+            (b"*/*", False),
+            (b"application/*", False),
+            (b"text/html", False),
+        ],
+    )
+    def test_prefers_msgpack(self, accept, expected):
+        assert prefers_msgpack(accept) is expected
+
+
+class TestResponses:
+    async def test_json_by_default(self, client):
+        response = await client.get("/users/1")
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["vary"] == "accept"
+        assert response.json() == {"id": 1, "name": "Alice", "age": 30}
+
+    async def test_msgpack_when_accepted(self, client):
+        response = await client.get("/users/2", headers=MSGPACK)
+        assert response.headers["content-type"] == "application/msgpack"
+        assert response.headers["vary"] == "accept"
+        assert msgspec.msgpack.decode(response.content) == {
+            "id": 2,
+            "name": "Alice",
+            "age": 30,
+        }
+
+    async def test_route_without_params(self, client):
+        response = await client.get("/plain", headers=MSGPACK)
+        assert msgspec.msgpack.decode(response.content) == {"ok": True}
+
+    async def test_errors_stay_json(self, client):
+        response = await client.get("/missing", headers=MSGPACK)
+        assert response.status_code == 404
+        assert response.headers["content-type"] == "application/json"
+
+
+class TestRequestBodies:
+    async def test_msgpack_body(self, client):
+        response = await client.post(
+            "/users",
+            content=msgspec.msgpack.encode({"name": "Bob", "age": 7}),
+            headers={"content-type": "application/msgpack", **MSGPACK},
+        )
+        assert response.status_code == 200
+        assert msgspec.msgpack.decode(response.content)["name"] == "Bob"
+
+    async def test_msgpack_body_json_response(self, client):
+        response = await client.post(
+            "/users",
+            content=msgspec.msgpack.encode({"name": "Bob"}),
+            headers={"content-type": "application/msgpack"},
+        )
+        assert response.json() == {"id": 1, "name": "Bob", "age": 0}
+
+    async def test_invalid_msgpack_body(self, client):
+        response = await client.post(
+            "/users",
+            content=msgspec.msgpack.encode({"age": "old"}),
+            headers={"content-type": "application/msgpack"},
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body"]
+
+    async def test_json_body_still_default(self, client):
+        response = await client.post("/users", json={"name": "Carol"})
+        assert response.json()["name"] == "Carol"
+
+
+async def test_cache_keeps_formats_apart():
+    app = Oberoon()
+    calls = []
+
+    @app.get("/cached")
+    @cache(ttl=60)
+    async def cached(request: Request) -> dict:
+        calls.append(1)
+        return {"n": len(calls)}
+
+    async with AsyncTestClient(app) as client:
+        first = await client.get("/cached")
+        packed = await client.get("/cached", headers=MSGPACK)
+        again = await client.get("/cached", headers=MSGPACK)
+
+    assert first.json() == {"n": 1}
+    assert msgspec.msgpack.decode(packed.content) == {"n": 2}
+    assert again.content == packed.content
+    assert packed.headers["content-type"] == "application/msgpack"
@@ -0,0 +1,209 @@
+"""Tests for OpenAPI generation and the /openapi.json and /docs endpoints."""
+
+from typing import Annotated
+
+import msgspec
+import pytest
+
+from oberoon import BaseModel, Field, Header, Oberoon, Query, Request, Response, Router
+from oberoon.exceptions import ValidationError, default_validation_handler
+from oberoon.schema import build_openapi, openapi_path
+from oberoon.testing import AsyncTestClient
+
+pytestmark = pytest.mark.anyio
+
+
+class Book(BaseModel):
+    id: int
+    title: Annotated[str, Field(min_length=1)]
+
+
+class NewBook(BaseModel):
+    title: str
+
+
+@pytest.fixture
+def app():
+    app = Oberoon(title="Bookstore")
+    books = Router(prefix="/books")
+
+    @books.get("/")
+    async def list_books(
+        request: Request,
+        q: Annotated[str, Query(min_length=1)],
+        page: Annotated[int, Query(ge=1)] = 1,
+    ) -> list[Book]:
+        """List books.
+
+        Filtered by title.
+        """
+        return []
+
+    @books.get("/{book_id:int}")
+    async def get_book(request: Request, book_id: int) -> Book:
+        return Book(id=book_id, title="x")
+
+    @books.post("/")
+    async def create_book(
+        request: Request, body: NewBook, x_request_id: Annotated[str, Header()] = ""
+    ) -> Book:
+        return Book(id=1, title=body.title)
+
+    @books.delete("/{book_id:int}")
+    async def delete_book(request: Request, book_id: int) -> None:
+        pass
+
+    @app.get("/raw")
+    async def raw(request: Request) -> Response:
+        return Response(200)
+
+    app.include_router(books, prefix="/api")
+    app.mount_openapi()
+    app.mount_metrics()
+    return app
+
+
+def test_openapi_path():
+    assert openapi_path("/books/{book_id:int}") == "/books/{book_id}"
+    assert openapi_path("/files/{rest:path}/{name}") == "/files/{rest}/{name}"
+
+
+class TestDocument:
+    def test_paths_and_operations(self, app):
+        doc = app.openapi.document
+        assert doc["openapi"] == "3.1.0"
+        assert doc["info"] == {"title": "Bookstore", "version": "0.1.0"}
+        assert set(doc["paths"]) == {
+            "/api/books/",
+            "/api/books/{book_id}",
+            "/raw",
+        }
+        assert set(doc["paths"]["/api/books/"]) == {"get", "post"}
+        assert set(doc["paths"]["/api/books/{book_id}"]) == {"get", "delete"}
+
+    def test_query_parameters(self, app):
+        op = app.openapi.document["paths"]["/api/books/"]["get"]
+        assert op["operationId"] == "list_books_get"
+        assert op["summary"] == "List books."
+        assert op["description"] == "Filtered by title."
+        q, page = op["parameters"]
+        assert q == {
+            "name": "q",
+            "in": "query",
+            "required": True,
+            "schema": {"type": "string", "minLength": 1},
+        }
+        assert page["required"] is False
+        assert page["schema"] == {"type": "integer", "minimum": 1, "default": 1}
+        assert "422" in op["responses"]
+
+    def test_validation_error_schema_matches_handler(self, app):
+        op = app.openapi.document["paths"]["/api/books/"]["get"]
+        content = op["responses"]["422"]["content"]["application/json"]
+        properties = content["schema"]["properties"]
+
+        exc = ValidationError(errors=[{"loc": ["query"], "msg": "bad"}])
+        body = msgspec.json.decode(default_validation_handler(None, exc).body)
+        assert set(properties) == set(body) == {"error", "detail"}
+        assert properties["error"] == {"type": "string"}
+        assert properties["detail"]["type"] == "array"
+
+    def test_path_parameter(self, app):
+        op = app.openapi.document["paths"]["/api/books/{book_id}"]["get"]
+        assert op["parameters"] == [
+            {
+                "name": "book_id",
+                "in": "path",
+                "required": True,
+                "schema": {"type": "integer"},
+            }
+        ]
+
+    def test_body_header_and_components(self, app):
+        doc = app.openapi.document
+        op = doc["paths"]["/api/books/"]["post"]
+        assert op["requestBody"]["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/NewBook"
+        }
+        assert op["parameters"][0]["name"] == "x-request-id"
+        assert op["parameters"][0]["in"] == "header"
+        ok = op["responses"]["200"]["content"]["application/json"]["schema"]
+        assert ok == {"$ref": "#/components/schemas/Book"}
+        content = op["responses"]["200"]["content"]
+        assert content["application/msgpack"] == content["application/json"]
+        listing = doc["paths"]["/api/books/"]["get"]["responses"]["200"]
+        assert listing["content"]["application/json"]["schema"] == {
+            "type": "array",
+            "items": {"$ref": "#/components/schemas/Book"},
+        }
+        schemas = doc["components"]["schemas"]
+        assert set(schemas) == {"Book", "NewBook"}
+        assert schemas["Book"]["properties"]["title"] == {
+            "type": "string",
+            "minLength": 1,
+        }
+
+    def test_response_kinds(self, app):
+        paths = app.openapi.document["paths"]
+        assert paths["/api/books/{book_id}"]["delete"]["responses"] == {
+            "204": {"description": "No Content"},
+            "422": paths["/api/books/{book_id}"]["delete"]["responses"]["422"],
+        }
+        assert paths["/raw"]["get"]["responses"] == {
+            "200": {"description": "Successful Response"}
+        }
+
+    def test_operation_ids_are_unique(self):
+        app = Oberoon()
+        for i in range(3):
+
+            async def handler(request: Request) -> dict:
+                return {}
+
+            app.get(f"/r{i}")(handler)
+        doc = build_openapi(app._routes, "t", "1")
+        ids = [doc["paths"][f"/r{i}"]["get"]["operationId"] for i in range(3)]
+        assert ids == ["handler_get", "handler_get_2", "handler_get_3"]
+
+    def test_built_once_and_rebuilt_for_new_routes(self, app):
+        first = app.openapi.body
+        assert app.openapi.body is first
+
+        @app.get("/late")
+        async def late(request: Request) -> dict:
+            return {}
+
+        assert app.openapi.body is not first
+        assert "/late" in app.openapi.document["paths"]
+
+
+class TestEndpoints:
+    async def test_openapi_json(self, app):
+        async with AsyncTestClient(app) as client:
+            response = await client.get("/openapi.json")
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert response.content == app.openapi.body
+            assert msgspec.json.decode(response.content)["info"]["title"] == (
+                "Bookstore"
+            )
+
+            etag = response.headers["etag"]
+            cached = await client.get("/openapi.json", headers={"if-none-match": etag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+
+    async def test_docs_page(self, app):
+        async with AsyncTestClient(app, root_path="/v1") as client:
+            response = await client.get("/docs")
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/html")
+            assert '"/v1/openapi.json"' in response.text
+            assert "<title>Bookstore</title>" in response.text
+
+    async def test_docs_disabled(self):
+        app = Oberoon()
+        app.mount_openapi("/schema.json", docs_path=None)
+        async with AsyncTestClient(app) as client:
+            assert (await client.get("/schema.json")).status_code == 200
+            assert (await client.get("/docs")).status_code == 404
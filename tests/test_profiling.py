@@ -0,0 +1,123 @@
+"""Tests for on-demand per-request profiling."""
+
+import pstats
+import time
+
+import httpx
+import pytest
+
+from oberoon import Oberoon, Request
+from oberoon.profiling import (
+    RequestProfiler,
+    make_profile_token,
+    verify_profile_token,
+)
+
+pytestmark = pytest.mark.anyio
+
+SECRET = "s3cret"
+
+
+def make_app(profiler: RequestProfiler) -> Oberoon:
+    app = Oberoon(profiler=profiler)
+
+    @app.get("/items/{item_id:int}")
+    async def get_item(request: Request, item_id: int) -> dict:
+        return {"id": item_id}
+
+    @app.get("/slow")
+    async def slow(request: Request) -> dict:
+        time.sleep(0.05)
+        return {}
+
+    return app
+
+
+async def request(app, url, headers=None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        return await c.get(url, headers=headers)
+
+
+class TestTokens:
+    def test_valid_token(self):
+        assert verify_profile_token(SECRET, make_profile_token(SECRET))
+
+    def test_wrong_secret(self):
+        assert not verify_profile_token("other", make_profile_token(SECRET))
+
+    def test_expired_token(self):
+        assert not verify_profile_token(SECRET, make_profile_token(SECRET, ttl=-10))
+
+    def test_garbage(self):
+        assert not verify_profile_token(SECRET, "not-a-token")
+
+
+class TestSelection:
+    async def test_unselected_requests_write_nothing(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, secret=SECRET))
+        response = await request(app, "/items/1")
+        assert response.status_code == 200
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_signed_header(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, secret=SECRET))
+        token = make_profile_token(SECRET)
+        response = await request(app, "/items/1", {"x-oberoon-profile": token})
+        assert response.json() == {"id": 1}
+        (profile,) = tmp_path.iterdir()
+        assert profile.suffix == ".prof"
+        assert "GET-items__item_id_int" in profile.name
+
+    async def test_bad_signature_ignored(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, secret=SECRET))
+        await request(app, "/items/1", {"x-oberoon-profile": "1.abc"})
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_sample_every(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, sample_every=3))
+        for i in range(7):
+            await request(app, f"/items/{i}")
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_invalid_options(self, tmp_path):
+        with pytest.raises(ValueError):
+            RequestProfiler(tmp_path, mode="perf")
+        with pytest.raises(ValueError):
+            RequestProfiler(tmp_path, sample_every=0)
+
+
+class TestOutput:
+    async def test_pstats_contains_handler(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, sample_every=1))
+        await request(app, "/items/5")
+        (profile,) = tmp_path.iterdir()
+        stats = pstats.Stats(str(profile))
+        names = {func[2] for func in stats.stats}
+        assert "get_item" in names
+
+    async def test_collapsed_stacks(self, tmp_path):
+        profiler = RequestProfiler(
+            tmp_path, sample_every=1, mode="sampling", interval=0.002
+        )
+        await request(make_app(profiler), "/slow")
+        (profile,) = tmp_path.iterdir()
+        assert profile.suffix == ".collapsed"
+        lines = profile.read_text().splitlines()
+        assert lines
+        _, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any("slow" in line for line in lines)
+
+    async def test_rotation_keeps_newest(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, sample_every=1, max_files=3))
+        for i in range(5):
+            await request(app, f"/items/{i}")
+        assert len(list(tmp_path.iterdir())) == 3
+
+    async def test_unmatched_path_is_profiled(self, tmp_path):
+        app = make_app(RequestProfiler(tmp_path, sample_every=1))
+        response = await request(app, "/missing")
+        assert response.status_code == 404
+        (profile,) = tmp_path.iterdir()
+        assert "GET-missing" in profile.name
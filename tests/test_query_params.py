@@ -6,6 +6,8 @@ import httpx
 import pytest
 
 from oberoon import Oberoon, Query, Request
+from oberoon.requests.query import compile_query_parser, is_sequence_type
+from oberoon.serialization import _build_param_struct
 
 pytestmark = pytest.mark.anyio
 
@@ -46,6 +48,15 @@ def app():
     ) -> dict:
         return {"score": score}
 
+    @app.get("/tags")
+    async def tags(
+        request: Request,
+        tag: Annotated[list[str], Query()] = (),
+        ids: Annotated[list[int], Query(max_length=3)] = (),
+        q: Annotated[str, Query()] = "",
+    ) -> dict:
+        return {"tag": list(tag), "ids": list(ids), "q": q}
+
     return app
 
 
@@ -112,3 +123,50 @@ class TestQueryParams:
     async def test_float_constraint_violation(self, client):
         resp = await client.get("/float?score=1.5")
         assert resp.status_code == 422
+
+    async def test_repeated_keys_fill_lists(self, client):
+        resp = await client.get("/tags?tag=a&ids=1&tag=b&ids=2")
+        assert resp.status_code == 200
+        assert resp.json() == {"tag": ["a", "b"], "ids": [1, 2], "q": ""}
+
+    async def test_list_items_validated(self, client):
+        assert (await client.get("/tags?ids=1&ids=x")).status_code == 422
+        assert (await client.get("/tags?ids=1&ids=2&ids=3&ids=4")).status_code == 422
+
+    async def test_scalar_keeps_last_value(self, client):
+        resp = await client.get("/tags?q=first&q=last")
+        assert resp.json()["q"] == "last"
+
+    async def test_percent_encoding(self, client):
+        resp = await client.get("/tags?q=caf%C3%A9+au+lait&%74ag=x%26y")
+        assert resp.json() == {"tag": ["x&y"], "ids": [], "q": "café au lait"}
+
+
+class TestQueryParser:
+    def parser(self):
+        return compile_query_parser(
+            _build_param_struct(
+                "Q",
+                [
+                    ("page", int, {}, 1),
+                    ("tag", list[str], {}, []),
+                    ("flag", str, {}, ""),
+                ],
+            )
+        )
+
+    def test_ignores_undeclared_keys(self):
+        parse = self.parser()
+        assert parse(b"utm=x&page=2&other=%zz&tag=a") == {"page": "2", "tag": ["a"]}
+
+    def test_empty_and_blank_values(self):
+        parse = self.parser()
+        assert parse(b"") == {}
+        assert parse(b"flag&page=&&") == {"flag": "", "page": ""}
+
+    def test_sequence_detection(self):
+        assert is_sequence_type(list[int])
+        assert is_sequence_type(Annotated[set[str], "meta"])
+        assert is_sequence_type(list[int] | None)
+        assert not is_sequence_type(int)
+        assert not is_sequence_type(str | None)
@@ -0,0 +1,214 @@
+"""Tests for in-process rate limiting (token bucket, sliding window, decorator, middleware)."""
+
+import httpx
+import pytest
+
+from oberoon import Oberoon, RateLimitMiddleware, Request, rate_limit
+from oberoon.ratelimit import SlidingWindow, TokenBucket, header_key
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# ── Token bucket ────────────────────────────────────────────────────────────
+
+
+class TestTokenBucket:
+    def test_allows_up_to_limit(self):
+        bucket = TokenBucket(3, 60.0, clock=FakeClock())
+        results = [bucket.hit("a") for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results] == [2, 1, 0, 0]
+
+    def test_lazy_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2, 10.0, clock=clock)
+        bucket.hit("a")
+        bucket.hit("a")
+        assert not bucket.hit("a").allowed
+        clock.now += 5.0  # one token back at 0.2 tokens/s
+        assert bucket.hit("a").allowed
+        assert not bucket.hit("a").allowed
+
+    def test_retry_after_when_denied(self):
+        bucket = TokenBucket(1, 10.0, clock=FakeClock())
+        bucket.hit("a")
+        result = bucket.hit("a")
+        assert not result.allowed
+        assert result.retry_after == pytest.approx(10.0)
+
+    def test_keys_are_independent(self):
+        bucket = TokenBucket(1, 60.0, clock=FakeClock())
+        assert bucket.hit("a").allowed
+        assert bucket.hit("b").allowed
+        assert not bucket.hit("a").allowed
+
+    def test_idle_keys_evicted(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1, 1.0, clock=clock)
+        for i in range(10):
+            bucket.hit(f"client-{i}")
+        assert len(bucket) == 10
+        clock.now += 5.0
+        for _ in range(5):
+            bucket.hit("fresh")
+        assert len(bucket) == 1
+
+    def test_active_keys_not_evicted(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2, 10.0, clock=clock)
+        bucket.hit("a")
+        bucket.hit("a")
+        clock.now += 1.0
+        bucket.hit("b")
+        assert len(bucket) == 2
+        assert not bucket.hit("a").allowed
+
+    def test_max_keys_cap(self):
+        bucket = TokenBucket(1, 60.0, max_keys=3, clock=FakeClock())
+        for i in range(10):
+            bucket.hit(f"client-{i}")
+        assert len(bucket) == 3
+
+
+# ── Sliding window ──────────────────────────────────────────────────────────
+
+
+class TestSlidingWindow:
+    def test_allows_up_to_limit(self):
+        window = SlidingWindow(3, 60.0, clock=FakeClock(0.0))
+        assert [window.hit("a").allowed for _ in range(4)] == [True, True, True, False]
+
+    def test_previous_window_weighted(self):
+        clock = FakeClock(0.0)
+        window = SlidingWindow(4, 10.0, clock=clock)
+        for _ in range(4):
+            window.hit("a")
+        clock.now = 15.0  # half of the previous window still overlaps: 2 used
+        assert window.hit("a").allowed
+        assert window.hit("a").allowed
+        assert not window.hit("a").allowed
+
+    def test_non_dyadic_period_keeps_previous_window(self):
+        # 0.1 has no exact binary form: adjacency must not rely on float math
+        clock = FakeClock(123456 * 0.1 + 0.09)
+        window = SlidingWindow(3, 0.1, clock=clock)
+        assert [window.hit("a").allowed for _ in range(3)] == [True] * 3
+        clock.now = 123456 * 0.1 + 0.101
+        assert [window.hit("a").allowed for _ in range(3)] == [True, False, False]
+
+    def test_old_windows_forgotten(self):
+        clock = FakeClock(0.0)
+        window = SlidingWindow(2, 10.0, clock=clock)
+        window.hit("a")
+        window.hit("a")
+        clock.now = 25.0
+        assert window.hit("a").remaining == 1
+
+    def test_idle_keys_evicted(self):
+        clock = FakeClock(0.0)
+        window = SlidingWindow(1, 1.0, clock=clock)
+        for i in range(6):
+            window.hit(f"client-{i}")
+        clock.now = 10.0
+        for _ in range(3):
+            window.hit("fresh")
+        assert len(window) == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TokenBucket(0, 1.0)
+    with pytest.raises(ValueError):
+        SlidingWindow(1, 0)
+    with pytest.raises(ValueError):
+        rate_limit(1, algorithm="leaky")
+
+
+# ── Decorator ───────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def app():
+    app = Oberoon()
+
+    @app.get("/limited")
+    @rate_limit(2, period=60.0)
+    async def limited(request: Request) -> dict:
+        return {"ok": True}
+
+    @app.get("/per-token")
+    @rate_limit(1, period=60.0, key=header_key("authorization"))
+    async def per_token(request: Request) -> dict:
+        return {"ok": True}
+
+    @app.get("/open")
+    async def open_route(request: Request) -> dict:
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestRateLimitDecorator:
+    async def test_headers_on_success(self, client):
+        resp = await client.get("/limited")
+        assert resp.status_code == 200
+        assert resp.headers["ratelimit-limit"] == "2"
+        assert resp.headers["ratelimit-remaining"] == "1"
+        assert "ratelimit-reset" in resp.headers
+
+    async def test_429_when_exceeded(self, client):
+        await client.get("/limited")
+        await client.get("/limited")
+        resp = await client.get("/limited")
+        assert resp.status_code == 429
+        assert resp.json() == {"error": "Too Many Requests"}
+        assert resp.headers["ratelimit-remaining"] == "0"
+        assert int(resp.headers["retry-after"]) >= 1
+
+    async def test_custom_key(self, client):
+        assert (
+            await client.get("/per-token", headers={"authorization": "a"})
+        ).status_code == 200
+        assert (
+            await client.get("/per-token", headers={"authorization": "b"})
+        ).status_code == 200
+        assert (
+            await client.get("/per-token", headers={"authorization": "a"})
+        ).status_code == 429
+
+    async def test_unlimited_route_has_no_headers(self, client):
+        resp = await client.get("/open")
+        assert "ratelimit-limit" not in resp.headers
+
+
+# ── Middleware ──────────────────────────────────────────────────────────────
+
+
+class TestRateLimitMiddleware:
+    async def test_limits_every_route(self, app):
+        wrapped = RateLimitMiddleware(app, limit=2, period=60.0)
+        transport = httpx.ASGITransport(app=wrapped)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            first = await c.get("/open")
+            await c.get("/missing")
+            denied = await c.get("/open")
+
+        assert first.status_code == 200
+        assert first.headers["ratelimit-remaining"] == "1"
+        assert denied.status_code == 429
+        assert "retry-after" in denied.headers
@@ -2,6 +2,7 @@ import pytest
 import msgspec.json
 
 from oberoon.responses import Response, JSONResponse, TextResponse, HTMLResponse
+from oberoon.responses.headers import JSON_CONTENT_TYPE, MutableHeaders
 
 pytestmark = pytest.mark.anyio
 
@@ -42,6 +43,54 @@ class TestResponse:
         assert messages[0]["status"] == 201
         assert messages[1]["type"] == "http.response.body"
         assert messages[1]["body"] == b"ok"
+        assert messages[0]["headers"] is r.raw_headers
+
+    def test_slots(self):
+        for cls in (Response, JSONResponse, TextResponse, HTMLResponse):
+            assert not hasattr(cls(200) if cls is Response else cls("x"), "__dict__")
+
+    def test_set_body_replaces_content_type(self):
+        r = Response()
+        r.set_body(b"a", content_type="text/plain")
+        r.set_body(b"{}", content_type="application/json")
+        assert r.raw_headers == [JSON_CONTENT_TYPE]
+        assert r.raw_headers[0] is JSON_CONTENT_TYPE
+
+    def test_interned_content_type(self):
+        assert JSONResponse({}).raw_headers[0] is JSON_CONTENT_TYPE
+
+
+class TestMutableHeaders:
+    def test_case_insensitive(self):
+        r = Response()
+        r.headers["X-Token"] = "a"
+        assert r.headers["x-token"] == "a"
+        assert "X-TOKEN" in r.headers
+        assert r.raw_headers == [(b"x-token", b"a")]
+
+    def test_multiple_set_cookie(self):
+        r = Response()
+        r.headers.append("Set-Cookie", "a=1")
+        r.headers.append("Set-Cookie", "b=2")
+        assert r.headers.getlist("set-cookie") == ["a=1", "b=2"]
+        assert r.raw_headers == [(b"set-cookie", b"a=1"), (b"set-cookie", b"b=2")]
+
+    def test_setitem_replaces_all(self):
+        raw = [(b"a", b"1"), (b"b", b"x"), (b"a", b"2")]
+        headers = MutableHeaders(raw)
+        headers["a"] = "3"
+        assert raw == [(b"a", b"3"), (b"b", b"x")]
+
+    def test_dict_api(self):
+        r = Response()
+        r.headers.update({"etag": "v1", "vary": "accept"})
+        assert r.headers.setdefault("etag", "v2") == "v1"
+        assert r.headers.get("missing") is None
+        del r.headers["vary"]
+        assert r.headers == {"etag": "v1"}
+        assert dict(r.headers.items()) == {"etag": "v1"}
+        with pytest.raises(KeyError):
+            del r.headers["vary"]
 
 
 class TestJSONResponse:
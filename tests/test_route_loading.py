@@ -0,0 +1,158 @@
+"""Tests for lazy and startup-time route preparation."""
+
+import logging
+from typing import Annotated
+
+import pytest
+
+from oberoon import JSONResponse, Oberoon, Query, Request, Router
+from oberoon.testing import AsyncTestClient
+
+pytestmark = pytest.mark.anyio
+
+
+def build(route_loading: str) -> Oberoon:
+    app = Oberoon(route_loading=route_loading)
+
+    @app.get("/items/{item_id:int}")
+    async def get_item(
+        request: Request, item_id: int, q: Annotated[str, Query()] = ""
+    ) -> dict:
+        return {"id": item_id, "q": q}
+
+    @app.get("/other")
+    async def other(request: Request) -> dict:
+        return {}
+
+    router = Router(prefix="/api")
+
+    @router.get("/ping")
+    async def ping(request: Request) -> dict:
+        return {"pong": True}
+
+    app.include_router(router)
+    return app
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError, match="route_loading"):
+        Oberoon(route_loading="sometimes")
+
+
+def test_eager_prepares_at_registration():
+    app = build("eager")
+    assert all(route.inspected for route in app._routes)
+    assert all(route.pattern is not None for route in app._routes)
+    assert all(route.setup_time > 0 for route in app._routes)
+
+
+class TestLazy:
+    def test_nothing_prepared_at_registration(self):
+        app = build("lazy")
+        assert not any(route.inspected for route in app._routes)
+        assert all(route.pattern is None for route in app._routes)
+
+    async def test_prepared_on_first_match(self):
+        app = build("lazy")
+        items, other, ping = app._routes
+        async with AsyncTestClient(app) as client:
+            response = await client.get("/items/3", params={"q": "x"})
+            assert response.json() == {"id": 3, "q": "x"}
+
+            assert items.inspected and items.query_type is not None
+            # Later routes were neither compiled nor inspected
+            assert other.pattern is None and not other.inspected
+            assert ping.pattern is None
+
+            assert (await client.get("/api/ping")).json() == {"pong": True}
+            # Scanning past a route compiles its path but does not inspect it
+            assert other.pattern is not None and not other.inspected
+            assert ping.inspected
+
+    async def test_not_found_and_method_not_allowed(self):
+        app = build("lazy")
+        async with AsyncTestClient(app) as client:
+            assert (await client.get("/missing")).status_code == 404
+            assert (await client.post("/other")).status_code == 405
+        assert not any(route.inspected for route in app._routes)
+
+    async def test_signature_errors_handled_on_first_request(self):
+        app = Oberoon(route_loading="lazy")
+        seen = []
+
+        @app.exception_handler(TypeError)
+        def on_type_error(request: Request, exc: TypeError):
+            seen.append(str(exc))
+            return JSONResponse({"error": "bad route"}, status_code=500)
+
+        @app.get("/bad")
+        async def bad(request: Request):
+            return {}
+
+        async with AsyncTestClient(app) as client:
+            response = await client.get("/bad")
+            assert response.status_code == 500
+            assert response.json() == {"error": "bad route"}
+            assert "return type annotation" in seen[0]
+            # Still unprepared: the next request fails the same way
+            assert (await client.get("/bad")).status_code == 500
+        assert len(seen) == 2
+        assert not app._routes[0].inspected
+
+    async def test_signature_errors_default_to_500(self):
+        app = Oberoon(route_loading="lazy")
+
+        @app.get("/bad")
+        async def bad(request: Request):
+            return {}
+
+        async with AsyncTestClient(app) as client:
+            response = await client.get("/bad")
+        assert response.status_code == 500
+        assert response.json()["error"]
+
+    def test_openapi_prepares_everything(self):
+        app = build("lazy")
+        app.mount_openapi()
+        assert "/api/ping" in app.openapi.document["paths"]
+        assert all(route.inspected for route in app._routes)
+
+
+class TestStartup:
+    async def test_prepared_at_lifespan_startup(self):
+        app = build("startup")
+        assert not any(route.inspected for route in app._routes)
+        async with AsyncTestClient(app) as client:
+            assert all(route.inspected for route in app._routes)
+            assert (await client.get("/items/1")).json() == {"id": 1, "q": ""}
+
+    async def test_signature_errors_fail_startup(self):
+        app = Oberoon(route_loading="startup")
+
+        @app.get("/bad")
+        async def bad(request: Request):
+            return {}
+
+        with pytest.raises(RuntimeError, match="return type annotation"):
+            async with AsyncTestClient(app):
+                pass
+
+
+class TestReport:
+    def test_slowest_routes(self):
+        app = build("eager")
+        app._routes[1].setup_time = 10.0
+        slowest = app.slowest_routes(2)
+        assert slowest[0].path == "/other"
+        assert len(slowest) == 2
+
+    async def test_logged_at_startup(self, caplog):
+        app = build("startup")
+        with caplog.at_level(logging.INFO, logger="oberoon"):
+            async with AsyncTestClient(app):
+                pass
+        report = [
+            r.getMessage() for r in caplog.records if "prepared" in r.getMessage()
+        ]
+        assert report and report[0].startswith("prepared 3/3 routes in")
+        assert "GET /items/{item_id:int}" in report[0]
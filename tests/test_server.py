@@ -0,0 +1,478 @@
+"""Tests for the built-in asyncio HTTP/1.1 server."""
+
+import asyncio
+
+import pytest
+
+from oberoon import Oberoon, Request, Response
+from oberoon.server import Server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"  # the server is built on asyncio.Protocol
+
+
+def make_app() -> Oberoon:
+    app = Oberoon()
+
+    @app.get("/hello")
+    async def hello(request: Request) -> dict:
+        return {"hello": "world"}
+
+    @app.post("/echo")
+    async def echo(request: Request) -> Response:
+        response = Response(200)
+        response.set_body(await request.body(), content_type="text/plain")
+        return response
+
+    @app.get("/path/{name}")
+    async def path(request: Request, name: str) -> dict:
+        return {"name": name, "query": request.query_string}
+
+    return app
+
+
+async def streaming_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"hello ", "more_body": True})
+    await send({"type": "http.response.body", "body": b"world", "more_body": False})
+
+
+async def silent_app(scope, receive, send):
+    pass
+
+
+async def broken_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+async def server_factory():
+    servers = []
+
+    async def start(app, **options) -> tuple[str, int]:
+        server = Server(app, "127.0.0.1", 0, lifespan=False, **options)
+        await server.startup()
+        servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    yield start
+    for server in servers:
+        await server.shutdown()
+
+
+async def read_response(reader: asyncio.StreamReader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head[:-4].split(b"\r\n")
+    status = int(lines[0].split(b" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        headers[name.decode().lower()] = value.strip().decode()
+    if headers.get("transfer-encoding") == "chunked":
+        body = b""
+        while True:
+            size = int((await reader.readuntil(b"\r\n"))[:-2], 16)
+            if size == 0:
+                await reader.readuntil(b"\r\n")
+                break
+            body += (await reader.readexactly(size + 2))[:-2]
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers, body
+
+
+async def connect(address):
+    return await asyncio.open_connection(*address)
+
+
+class TestRequests:
+    async def test_get(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"GET /hello HTTP/1.1\r\nhost: x\r\n\r\n")
+        status, headers, body = await read_response(reader)
+        assert status == 200
+        assert body == b'{"hello":"world"}'
+        assert headers["content-length"] == str(len(body))
+        assert "date" in headers
+        writer.close()
+
+    async def test_path_and_query(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"GET /path/a%2Db?x=1&y=2 HTTP/1.1\r\nhost: x\r\n\r\n")
+        _, _, body = await read_response(reader)
+        assert body == b'{"name":"a-b","query":"x=1&y=2"}'
+        writer.close()
+
+    async def test_content_length_body(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"POST /echo HTTP/1.1\r\ncontent-length: 5\r\n\r\nhel")
+        await asyncio.sleep(0.01)
+        writer.write(b"lo")
+        _, _, body = await read_response(reader)
+        assert body == b"hello"
+        writer.close()
+
+    async def test_chunked_body(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(
+            b"POST /echo HTTP/1.1\r\ntransfer-encoding: chunked\r\n\r\n"
+            b"3\r\nabc\r\n4;ext=1\r\ndefg\r\n0\r\n\r\n"
+        )
+        _, _, body = await read_response(reader)
+        assert body == b"abcdefg"
+        writer.close()
+
+    async def test_head_has_no_body(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"HEAD /hello HTTP/1.1\r\n\r\nGET /hello HTTP/1.1\r\n\r\n")
+        head = await reader.readuntil(b"\r\n\r\n")
+        assert b"content-length: 0" not in head
+        # The next response starts right after the head: no body was sent
+        status, _, _ = await read_response(reader)
+        assert status == 200
+        writer.close()
+
+    @pytest.mark.parametrize("status", [204, 304])
+    async def test_no_content_length_without_body(self, server_factory, status):
+        async def empty(scope, receive, send):
+            if scope["type"] != "http":
+                return
+            await send({"type": "http.response.start", "status": status})
+            await send({"type": "http.response.body", "body": b""})
+
+        address = await server_factory(empty)
+        reader, writer = await connect(address)
+        writer.write(b"GET / HTTP/1.1\r\n\r\nGET / HTTP/1.1\r\n\r\n")
+        for _ in range(2):
+            code, headers, _ = await read_response(reader)
+            assert code == status
+            assert "content-length" not in headers
+            assert "transfer-encoding" not in headers
+        writer.close()
+
+    async def test_streamed_response_is_chunked(self, server_factory):
+        address = await server_factory(streaming_app)
+        reader, writer = await connect(address)
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        _, headers, body = await read_response(reader)
+        assert headers["transfer-encoding"] == "chunked"
+        assert body == b"hello world"
+        writer.close()
+
+    async def test_streamed_http10_response_is_close_delimited(self, server_factory):
+        address = await server_factory(streaming_app)
+        reader, writer = await connect(address)
+        writer.write(b"GET / HTTP/1.0\r\nconnection: keep-alive\r\n\r\n")
+        head = await reader.readuntil(b"\r\n\r\n")
+        assert b"transfer-encoding" not in head
+        assert b"connection: close" in head
+        assert await reader.read() == b"hello world"
+
+
+class TestConnections:
+    async def test_keep_alive(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        for _ in range(3):
+            writer.write(b"GET /hello HTTP/1.1\r\n\r\n")
+            status, headers, _ = await read_response(reader)
+            assert status == 200
+            assert "connection" not in headers
+        writer.close()
+
+    async def test_pipelining_preserves_order(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(
+            b"GET /path/one HTTP/1.1\r\n\r\n"
+            b"POST /echo HTTP/1.1\r\ncontent-length: 3\r\n\r\ntwo"
+            b"GET /path/three HTTP/1.1\r\n\r\n"
+        )
+        bodies = [(await read_response(reader))[2] for _ in range(3)]
+        assert bodies == [
+            b'{"name":"one","query":""}',
+            b"two",
+            b'{"name":"three","query":""}',
+        ]
+        writer.close()
+
+    async def test_connection_close(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"GET /hello HTTP/1.1\r\nconnection: close\r\n\r\n")
+        _, headers, _ = await read_response(reader)
+        assert headers["connection"] == "close"
+        assert await reader.read() == b""
+
+    async def test_app_connection_close_sent_once(self, server_factory):
+        async def closing(scope, receive, send):
+            if scope["type"] != "http":
+                return
+            headers = [(b"connection", b"close")]
+            await send(
+                {"type": "http.response.start", "status": 200, "headers": headers}
+            )
+            await send({"type": "http.response.body", "body": b"bye"})
+
+        address = await server_factory(closing)
+        reader, writer = await connect(address)
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        head = await reader.readuntil(b"\r\n\r\n")
+        assert head.lower().count(b"connection:") == 1
+        assert b"connection: close" in head
+        assert await reader.read() == b"bye"
+
+    async def test_data_after_connection_close_not_buffered(self):
+        release = asyncio.Event()
+
+        async def slow(scope, receive, send):
+            if scope["type"] != "http":
+                return
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        server = Server(slow, "127.0.0.1", 0, lifespan=False)
+        await server.startup()
+        try:
+            reader, writer = await connect(server.sockets[0].getsockname()[:2])
+            writer.write(b"GET / HTTP/1.1\r\nconnection: close\r\n\r\n")
+            for _ in range(20):
+                writer.write(b"x" * 100_000)
+                await writer.drain()
+            await asyncio.sleep(0.05)
+            (protocol,) = server.connections
+            buffered = len(protocol._buffer)
+            release.set()
+            assert buffered == 0
+            status, _, body = await read_response(reader)
+            assert (status, body) == (200, b"ok")
+        finally:
+            await server.shutdown()
+
+    async def test_oversized_chunk_rejected_before_buffering(self, server_factory):
+        address = await server_factory(make_app(), max_request_size=1000)
+        reader, writer = await connect(address)
+        writer.write(
+            b"POST /echo HTTP/1.1\r\ntransfer-encoding: chunked\r\n\r\n"
+            b"ffffff\r\n" + b"x" * 2000
+        )
+        status, _, _ = await read_response(reader)
+        assert status == 413
+
+    async def test_expect_continue(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(
+            b"POST /echo HTTP/1.1\r\ncontent-length: 2\r\nexpect: 100-continue\r\n\r\n"
+        )
+        assert await reader.readuntil(b"\r\n\r\n") == b"HTTP/1.1 100 Continue\r\n\r\n"
+        writer.write(b"hi")
+        assert (await read_response(reader))[2] == b"hi"
+        writer.close()
+
+    async def test_continue_waits_for_earlier_response(self, server_factory):
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["type"] != "http":
+                return
+            body = (await receive())["body"]
+            if scope["path"] == "/a":
+                await release.wait()
+                body = b"a"
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": body})
+
+        address = await server_factory(app)
+        reader, writer = await connect(address)
+        writer.write(
+            b"GET /a HTTP/1.1\r\n\r\n"
+            b"POST /b HTTP/1.1\r\ncontent-length: 1\r\n"
+            b"expect: 100-continue\r\n\r\n"
+        )
+        await asyncio.sleep(0.05)
+        release.set()
+        assert (await read_response(reader))[2] == b"a"
+        assert await reader.readuntil(b"\r\n\r\n") == b"HTTP/1.1 100 Continue\r\n\r\n"
+        writer.write(b"b")
+        assert (await read_response(reader))[2] == b"b"
+        writer.close()
+
+    async def test_http10_closes_by_default(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"GET /hello HTTP/1.0\r\n\r\n")
+        status, _, _ = await read_response(reader)
+        assert status == 200
+        assert await reader.read() == b""
+
+    async def test_client_disconnect_reaches_app(self, server_factory):
+        events = []
+        disconnected = asyncio.Event()
+
+        async def long_poll(scope, receive, send):
+            if scope["type"] != "http":
+                return
+            events.append((await receive())["type"])
+            events.append((await receive())["type"])
+            disconnected.set()
+
+        address = await server_factory(long_poll)
+        _, writer = await connect(address)
+        writer.write(b"GET /poll HTTP/1.1\r\n\r\n")
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        writer.close()
+        await asyncio.wait_for(disconnected.wait(), 1)
+        assert events == ["http.request", "http.disconnect"]
+
+    async def test_idle_timeout(self, server_factory):
+        address = await server_factory(make_app(), keep_alive_timeout=0.05)
+        reader, writer = await connect(address)
+        writer.write(b"GET /hello HTTP/1.1\r\n\r\n")
+        await read_response(reader)
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+
+    async def test_stalled_body_times_out(self, server_factory):
+        address = await server_factory(make_app(), keep_alive_timeout=0.05)
+        reader, writer = await connect(address)
+        writer.write(b"POST /echo HTTP/1.1\r\ncontent-length: 10\r\n\r\nab")
+        status, headers, _ = await asyncio.wait_for(read_response(reader), 1)
+        assert status == 408
+        assert headers["connection"] == "close"
+        assert await asyncio.wait_for(reader.read(), 1) == b""
+
+
+class TestErrors:
+    async def test_body_too_large(self, server_factory):
+        address = await server_factory(make_app(), max_request_size=4)
+        reader, writer = await connect(address)
+        writer.write(b"POST /echo HTTP/1.1\r\ncontent-length: 10\r\n\r\n")
+        status, headers, _ = await read_response(reader)
+        assert status == 413
+        assert headers["connection"] == "close"
+
+    async def test_chunked_body_too_large(self, server_factory):
+        address = await server_factory(make_app(), max_request_size=4)
+        reader, writer = await connect(address)
+        writer.write(
+            b"POST /echo HTTP/1.1\r\ntransfer-encoding: chunked\r\n\r\n"
+            b"3\r\nabc\r\n3\r\ndef\r\n0\r\n\r\n"
+        )
+        status, _, _ = await read_response(reader)
+        assert status == 413
+
+    async def test_headers_too_large(self, server_factory):
+        address = await server_factory(make_app(), max_header_size=64)
+        reader, writer = await connect(address)
+        writer.write(b"GET /hello HTTP/1.1\r\nx-big: " + b"a" * 100 + b"\r\n\r\n")
+        status, _, _ = await read_response(reader)
+        assert status == 431
+
+    async def test_malformed_request_line(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"NONSENSE\r\n\r\n")
+        status, _, _ = await read_response(reader)
+        assert status == 400
+
+    async def test_conflicting_framing_rejected(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(
+            b"POST /echo HTTP/1.1\r\ncontent-length: 3\r\n"
+            b"transfer-encoding: chunked\r\n\r\n"
+        )
+        status, _, _ = await read_response(reader)
+        assert status == 400
+
+    async def test_app_exception_is_500(self, server_factory):
+        address = await server_factory(broken_app)
+        reader, writer = await connect(address)
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        status, headers, _ = await read_response(reader)
+        assert status == 500
+        assert headers["connection"] == "close"
+
+    async def test_app_without_response_is_500(self, server_factory):
+        address = await server_factory(silent_app)
+        reader, writer = await connect(address)
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        status, _, _ = await read_response(reader)
+        assert status == 500
+
+    async def test_bad_request_after_pipelined_good_one(self, server_factory):
+        address = await server_factory(make_app())
+        reader, writer = await connect(address)
+        writer.write(b"GET /hello HTTP/1.1\r\n\r\nBROKEN\r\n\r\n")
+        assert (await read_response(reader))[0] == 200
+        assert (await read_response(reader))[0] == 400
+
+
+class TestLifespan:
+    async def test_serve_runs_lifespan_and_exits(self):
+        events = []
+
+        async def app(scope, receive, send):
+            if scope["type"] == "lifespan":
+                while True:
+                    message = await receive()
+                    events.append(message["type"])
+                    await send({"type": message["type"] + ".complete"})
+                    if message["type"] == "lifespan.shutdown":
+                        return
+
+        server = Server(app, "127.0.0.1", 0)
+        task = asyncio.create_task(server.serve())
+        while not server.sockets:
+            await asyncio.sleep(0.01)
+        server.request_exit()
+        await asyncio.wait_for(task, 2)
+        assert events == ["lifespan.startup", "lifespan.shutdown"]
+
+    async def test_hung_request_does_not_block_shutdown(self):
+        events = []
+        cancelled = asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["type"] == "lifespan":
+                while True:
+                    message = await receive()
+                    events.append(message["type"])
+                    await send({"type": message["type"] + ".complete"})
+                    if message["type"] == "lifespan.shutdown":
+                        return
+            try:
+                await asyncio.Event().wait()  # never answers
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        server = Server(app, "127.0.0.1", 0, graceful_timeout=0.1)
+        task = asyncio.create_task(server.serve())
+        while not server.sockets:
+            await asyncio.sleep(0.01)
+        reader, writer = await connect(server.sockets[0].getsockname()[:2])
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        await asyncio.sleep(0.05)
+
+        server.request_exit()
+        await asyncio.wait_for(task, 2)
+        assert cancelled.is_set()
+        assert events == ["lifespan.startup", "lifespan.shutdown"]
+        assert await reader.read() == b""
+        writer.close()
@@ -0,0 +1,172 @@
+"""Tests for lifespan hooks and draining in-flight work on shutdown."""
+
+import anyio
+import pytest
+
+from oberoon import BackgroundTasks, Oberoon, Request
+from oberoon.lifespan import LifespanManager
+from oberoon.testing import AsyncTestClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def gate():
+    return {"started": anyio.Event(), "release": anyio.Event()}
+
+
+@pytest.fixture
+def app(gate):
+    app = Oberoon(shutdown_grace=5)
+    app.events = []
+
+    @app.on_shutdown
+    async def close_pool():
+        app.events.append("shutdown")
+
+    @app.get("/slow")
+    async def slow(request: Request) -> dict:
+        gate["started"].set()
+        await gate["release"].wait()
+        return {"done": True}
+
+    @app.get("/fire")
+    async def fire(request: Request, tasks: BackgroundTasks) -> dict:
+        async def job():
+            gate["started"].set()
+            await gate["release"].wait()
+            app.events.append("job")
+
+        tasks.add_task(job)
+        return {"queued": True}
+
+    @app.get("/fast")
+    async def fast(request: Request) -> dict:
+        return {}
+
+    return app
+
+
+class Lifespan:
+    """Runs the app's lifespan in its own task; ``stop()`` begins shutdown."""
+
+    def __init__(self, app):
+        self.app = app
+        self.ready = anyio.Event()
+        self.stopped = anyio.Event()
+        self._stop = anyio.Event()
+
+    async def run(self):
+        async with LifespanManager(self.app):
+            self.ready.set()
+            await self._stop.wait()
+        self.stopped.set()
+
+    def stop(self):
+        self._stop.set()
+
+
+async def wait_until(predicate):
+    with anyio.fail_after(2):
+        while not predicate():
+            await anyio.sleep(0.001)
+
+
+class TestHooks:
+    async def test_startup_and_shutdown_hooks(self):
+        app = Oberoon()
+        events = []
+        app.on_startup(lambda: events.append("sync startup"))
+
+        @app.on_startup
+        async def connect():
+            events.append("async startup")
+
+        app.on_shutdown(lambda: events.append("shutdown"))
+
+        async with AsyncTestClient(app) as client:
+            assert events == ["sync startup", "async startup"]
+            assert (await client.get("/missing")).status_code == 404
+        assert events[-1] == "shutdown"
+
+    async def test_startup_failure(self):
+        app = Oberoon()
+
+        @app.on_startup
+        def boom():
+            raise RuntimeError("no database")
+
+        with pytest.raises(RuntimeError, match="no database"):
+            async with AsyncTestClient(app):
+                pass
+
+
+class TestDrain:
+    async def test_waits_for_in_flight_request(self, app, gate):
+        client = AsyncTestClient(app)
+        lifespan = Lifespan(app)
+        results = {}
+
+        async def slow_request():
+            results["slow"] = await client.get("/slow")
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(lifespan.run)
+            await lifespan.ready.wait()
+            tg.start_soon(slow_request)
+            await gate["started"].wait()
+            lifespan.stop()
+            await wait_until(lambda: app._draining)
+
+            refused = await client.get("/fast")
+            assert refused.status_code == 503
+            assert refused.headers["connection"] == "close"
+            assert refused.headers["retry-after"] == "1"
+            assert app.in_flight == 1
+            assert not lifespan.stopped.is_set()
+            assert app.events == []
+
+            gate["release"].set()
+
+        assert results["slow"].json() == {"done": True}
+        assert app.events == ["shutdown"]
+        assert app.in_flight == 0
+
+    async def test_waits_for_background_tasks(self, app, gate):
+        client = AsyncTestClient(app)
+        lifespan = Lifespan(app)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(lifespan.run)
+            await lifespan.ready.wait()
+            tg.start_soon(client.get, "/fire")
+            await gate["started"].wait()
+            lifespan.stop()
+            await wait_until(lambda: app._draining)
+            assert app.events == []
+            gate["release"].set()
+
+        assert app.events == ["job", "shutdown"]
+
+    async def test_grace_period_expires(self, app, gate):
+        app.shutdown_grace = 0.05
+        client = AsyncTestClient(app)
+        lifespan = Lifespan(app)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(lifespan.run)
+            await lifespan.ready.wait()
+            tg.start_soon(client.get, "/slow")
+            await gate["started"].wait()
+            lifespan.stop()
+            with anyio.fail_after(2):
+                await lifespan.stopped.wait()
+            assert app.events == ["shutdown"]
+            assert app.in_flight == 1
+            gate["release"].set()
+
+    async def test_restart_admits_again(self, app):
+        async with AsyncTestClient(app):
+            pass
+        async with AsyncTestClient(app) as client:
+            assert (await client.get("/fast")).status_code == 200
@@ -0,0 +1,103 @@
+"""Tests for handlers registered as ``"module:attr"`` strings."""
+
+import sys
+import textwrap
+
+import pytest
+
+from oberoon import JSONResponse, Oberoon, Request, Router
+from oberoon.testing import AsyncTestClient
+
+pytestmark = pytest.mark.anyio
+
+REPORTS = """
+from oberoon import Request, rate_limit
+
+imports = globals().setdefault("imports", 0) + 1
+
+
+async def generate(request: Request, year: int) -> dict:
+    return {"year": year}
+
+
+@rate_limit(1, 60)
+async def limited(request: Request) -> dict:
+    return {}
+"""
+
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    (tmp_path / "lazy_reports.py").write_text(textwrap.dedent(REPORTS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_reports"
+    sys.modules.pop("lazy_reports", None)
+
+
+def build(route_loading: str = "eager") -> Oberoon:
+    app = Oberoon(route_loading=route_loading)
+    router = Router(prefix="/reports")
+    router.add("/{year:int}", "lazy_reports:generate", methods=["GET"])
+    router.add("/limited", "lazy_reports:limited")
+    app.include_router(router)
+    app.add("/missing", "lazy_reports:nope")
+    return app
+
+
+class TestStringHandlers:
+    async def test_imported_on_first_dispatch(self, reports):
+        app = build()
+        assert reports not in sys.modules
+        assert app._routes[0].pattern is not None
+
+        async with AsyncTestClient(app) as client:
+            assert (await client.get("/nothing")).status_code == 404
+            assert (await client.post("/reports/2024")).status_code == 405
+            assert reports not in sys.modules
+
+            response = await client.get("/reports/2024")
+            assert response.json() == {"year": 2024}
+            assert sys.modules[reports].imports == 1
+            assert app._routes[0].handler is sys.modules[reports].generate
+
+    async def test_decorators_on_imported_handler_apply(self, reports):
+        app = build()
+        async with AsyncTestClient(app) as client:
+            assert (await client.get("/reports/limited")).status_code == 200
+            assert (await client.get("/reports/limited")).status_code == 429
+
+    async def test_bad_reference_is_a_handled_500(self, reports):
+        app = build()
+        async with AsyncTestClient(app, raise_server_exceptions=False) as client:
+            response = await client.get("/missing")
+        assert response.status_code == 500
+        assert response.json()["error"]
+
+    async def test_bad_reference_reaches_exception_handler(self, reports):
+        app = build()
+        seen = []
+
+        @app.exception_handler(ImportError)
+        def on_import_error(request: Request, exc: ImportError):
+            seen.append(str(exc))
+            return JSONResponse({"error": "unavailable"}, status_code=503)
+
+        async with AsyncTestClient(app) as client:
+            response = await client.get("/missing")
+        assert response.status_code == 503
+        assert response.json() == {"error": "unavailable"}
+        assert "no attribute 'nope'" in seen[0]
+
+    async def test_startup_mode_imports_at_startup(self, reports):
+        app = build("startup")
+        app._routes.pop()  # drop the broken reference
+        async with AsyncTestClient(app):
+            assert reports in sys.modules
+            assert all(route.inspected for route in app._routes)
+
+    def test_openapi_imports_handlers(self, reports):
+        app = build()
+        app._routes.pop()
+        app.mount_openapi()
+        assert "/reports/{year}" in app.openapi.document["paths"]
+        assert reports in sys.modules
@@ -0,0 +1,123 @@
+"""Tests for the prefork supervisor behind ``oberoon serve --workers``."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from oberoon import Oberoon, Request
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+app = Oberoon()
+
+
+@app.get("/pid")
+async def pid(request: Request) -> dict:
+    return {"pid": os.getpid()}
+
+
+async def failing_lifespan_app(scope, receive, send):
+    await receive()
+    await send({"type": "lifespan.startup.failed", "message": "no database"})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_pid(port: int) -> int | None:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+            sock.sendall(b"GET /pid HTTP/1.1\r\nconnection: close\r\n\r\n")
+            data = b""
+            while chunk := sock.recv(4096):
+                data += chunk
+    except OSError:
+        return None
+    body = data.partition(b"\r\n\r\n")[2]
+    return int(body.split(b":")[1].rstrip(b"}")) if body else None
+
+
+def wait_for(predicate, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.05)
+    raise AssertionError("condition not met in time")
+
+
+def serve(target: str, port: int, *args: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "oberoon", "serve", target, "--port", str(port)]
+        + ["--log-level", "error", *args],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def worker_pids(port: int, attempts: int = 40) -> set[int]:
+    return {pid for _ in range(attempts) if (pid := get_pid(port))}
+
+
+@pytest.fixture
+def cluster():
+    port = free_port()
+    process = serve("tests.test_supervisor:app", port, "--workers", "2")
+    try:
+        wait_for(lambda: get_pid(port))
+        yield process, port
+    finally:
+        if process.poll() is None:
+            process.terminate()
+            process.wait(10)
+
+
+def test_workers_serve_requests(cluster):
+    process, port = cluster
+    pids = wait_for(lambda: worker_pids(port) if len(worker_pids(port)) == 2 else None)
+    assert process.pid not in pids
+
+
+def test_crashed_worker_is_replaced(cluster):
+    _, port = cluster
+    victim = get_pid(port)
+    os.kill(victim, signal.SIGKILL)
+    wait_for(lambda: len(worker_pids(port) - {victim}) == 2)
+
+
+def test_sighup_rolls_workers(cluster):
+    process, port = cluster
+    before = wait_for(
+        lambda: worker_pids(port) if len(worker_pids(port)) == 2 else None
+    )
+    process.send_signal(signal.SIGHUP)
+    wait_for(lambda: worker_pids(port).isdisjoint(before))
+    assert process.poll() is None
+
+
+def test_sigterm_drains_and_exits(cluster):
+    process, port = cluster
+    process.terminate()
+    assert process.wait(10) == 0
+    assert get_pid(port) is None
+
+
+def test_boot_failure_stops_master():
+    port = free_port()
+    process = serve(
+        "tests.test_supervisor:failing_lifespan_app", port, "--workers", "2"
+    )
+    assert process.wait(15) == 3
@@ -0,0 +1,214 @@
+"""Tests for the in-process TestClient / AsyncTestClient."""
+
+import pytest
+
+from oberoon import BaseModel, HTTPException, Oberoon, Request, Response
+from oberoon.testing import AsyncTestClient, TestClient, WebSocketDisconnect
+
+
+class Item(BaseModel):
+    name: str
+    price: float
+
+
+@pytest.fixture
+def app():
+    app = Oberoon()
+
+    @app.get("/items")
+    async def list_items(request: Request) -> dict:
+        return {"query": request.query_params, "agent": request.headers["user-agent"]}
+
+    @app.post("/items")
+    async def create_item(request: Request, body: Item) -> Item:
+        return body
+
+    @app.post("/echo")
+    async def echo(request: Request) -> Response:
+        response = Response(200)
+        response.set_body(await request.body(), content_type="text/plain")
+        return response
+
+    @app.get("/forbidden")
+    async def forbidden(request: Request) -> dict:
+        raise HTTPException(403, "nope")
+
+    return app
+
+
+async def streaming_app(scope, receive, send):
+    assert scope["type"] == "http"
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for chunk in (b"one", b"two", b"three"):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def echo_ws_app(scope, receive, send):
+    assert scope["type"] == "websocket"
+    message = await receive()
+    assert message["type"] == "websocket.connect"
+    if scope["path"] == "/reject":
+        await send({"type": "websocket.close", "code": 4403})
+        return
+    await send({"type": "websocket.accept", "subprotocol": "chat"})
+    while True:
+        message = await receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        if message.get("text") == "bye":
+            await send({"type": "websocket.close", "code": 1000})
+            return
+        if "text" in message:
+            await send({"type": "websocket.send", "text": message["text"].upper()})
+        else:
+            await send({"type": "websocket.send", "bytes": message["bytes"][::-1]})
+
+
+def lifespan_app(events: list):
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                events.append(message["type"])
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                else:
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        else:
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+class TestSyncClient:
+    def test_get_with_params(self, app):
+        with TestClient(app) as client:
+            response = client.get("/items?a=1", params={"b": "2"})
+        assert response.status_code == 200
+        assert response.json() == {
+            "query": {"a": "1", "b": "2"},
+            "agent": "testclient",
+        }
+        assert response.headers["content-type"] == "application/json"
+
+    def test_post_json(self, app):
+        with TestClient(app) as client:
+            response = client.post("/items", json={"name": "pen", "price": 1.5})
+        assert response.json() == {"name": "pen", "price": 1.5}
+
+    def test_validation_error(self, app):
+        with TestClient(app) as client:
+            assert client.post("/items", json={"name": "pen"}).status_code == 422
+
+    def test_http_exception(self, app):
+        with TestClient(app) as client:
+            response = client.get("/forbidden")
+        assert response.status_code == 403
+
+    def test_streaming_request_body(self, app):
+        with TestClient(app) as client:
+            response = client.post("/echo", content=iter([b"ab", b"cd", b"ef"]))
+        assert response.text == "abcdef"
+
+    def test_streaming_response(self):
+        with TestClient(streaming_app) as client:
+            with client.stream("GET", "/") as response:
+                assert response.status_code == 200
+                assert list(response.iter_bytes()) == [b"one", b"two", b"three"]
+
+    def test_websocket(self):
+        with TestClient(echo_ws_app) as client:
+            with client.websocket_connect("/ws", subprotocols=["chat"]) as ws:
+                assert ws.accepted_subprotocol == "chat"
+                ws.send_text("hello")
+                assert ws.receive_text() == "HELLO"
+                ws.send_bytes(b"abc")
+                assert ws.receive_bytes() == b"cba"
+                ws.send_text("bye")
+                with pytest.raises(WebSocketDisconnect) as info:
+                    ws.receive_text()
+                assert info.value.code == 1000
+
+    def test_websocket_rejected(self):
+        with TestClient(echo_ws_app) as client:
+            with pytest.raises(WebSocketDisconnect) as info:
+                with client.websocket_connect("/reject"):
+                    pass
+        assert info.value.code == 4403
+
+    def test_lifespan(self):
+        events = []
+        with TestClient(lifespan_app(events)) as client:
+            assert events == ["lifespan.startup"]
+            assert client.get("/").status_code == 204
+        assert events == ["lifespan.startup", "lifespan.shutdown"]
+
+    def test_without_context_manager(self, app):
+        client = TestClient(app)
+        try:
+            assert client.get("/items").status_code == 200
+        finally:
+            client.close()
+
+    def test_server_exception_raised(self):
+        async def broken(scope, receive, send):
+            raise RuntimeError("boom")
+
+        with TestClient(broken) as client:
+            with pytest.raises(RuntimeError, match="boom"):
+                client.get("/")
+
+    def test_server_exception_as_500(self):
+        async def broken(scope, receive, send):
+            raise RuntimeError("boom")
+
+        with TestClient(broken, raise_server_exceptions=False) as client:
+            assert client.get("/").status_code == 500
+
+
+@pytest.mark.anyio
+class TestAsyncClient:
+    async def test_request(self, app):
+        async with AsyncTestClient(app) as client:
+            response = await client.post("/items", json={"name": "a", "price": 2})
+        assert response.json() == {"name": "a", "price": 2.0}
+
+    async def test_async_streaming_request_body(self, app):
+        async def chunks():
+            yield b"x"
+            yield b"y"
+
+        client = AsyncTestClient(app)
+        response = await client.post("/echo", content=chunks())
+        assert response.text == "xy"
+
+    async def test_streaming_response(self):
+        client = AsyncTestClient(streaming_app)
+        async with client.stream("GET", "/") as response:
+            assert await response.aread() == b"onetwothree"
+
+    async def test_websocket_json(self):
+        async def json_app(scope, receive, send):
+            await receive()
+            await send({"type": "websocket.accept"})
+            message = await receive()
+            await send({"type": "websocket.send", "text": message["text"]})
+            await receive()
+
+        client = AsyncTestClient(json_app)
+        async with client.websocket_connect("/ws") as ws:
+            await ws.send_json({"a": [1, 2]})
+            assert await ws.receive_json() == {"a": [1, 2]}
+
+    async def test_websocket_unsupported_by_app(self, app):
+        client = AsyncTestClient(app)
+        with pytest.raises(NotImplementedError):
+            async with client.websocket_connect("/ws"):
+                pass
+
+    async def test_oberoon_lifespan(self, app):
+        async with AsyncTestClient(app) as client:
+            assert (await client.get("/items")).status_code == 200
@@ -0,0 +1,121 @@
+"""Tests for phase-level timing, the Server-Timing header and timing hooks."""
+
+import httpx
+import pytest
+
+from oberoon import BaseModel, Oberoon, Request
+from oberoon.timing import PhaseTimer
+
+pytestmark = pytest.mark.anyio
+
+
+class Item(BaseModel):
+    name: str
+
+
+def phases(header: str) -> list[str]:
+    return [part.split(";")[0].strip() for part in header.split(",")]
+
+
+def register_routes(app: Oberoon) -> Oberoon:
+    @app.get("/items")
+    async def list_items(request: Request) -> list[dict]:
+        return [{"name": "a"}]
+
+    @app.post("/items")
+    async def create_item(request: Request, body: Item) -> Item:
+        return body
+
+    return app
+
+
+async def request(app, method, url, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        return await c.request(method, url, **kwargs)
+
+
+class TestPhaseTimer:
+    def test_spans_between_marks(self):
+        timer = PhaseTimer()
+        timer.mark("routing")
+        timer.mark("handler")
+        spans = timer.spans()
+        assert [s.name for s in spans] == ["routing", "handler"]
+        assert spans[1].start == spans[0].start + spans[0].duration
+        assert all(s.duration >= 0 for s in spans)
+
+    def test_header_format(self):
+        timer = PhaseTimer()
+        timer.mark("routing")
+        header = timer.header()
+        assert phases(header) == ["routing", "total"]
+        assert header.startswith("routing;dur=")
+
+
+class TestServerTimingHeader:
+    async def test_off_by_default(self):
+        resp = await request(register_routes(Oberoon()), "GET", "/items")
+        assert "server-timing" not in resp.headers
+
+    async def test_app_wide(self):
+        app = register_routes(Oberoon(server_timing=True))
+        resp = await request(app, "GET", "/items")
+        assert phases(resp.headers["server-timing"]) == [
+            "routing",
+            "validation",
+            "handler",
+            "serialize",
+            "total",
+        ]
+
+    async def test_body_phase(self):
+        app = register_routes(Oberoon(server_timing=True))
+        resp = await request(app, "POST", "/items", json={"name": "x"})
+        assert "body" in phases(resp.headers["server-timing"])
+
+    async def test_not_found_has_routing_only(self):
+        app = register_routes(Oberoon(server_timing=True))
+        resp = await request(app, "GET", "/missing")
+        assert resp.status_code == 404
+        assert phases(resp.headers["server-timing"]) == ["routing", "total"]
+
+    async def test_admission_phase(self):
+        app = register_routes(Oberoon(server_timing=True, max_concurrency=10))
+        resp = await request(app, "GET", "/items")
+        assert phases(resp.headers["server-timing"])[:2] == ["routing", "admission"]
+
+    async def test_debug_header(self):
+        app = register_routes(Oberoon(server_timing_header="X-Debug-Timing"))
+        plain = await request(app, "GET", "/items")
+        debug = await request(app, "GET", "/items", headers={"x-debug-timing": "1"})
+        assert "server-timing" not in plain.headers
+        assert "handler" in phases(debug.headers["server-timing"])
+
+
+class TestTimingHooks:
+    async def test_hook_receives_spans(self):
+        app = register_routes(Oberoon())
+        seen = []
+        app.add_timing_hook(lambda req, spans: seen.append((req.path, spans)))
+        resp = await request(app, "GET", "/items")
+
+        assert "server-timing" not in resp.headers
+        path, spans = seen[0]
+        assert path == "/items"
+        assert [s.name for s in spans] == [
+            "routing",
+            "validation",
+            "handler",
+            "serialize",
+        ]
+
+    async def test_failing_hook_does_not_break_response(self):
+        app = register_routes(Oberoon())
+
+        def broken(request, spans):
+            raise RuntimeError("tracer down")
+
+        app.add_timing_hook(broken)
+        resp = await request(app, "GET", "/items")
+        assert resp.status_code == 200